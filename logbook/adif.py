@@ -1,7 +1,14 @@
 import datetime as dt
-from collections.abc import Iterable
+import itertools
+from collections.abc import Callable, Iterable, Iterator
+from functools import lru_cache
 from typing import Any, Optional
 
+from django.conf import settings
+from django.db.models import QuerySet
+
+from .adif_datetime import to_date, to_time
+from .adif_fields import CORE_FIELD_ORDER, CORE_MAP
 from .models import LogEntry
 
 
@@ -98,8 +105,9 @@ def entry_to_adif(q: LogEntry) -> str:
     add("LOTW_QSLSDATE", _fmt_date(q.lotw_qsl_sent_date))
     add("NOTES", q.notes)
 
-    if getattr(q, "extras", None) and q.extras.data:
-        for key, value in q.extras.data.items():
+    extras = q.get_extras()
+    if extras:
+        for key, value in extras.items():
             tag = str(key).upper()
             if tag in emitted:
                 continue
@@ -108,11 +116,112 @@ def entry_to_adif(q: LogEntry) -> str:
     return "".join(parts) + "<EOR>\n"
 
 
+ADIF_HEADER = (
+    "Generated by LogHub <PROGRAMID:6>LogHub<PROGRAMVERSION:3>0.1\n"
+    "<ADIF_VER:4>3.1\n<EOH>\n"
+)
+
+DEFAULT_EXPORT_CHUNK_SIZE = 2000
+
+
+def iter_adif(qs: Iterable[LogEntry], chunk_size: int = DEFAULT_EXPORT_CHUNK_SIZE) -> Iterator[str]:
+    """Yield an ADIF document as the header, then one string per `chunk_size` records.
+
+    QuerySets are read with `.iterator(chunk_size)`, so rows are neither cached
+    on the queryset nor all held in memory at once.
+    """
+    yield ADIF_HEADER
+    rows = qs.iterator(chunk_size=chunk_size) if isinstance(qs, QuerySet) else iter(qs)
+    while True:
+        chunk = "".join(entry_to_adif(q) for q in itertools.islice(rows, chunk_size))
+        if not chunk:
+            return
+        yield chunk
+
+
 def queryset_to_adif(qs: Iterable[LogEntry]) -> str:
-    header = (
-        "Generated by LogHub <PROGRAMID:6>LogHub<PROGRAMVERSION:3>0.1\n"
-        "<ADIF_VER:4>3.1\n<EOH>\n"
-    )
-    body = "".join(entry_to_adif(q) for q in qs)
-    return header + body
+    return "".join(iter_adif(qs))
+
+
+# ---- values_list-based exporter ----
+#
+# Same output as entry_to_adif, byte for byte, without model instances: core
+# columns and the extras JSON come from one values_list stream (joined unless
+# extras are stored inline) and each
+# column has a formatter precompiled from CORE_MAP.
+
+@lru_cache(maxsize=4096)
+def _fmt_date_cached(d: dt.date) -> str:
+    return d.strftime("%Y%m%d")
+
 
+def _fmt_time_fast(t: dt.time) -> str:
+    return f"{t.hour:02d}{t.minute:02d}{t.second:02d}"
+
+
+_FORMATTERS: dict[Any, Callable[[Any], str]] = {to_date: _fmt_date_cached, to_time: _fmt_time_fast}
+
+
+def _compile_core() -> tuple[tuple[str, str, Callable[[Any], str]], ...]:
+    """(tag, "<TAG:" prefix, formatter) per CORE_FIELD_ORDER column."""
+    specs = []
+    for tag, mapping in CORE_MAP.items():
+        caster = mapping[1] if isinstance(mapping, tuple) else None
+        specs.append((tag, f"<{tag}:", _FORMATTERS.get(caster, str)))
+    return tuple(specs)
+
+
+_CORE_SPECS = _compile_core()
+_COL = {name: i for i, name in enumerate(CORE_FIELD_ORDER)}
+# SIG/MY_SIG fall back to SOTA refs, as in entry_to_adif
+_SIG_FALLBACKS = (
+    (_COL["sig"], _COL["sota_ref"], "SOTA"),
+    (_COL["sig_info"], _COL["sota_ref"], None),
+    (_COL["my_sig"], _COL["my_sota_ref"], "SOTA"),
+    (_COL["my_sig_info"], _COL["my_sota_ref"], None),
+)
+
+
+def row_to_adif(row: tuple) -> str:
+    """Format one `_values_fields()` row as an ADIF record."""
+    values = list(row)
+    extras = values.pop()
+    for i, ref, fixed in _SIG_FALLBACKS:
+        if not values[i] and values[ref]:
+            values[i] = fixed or values[ref]
+    parts: list[str] = []
+    emitted: list[str] = []
+    for (tag, prefix, fmt), v in zip(_CORE_SPECS, values):
+        if v is None:
+            continue
+        s = fmt(v)
+        if s:
+            parts.append(f"{prefix}{len(s)}>{s}")
+            emitted.append(tag)
+    if extras:
+        seen = set(emitted)
+        for key, value in extras.items():
+            tag = str(key).upper()
+            if tag in seen or value is None:
+                continue
+            s = str(value)
+            if s:
+                parts.append(f"<{tag}:{len(s)}>{s}")
+                seen.add(tag)
+    parts.append("<EOR>\n")
+    return "".join(parts)
+
+
+def _values_fields() -> tuple[str, ...]:
+    return CORE_FIELD_ORDER + ("extras_data" if settings.LOGHUB_INLINE_EXTRAS else "extras__data",)
+
+
+def iter_adif_values(qs: QuerySet, chunk_size: int = DEFAULT_EXPORT_CHUNK_SIZE) -> Iterator[str]:
+    """Like `iter_adif` for a LogEntry queryset, but in one values_list query."""
+    yield ADIF_HEADER
+    rows = qs.values_list(*_values_fields()).iterator(chunk_size=chunk_size)
+    while True:
+        chunk = "".join(row_to_adif(row) for row in itertools.islice(rows, chunk_size))
+        if not chunk:
+            return
+        yield chunk
@@ -22,10 +22,11 @@ from __future__ import annotations
 
 import json
 import os
-import datetime as dt
 from dataclasses import dataclass
 from typing import Optional, Dict
 
+from .adif_datetime import parse_date, parse_time
+
 
 @dataclass(frozen=True)
 class TagMeta:
@@ -112,15 +113,12 @@ def normalize_extra_value(tag: str, val: str) -> str:
             # Accept YYYYMMDD or YYYY-MM-DD, output YYYYMMDD
             if len(s) == 10 and s[4] == "-":
                 s = s.replace("-", "")
-            dt.datetime.strptime(s, "%Y%m%d")
+            parse_date(s)
             return s
         if t == "time":
             # Accept HHMM or HHMMSS, output HHMMSS
-            if len(s) == 4:
-                dt.datetime.strptime(s, "%H%M")
-                return s + "00"
-            dt.datetime.strptime(s, "%H%M%S")
-            return s
+            parse_time(s)
+            return s + "00" if len(s) == 4 else s
         if t == "int":
             return str(int(s))
         if t == "float":
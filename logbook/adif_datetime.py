@@ -0,0 +1,59 @@
+"""
+ADIF date and time casting.
+
+ADIF dates are always YYYYMMDD and times HHMM or HHMMSS, so values are
+sliced and range-checked directly instead of going through strptime, which
+dominates the cast cost on large imports. Dates are memoized in a bounded
+LRU cache: a log holds few distinct QSO dates, repeated thousands of times.
+
+Invalid values raise ValueError; the `to_date`/`to_time` wrappers return
+None instead, as the import casters expect.
+"""
+
+from __future__ import annotations
+
+import datetime as dt
+from functools import lru_cache
+
+DATE_CACHE_SIZE = 4096
+
+_DIGITS = frozenset("0123456789")
+
+
+def _digits(s: str) -> bool:
+    # str.isdigit() also accepts non-ASCII digits such as "²"
+    return _DIGITS.issuperset(s)
+
+
+@lru_cache(maxsize=DATE_CACHE_SIZE)
+def parse_date(s: str) -> dt.date:
+    """Parse an ADIF YYYYMMDD date."""
+    if len(s) != 8 or not _digits(s):
+        raise ValueError(f"invalid ADIF date: {s!r}")
+    return dt.date(int(s[:4]), int(s[4:6]), int(s[6:]))
+
+
+def parse_time(s: str) -> dt.time:
+    """Parse an ADIF HHMM or HHMMSS time."""
+    n = len(s)
+    if (n != 4 and n != 6) or not _digits(s):
+        raise ValueError(f"invalid ADIF time: {s!r}")
+    return dt.time(int(s[:2]), int(s[2:4]), int(s[4:]) if n == 6 else 0)
+
+
+def to_date(s: str | None) -> dt.date | None:
+    if not s:
+        return None
+    try:
+        return parse_date(s)
+    except ValueError:
+        return None
+
+
+def to_time(s: str | None) -> dt.time | None:
+    if not s:
+        return None
+    try:
+        return parse_time(s)
+    except ValueError:
+        return None
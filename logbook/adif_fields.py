@@ -8,38 +8,19 @@ This keeps TAG -> model field mapping in one place so we can:
 """
 
 from decimal import Decimal
-import datetime as dt
 from typing import Callable, Tuple, Union
 
-
-def _to_date(s: str | None) -> dt.date | None:
-    if not s:
-        return None
-    try:
-        return dt.datetime.strptime(s, "%Y%m%d").date()
-    except Exception:
-        return None
-
-
-def _to_time(s: str | None) -> dt.time | None:
-    if not s:
-        return None
-    try:
-        # Accept 4 or 6 digits
-        if len(s) == 4:
-            return dt.datetime.strptime(s, "%H%M").time()
-        return dt.datetime.strptime(s, "%H%M%S").time()
-    except Exception:
-        return None
+from .adif_catalog import normalize_extra_value
+from .adif_datetime import to_date, to_time
 
 
 # TAG -> model field name or (field, caster)
 CORE_MAP: dict[str, Union[str, Tuple[str, Callable[[str], object]]]] = {
     "CALL": "callsign",
-    "QSO_DATE": ("qso_date", _to_date),
-    "TIME_ON": ("time_on", _to_time),
-    "QSO_DATE_OFF": ("qso_date_off", _to_date),
-    "TIME_OFF": ("time_off", _to_time),
+    "QSO_DATE": ("qso_date", to_date),
+    "TIME_ON": ("time_on", to_time),
+    "QSO_DATE_OFF": ("qso_date_off", to_date),
+    "TIME_OFF": ("time_off", to_time),
     "BAND": "band",
     "FREQ": ("freq", Decimal),
     "BAND_RX": "band_rx",
@@ -79,13 +60,44 @@ CORE_MAP: dict[str, Union[str, Tuple[str, Callable[[str], object]]]] = {
     "MY_ITU_ZONE": ("my_itu_zone", int),
     "MY_NAME": "my_name",
     "LOTW_QSL_RCVD": "lotw_qsl_rcvd",
-    "LOTW_QSLRDATE": ("lotw_qsl_rcvd_date", _to_date),
+    "LOTW_QSLRDATE": ("lotw_qsl_rcvd_date", to_date),
     "LOTW_QSL_SENT": "lotw_qsl_sent",
-    "LOTW_QSLSDATE": ("lotw_qsl_sent_date", _to_date),
+    "LOTW_QSLSDATE": ("lotw_qsl_sent_date", to_date),
     "NOTES": "notes",
 }
 
 # Convenience sets for quick checks
 CORE_TAGS: set[str] = set(CORE_MAP.keys())
 CORE_FIELD_NAMES: set[str] = set(v[0] if isinstance(v, tuple) else v for v in CORE_MAP.values())
+# Field names in CORE_MAP declaration order, e.g. for compact row tuples
+CORE_FIELD_ORDER: tuple[str, ...] = tuple(dict.fromkeys(v[0] if isinstance(v, tuple) else v for v in CORE_MAP.values()))
+# Model field name -> ADIF tag
+FIELD_TAGS: dict[str, str] = {(v[0] if isinstance(v, tuple) else v): tag for tag, v in CORE_MAP.items()}
+
 
+def cast_record(fields: dict) -> tuple[dict, dict] | None:
+    """Split an ADIF record into (core column values, extras).
+
+    Return None when the minimal required fields are missing.
+    """
+    data: dict = {}
+    extras: dict = {}
+    for tag, val in fields.items():
+        if tag in CORE_MAP:
+            mapping = CORE_MAP[tag]
+            if isinstance(mapping, tuple):
+                key, caster = mapping
+                try:
+                    data[key] = caster(val)
+                except Exception:
+                    # Bad cast, keep as extra so user can inspect
+                    extras[tag] = val
+            else:
+                data[mapping] = val
+        else:
+            # Normalize per ADIF catalog when possible
+            extras[tag] = normalize_extra_value(tag, val)
+    # Required minimal fields
+    if not data.get("callsign") or not data.get("qso_date") or not data.get("time_on"):
+        return None
+    return data, extras
@@ -0,0 +1,128 @@
+"""
+Process-pool ADIF parsing for very large files.
+
+The uncompressed file is memory-mapped and split into byte ranges that end
+right after an <EOR> marker. Each range is tokenized and cast in a worker
+process, which returns compact row tuples; results are yielded in input order.
+
+This module must stay importable without Django (no model imports) so that
+worker processes can load it under any multiprocessing start method.
+"""
+
+from __future__ import annotations
+
+import mmap
+import re
+from collections import deque
+from concurrent.futures import ProcessPoolExecutor
+from typing import Iterator
+
+from .adif_fields import CORE_FIELD_ORDER, cast_record
+from .adif_tokenizer import DEFAULT_CHUNK_SIZE, ADIFTokenizer, value_end
+from .dedup import record_fingerprint
+
+# Ranges smaller than this are not worth a round trip to a worker
+MIN_RANGE_BYTES = 4 * 1024 * 1024
+
+_EOR_RE = re.compile(rb"<eor>", re.IGNORECASE)
+# A genuine <EOR> is followed by the next tag or the end of the file
+_AFTER_EOR_RE = re.compile(rb"\s*(?:<[A-Za-z0-9_]+(?::[0-9]+(?::[A-Za-z])?)?>|\Z)")
+_FIELD_RE = re.compile(rb"<[A-Za-z0-9_]+:([0-9]+)(?::[A-Za-z])?>")
+# How far back to look for a field whose value might contain an <EOR>
+_LOOKBACK = 8192
+
+# ((core values in CORE_FIELD_ORDER, None when absent), extras, record fingerprint)
+Row = tuple[tuple, dict, str]
+
+
+def _inside_value(buf, pos: int) -> bool:
+    """True if a length-prefixed field shortly before `pos` spans over it."""
+    for m in _FIELD_RE.finditer(buf, max(0, pos - _LOOKBACK), pos):
+        if value_end(buf, m.end(), int(m.group(1)), final=True) > pos:
+            return True
+    return False
+
+
+def split_ranges(buf, target_size: int) -> list[tuple[int, int]]:
+    """Split `buf` into (start, end) byte ranges of roughly `target_size`.
+
+    Every boundary sits just after an <EOR> that is followed by another tag
+    and is not covered by a preceding field's declared length, so an "<EOR>"
+    inside a field value is not picked.
+    """
+    n = len(buf)
+    bounds = [0]
+    pos = target_size
+    while pos < n:
+        m = _EOR_RE.search(buf, pos)
+        while m is not None and (not _AFTER_EOR_RE.match(buf, m.end()) or _inside_value(buf, m.start())):
+            m = _EOR_RE.search(buf, m.end())
+        if m is None or m.end() >= n:
+            break
+        bounds.append(m.end())
+        pos = m.end() + target_size
+    bounds.append(n)
+    return list(zip(bounds, bounds[1:]))
+
+
+def _range_records(mm, start: int, end: int) -> Iterator[dict]:
+    tok = ADIFTokenizer()
+    for off in range(start, end, DEFAULT_CHUNK_SIZE):
+        yield from tok.feed(mm[off : min(off + DEFAULT_CHUNK_SIZE, end)])
+    yield from tok.close()
+
+
+def parse_range(path: str, start: int, end: int) -> tuple[list[Row], int, int]:
+    """Tokenize and cast bytes [start, end) of `path`. Return (rows, errors, seen)."""
+    rows: list[Row] = []
+    err = 0
+    seen = 0
+    with open(path, "rb") as f, mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ) as mm:
+        for fields in _range_records(mm, start, end):
+            seen += 1
+            row = cast_record(fields)
+            if row is None:
+                err += 1
+                continue
+            data, extras = row
+            rows.append((tuple(data.get(name) for name in CORE_FIELD_ORDER), extras, record_fingerprint(fields)))
+    return rows, err, seen
+
+
+def iter_parallel_ranges(
+    path: str,
+    workers: int,
+    min_range_bytes: int | None = None,
+) -> Iterator[tuple[list[Row], int, int, int]]:
+    """Parse `path` across `workers` processes.
+
+    Yield (rows, errors, seen, end_offset) per range, in file order. At most
+    two ranges per worker are in flight, bounding memory held in results.
+    """
+    with open(path, "rb") as f:
+        f.seek(0, 2)
+        size = f.tell()
+        if not size:
+            return
+        with mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ) as mm:
+            target = max(min_range_bytes or MIN_RANGE_BYTES, size // (workers * 4) + 1)
+            ranges = split_ranges(mm, target)
+    with ProcessPoolExecutor(max_workers=workers) as pool:
+        pending: deque = deque()
+        todo = iter(ranges)
+        for start, end in todo:
+            pending.append((end, pool.submit(parse_range, path, start, end)))
+            if len(pending) >= workers * 2:
+                break
+        while pending:
+            end, fut = pending.popleft()
+            rows, err, seen = fut.result()
+            nxt = next(todo, None)
+            if nxt is not None:
+                pending.append((nxt[1], pool.submit(parse_range, path, *nxt)))
+            yield rows, err, seen, end
+
+
+def row_to_data(values: tuple) -> dict:
+    """Expand a compact row tuple back into the cast_record() data dict."""
+    return {name: v for name, v in zip(CORE_FIELD_ORDER, values) if v is not None}
@@ -0,0 +1,175 @@
+"""
+Incremental, byte-level ADIF (.adi) tokenizer.
+
+The tokenizer is fed raw ``bytes`` chunks (from an upload, a file object or
+a memory-mapped file) and returns complete records as soon as their <EOR>
+has been seen. Field values are sliced using the declared length prefix, so
+an "<EOR>" inside a value does not end the record, and tag names are matched
+case-insensitively (<eor>, <Eoh>, ...).
+
+Only the unconsumed tail of the input is buffered, so memory stays bounded
+by the chunk size plus the largest single field, not by the file size.
+
+Length prefixes count characters (as our exporter writes them). Values that
+are pure ASCII take a fast path; otherwise UTF-8 lead bytes are counted.
+Values are decoded as UTF-8, replacing undecodable bytes.
+"""
+
+from __future__ import annotations
+
+import re
+from typing import BinaryIO, Iterable, Iterator, Optional
+
+DEFAULT_CHUNK_SIZE = 64 * 1024
+
+# <NAME>, <NAME:LEN> or <NAME:LEN:T>
+_TAG_RE = re.compile(rb"<([A-Za-z0-9_]+)(?::([0-9]+)(?::[A-Za-z])?)?>")
+
+# A '<' with no closing '>' within this many bytes is not a tag
+_MAX_TAG_SPEC = 96
+
+
+def value_end(buf: bytearray, start: int, length: int, final: bool) -> Optional[int]:
+    """Return the byte offset where a value of `length` characters ends.
+
+    Returns None when more input is needed to know where the value ends.
+    """
+    end = start + length
+    n = len(buf)
+    if end <= n:
+        if buf[start:end].isascii():
+            return end
+    elif buf[start:].isascii():
+        return n if final else None
+    chars = 0
+    i = start
+    while i < n:
+        if (buf[i] & 0xC0) != 0x80:
+            if chars == length:
+                return i
+            chars += 1
+        i += 1
+    # Reached the end of the buffer: the last character may be incomplete
+    if final:
+        return n
+    return None
+
+
+class ADIFTokenizer:
+    """Stateful ADIF tokenizer.
+
+    Usage::
+
+        tok = ADIFTokenizer()
+        for chunk in chunks:
+            for fields in tok.feed(chunk):
+                ...
+            print(tok.bytes_consumed)
+        for fields in tok.close():
+            ...
+
+    Records are dicts of upper-cased TAG -> str value. Fields seen before
+    <EOH> belong to the header and are discarded.
+    """
+
+    def __init__(self) -> None:
+        self._buf = bytearray()
+        self._fields: dict[str, str] = {}
+        self._closed = False
+        self.bytes_consumed = 0
+        self.record_count = 0
+
+    def feed(self, chunk: bytes) -> list[dict[str, str]]:
+        """Add a chunk of input and return the records it completed."""
+        if self._closed:
+            raise ValueError("Tokenizer is closed")
+        if chunk:
+            self._buf += chunk
+        return self._drain(final=False)
+
+    def close(self) -> list[dict[str, str]]:
+        """Flush remaining input; a trailing record without <EOR> is kept."""
+        if self._closed:
+            return []
+        out = self._drain(final=True)
+        if self._fields:
+            out.append(self._fields)
+            self.record_count += 1
+            self._fields = {}
+        self.bytes_consumed += len(self._buf)
+        self._buf.clear()
+        self._closed = True
+        return out
+
+    def _drain(self, final: bool) -> list[dict[str, str]]:
+        buf = self._buf
+        n = len(buf)
+        pos = 0
+        fields = self._fields
+        out: list[dict[str, str]] = []
+        while True:
+            lt = buf.find(b"<", pos)
+            if lt < 0:
+                pos = n
+                break
+            m = _TAG_RE.match(buf, lt)
+            if m is None:
+                # Possibly a tag split across chunks; wait unless clearly junk
+                if not final and n - lt < _MAX_TAG_SPEC and buf.find(b">", lt) < 0:
+                    pos = lt
+                    break
+                pos = lt + 1
+                continue
+            name = m.group(1).decode("ascii").upper()
+            length = m.group(2)
+            if length is None:
+                if name == "EOR":
+                    if fields:
+                        out.append(fields)
+                        self.record_count += 1
+                        fields = {}
+                elif name == "EOH":
+                    fields = {}
+                pos = m.end()
+                continue
+            vstart = m.end()
+            vend = value_end(buf, vstart, int(length), final)
+            if vend is None:
+                pos = lt
+                break
+            fields[name] = buf[vstart:vend].decode("utf-8", errors="replace")
+            pos = vend
+        self._fields = fields
+        if pos:
+            del buf[:pos]
+            self.bytes_consumed += pos
+        return out
+
+
+def iter_adif_chunks(chunks: Iterable[bytes], tokenizer: Optional[ADIFTokenizer] = None) -> Iterator[dict[str, str]]:
+    """Lazily yield records from an iterable of bytes chunks.
+
+    Pass your own `tokenizer` to observe `bytes_consumed` while iterating.
+    """
+    tok = tokenizer or ADIFTokenizer()
+    for chunk in chunks:
+        yield from tok.feed(chunk)
+    yield from tok.close()
+
+
+def iter_file_chunks(f: BinaryIO, chunk_size: int = DEFAULT_CHUNK_SIZE) -> Iterator[bytes]:
+    """Read a binary file object (or an ``mmap.mmap``) in fixed-size chunks."""
+    while True:
+        chunk = f.read(chunk_size)
+        if not chunk:
+            break
+        yield chunk
+
+
+def iter_adif_file(
+    f: BinaryIO,
+    chunk_size: int = DEFAULT_CHUNK_SIZE,
+    tokenizer: Optional[ADIFTokenizer] = None,
+) -> Iterator[dict[str, str]]:
+    """Lazily yield records from a binary file object or memory map."""
+    return iter_adif_chunks(iter_file_chunks(f, chunk_size), tokenizer)
@@ -5,3 +5,5 @@ class LogbookConfig(AppConfig):
     default_auto_field = "django.db.models.BigAutoField"
     name = "logbook"
 
+    def ready(self):
+        from . import checks, signals  # noqa: F401
@@ -0,0 +1,104 @@
+"""
+ADIF 3.1.5 Band enumeration and frequency -> band lookup.
+
+Band edges are kept as integer Hz so lookups are exact for the MHz values
+stored in DecimalField(decimal_places=6). The table is built once at import
+time and searched with bisect.
+"""
+
+from __future__ import annotations
+
+from bisect import bisect_right
+from decimal import Decimal, InvalidOperation
+from typing import Iterable, Optional
+
+# (band, lower MHz, upper MHz), inclusive edges, per the ADIF Band enumeration
+ADIF_BANDS: tuple[tuple[str, str, str], ...] = (
+    ("2190m", "0.1357", "0.1378"),
+    ("630m", "0.472", "0.479"),
+    ("560m", "0.501", "0.504"),
+    ("160m", "1.8", "2.0"),
+    ("80m", "3.5", "4.0"),
+    ("60m", "5.06", "5.45"),
+    ("40m", "7.0", "7.3"),
+    ("30m", "10.1", "10.15"),
+    ("20m", "14.0", "14.35"),
+    ("17m", "18.068", "18.168"),
+    ("15m", "21.0", "21.45"),
+    ("12m", "24.890", "24.99"),
+    ("10m", "28.0", "29.7"),
+    ("8m", "40", "45"),
+    ("6m", "50", "54"),
+    ("5m", "54.000001", "69.9"),
+    ("4m", "70", "71"),
+    ("2m", "144", "148"),
+    ("1.25m", "222", "225"),
+    ("70cm", "420", "450"),
+    ("33cm", "902", "928"),
+    ("23cm", "1240", "1300"),
+    ("13cm", "2300", "2450"),
+    ("9cm", "3300", "3500"),
+    ("6cm", "5650", "5925"),
+    ("3cm", "10000", "10500"),
+    ("1.25cm", "24000", "24250"),
+    ("6mm", "47000", "47200"),
+    ("4mm", "75500", "81000"),
+    ("2.5mm", "119980", "123000"),
+    ("2mm", "134000", "149000"),
+    ("1mm", "241000", "250000"),
+    ("submm", "300000", "7500000"),
+)
+
+BAND_NAMES: frozenset[str] = frozenset(b for b, _, _ in ADIF_BANDS)
+
+_MHZ = Decimal(1_000_000)
+_NAMES = [b for b, _, _ in ADIF_BANDS]
+_LOWER_HZ = [int(Decimal(lo) * _MHZ) for _, lo, _ in ADIF_BANDS]
+_UPPER_HZ = [int(Decimal(hi) * _MHZ) for _, _, hi in ADIF_BANDS]
+
+
+def _to_hz(freq_mhz) -> Optional[int]:
+    if freq_mhz is None or freq_mhz == "":
+        return None
+    try:
+        d = freq_mhz if isinstance(freq_mhz, Decimal) else Decimal(str(freq_mhz))
+        return int(d * _MHZ)
+    except (InvalidOperation, ValueError, TypeError):
+        return None
+
+
+def _band_for_hz(hz: int) -> Optional[str]:
+    i = bisect_right(_LOWER_HZ, hz) - 1
+    if i >= 0 and hz <= _UPPER_HZ[i]:
+        return _NAMES[i]
+    return None
+
+
+def band_for_freq(freq_mhz) -> Optional[str]:
+    """Return the ADIF band for a frequency in MHz, or None if out of band."""
+    hz = _to_hz(freq_mhz)
+    if not hz:
+        return None
+    return _band_for_hz(hz)
+
+
+def bands_for_freqs(freqs: Iterable) -> list[Optional[str]]:
+    """Vectorized `band_for_freq` for a whole batch of frequencies.
+
+    Distinct frequencies are sorted once and merged against the band table,
+    so a batch dominated by a few dial frequencies costs little more than
+    a dict lookup per row.
+    """
+    values = list(freqs)
+    hz_by_value = {}
+    for v in values:
+        if v not in hz_by_value:
+            hz_by_value[v] = _to_hz(v)
+    band_by_hz: dict[int, Optional[str]] = {}
+    i = 0
+    nbands = len(_NAMES)
+    for hz in sorted({hz for hz in hz_by_value.values() if hz}):
+        while i < nbands and _UPPER_HZ[i] < hz:
+            i += 1
+        band_by_hz[hz] = _NAMES[i] if i < nbands and _LOWER_HZ[i] <= hz else None
+    return [band_by_hz.get(hz_by_value[v]) if hz_by_value[v] else None for v in values]
@@ -0,0 +1,37 @@
+"""
+System checks for the logbook app.
+
+Database checks run with `manage.py migrate` and `manage.py check --database`.
+"""
+
+from __future__ import annotations
+
+from django.conf import settings
+from django.core.checks import Tags, Warning, register
+from django.db import DatabaseError
+
+
+@register(Tags.database)
+def check_extras_store(app_configs, databases=None, **kwargs):
+    """Warn while extras are still held by the store LOGHUB_INLINE_EXTRAS does not select."""
+    from .models import LogEntry, LogEntryExtras
+
+    if not databases:
+        return []
+    try:
+        if settings.LOGHUB_INLINE_EXTRAS:
+            stranded, store = LogEntryExtras.objects.exists(), "the LogEntryExtras table"
+        else:
+            stranded, store = LogEntry.objects.exclude(extras_data={}).exists(), "LogEntry.extras_data"
+    except DatabaseError:
+        # Tables not migrated yet
+        return []
+    if not stranded:
+        return []
+    return [
+        Warning(
+            f"Some log entry extras are still stored in {store}, which LOGHUB_INLINE_EXTRAS does not select.",
+            hint="Run `manage.py move_extras`. Until then, exports and extras searches leave those extras out.",
+            id="logbook.W001",
+        )
+    ]
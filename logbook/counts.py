@@ -0,0 +1,107 @@
+"""
+Cheap row counts for pagination.
+
+On PostgreSQL the planner already knows roughly how many rows a query
+returns: `pg_class.reltuples` for a whole table, the EXPLAIN row estimate
+for a filtered query. Both cost a catalog lookup instead of a sequential
+scan. Estimates below LOGHUB_EXACT_COUNT_THRESHOLD are replaced by an exact
+COUNT(*), which is cheap at that size and keeps small logs precise. Other
+backends always count exactly.
+"""
+
+from __future__ import annotations
+
+import json
+from typing import Optional
+
+from django.conf import settings
+from django.core.paginator import Page, Paginator
+from django.db import connections
+from django.db.models import QuerySet
+from django.utils.functional import cached_property
+
+
+def _planner_estimate(qs: QuerySet) -> Optional[int]:
+    conn = connections[qs.db]
+    if conn.vendor != "postgresql":
+        return None
+    with conn.cursor() as cursor:
+        if not qs.query.where:
+            cursor.execute("SELECT reltuples::bigint FROM pg_class WHERE oid = %s::regclass", [qs.model._meta.db_table])
+            row = cursor.fetchone()
+            # -1 until the table is first analyzed
+            return row[0] if row and row[0] >= 0 else None
+        sql, params = qs.query.get_compiler(using=qs.db).as_sql()
+        cursor.execute(f"EXPLAIN (FORMAT JSON) {sql}", params)
+        plan = cursor.fetchone()[0]
+    if isinstance(plan, str):
+        plan = json.loads(plan)
+    return int(plan[0]["Plan"]["Plan Rows"])
+
+
+def estimate_count(qs: QuerySet, threshold: Optional[int] = None) -> tuple[int, bool]:
+    """Return (count, is_estimate) for `qs`."""
+    if threshold is None:
+        threshold = settings.LOGHUB_EXACT_COUNT_THRESHOLD
+    estimate = _planner_estimate(qs)
+    if estimate is None or estimate < threshold:
+        return qs.count(), False
+    return estimate, True
+
+
+class _EstimatedPage(Page):
+    """Page over a queryset slice holding one row more than the page.
+
+    Nothing is fetched until the rows or `has_next()` are first used, so a
+    template that serves the page from its fragment cache runs no query.
+    """
+
+    def __init__(self, window: QuerySet, number, paginator):
+        self._window = window
+        self.number = number
+        self.paginator = paginator
+
+    @cached_property
+    def _rows(self) -> list:
+        return list(self._window)
+
+    @cached_property
+    def object_list(self) -> list:
+        return self._rows[: self.paginator.per_page]
+
+    def has_next(self) -> bool:
+        return len(self._rows) > self.paginator.per_page
+
+
+class EstimatedCountPaginator(Paginator):
+    """Paginator whose count may come from a planner estimate.
+
+    With an estimate the number of pages is approximate, so pages are sliced
+    without clamping to it and "next" is decided by fetching one extra row.
+    """
+
+    is_estimate = False
+
+    @cached_property
+    def count(self) -> int:
+        if isinstance(self.object_list, QuerySet):
+            count, self.is_estimate = estimate_count(self.object_list)
+            return count
+        return len(self.object_list)
+
+    def validate_number(self, number):
+        if self.count and self.is_estimate:
+            try:
+                n = int(number)
+            except (TypeError, ValueError):
+                n = None
+            if n is not None and n > 1:
+                return n
+        return super().validate_number(number)
+
+    def page(self, number):
+        number = self.validate_number(number)
+        if not self.is_estimate:
+            return super().page(number)
+        bottom = (number - 1) * self.per_page
+        return _EstimatedPage(self.object_list[bottom : bottom + self.per_page + 1], number, self)
@@ -0,0 +1,128 @@
+"""
+Duplicate QSO detection for imports.
+
+Every QSO gets a `dupe_key`: a short hash of (CALL, BAND, mode group), stored
+and indexed together with QSO_DATE on LogEntry. A batch of staged rows is
+checked with one indexed query for the batch's keys and date span; matches
+are then compared in memory on QSO_DATE+TIME_ON within a +/-N minute window.
+
+A staged row is flagged:
+- new: no logbook QSO matches
+- duplicate: a match agrees on every detail both sides have
+- conflict: a match disagrees on some detail (freq, RST, grid, station)
+
+Re-imports are cheaper still: each raw ADIF record gets a `fingerprint`
+(hash of its tags and values, before any casting), stored on StagedEntry and
+LogEntry. Records whose fingerprint is already in the logbook, or earlier in
+the same file, are dropped before they are cast or staged, so an overlapping
+download only costs the new records.
+"""
+
+from __future__ import annotations
+
+import datetime as dt
+import hashlib
+from decimal import Decimal
+from typing import Iterable, Optional
+
+from django.conf import settings
+
+STATUS_NEW = "new"
+STATUS_DUPLICATE = "duplicate"
+STATUS_CONFLICT = "conflict"
+STATUS_CHOICES = (
+    (STATUS_NEW, "New"),
+    (STATUS_DUPLICATE, "Duplicate"),
+    (STATUS_CONFLICT, "Conflict"),
+)
+
+_PHONE_MODES = frozenset({"SSB", "USB", "LSB", "AM", "FM", "DIGITALVOICE", "C4FM", "DSTAR", "DMR", "FREEDV", "M17"})
+
+# Details compared when both the staged row and the logbook QSO have a value
+COMPARE_FIELDS = ("freq", "station_callsign", "rst_sent", "rst_rcvd", "gridsquare")
+
+
+def mode_group(mode: Optional[str]) -> str:
+    """ADIF-style mode group: CW, PHONE or DATA."""
+    m = (mode or "").strip().upper()
+    if not m:
+        return ""
+    if m == "CW":
+        return "CW"
+    if m in _PHONE_MODES:
+        return "PHONE"
+    return "DATA"
+
+
+def dupe_key(callsign: Optional[str], band: Optional[str], mode: Optional[str]) -> str:
+    raw = f"{(callsign or '').strip().upper()}|{(band or '').strip().lower()}|{mode_group(mode)}"
+    return hashlib.blake2b(raw.encode("utf-8"), digest_size=8).hexdigest()
+
+
+def record_fingerprint(fields: dict) -> str:
+    """Hash a raw ADIF record (TAG -> value), ignoring tag order, tag case and blanks."""
+    parts = sorted(f"{tag.upper()}\x1e{value.strip()}" for tag, value in fields.items() if value and value.strip())
+    return hashlib.blake2b("\x1f".join(parts).encode("utf-8"), digest_size=16).hexdigest()
+
+
+def known_fingerprints(fingerprints: Iterable[str]) -> set[str]:
+    """Return the subset of `fingerprints` already present in the logbook."""
+    from .models import LogEntry
+
+    fps = set(fingerprints)
+    if not fps:
+        return set()
+    return set(LogEntry.objects.filter(fingerprint__in=fps).values_list("fingerprint", flat=True))
+
+
+def _norm(name: str, value):
+    if value is None or value == "":
+        return None
+    if name == "freq":
+        # Compare at kHz resolution
+        return Decimal(value).quantize(Decimal("0.001"))
+    return str(value).strip().upper()
+
+
+def _when(qso_date: dt.date, time_on: dt.time) -> dt.datetime:
+    return dt.datetime.combine(qso_date, time_on)
+
+
+def classify_rows(rows: list[dict], window_minutes: Optional[int] = None) -> None:
+    """Set dupe_key, dupe_status and duplicate_of_id on each row dict in place."""
+    from .models import LogEntry
+
+    if window_minutes is None:
+        window_minutes = settings.LOGHUB_DEDUP_WINDOW_MINUTES
+    window = dt.timedelta(minutes=window_minutes)
+    for row in rows:
+        row["dupe_key"] = dupe_key(row.get("callsign"), row.get("band"), row.get("mode"))
+        row["dupe_status"] = STATUS_NEW
+        row["duplicate_of_id"] = None
+    dated = [r for r in rows if r.get("qso_date") and r.get("time_on")]
+    if not dated:
+        return
+    # The window may cross midnight, so widen the date span by a day each side
+    lo = min(r["qso_date"] for r in dated) - dt.timedelta(days=1)
+    hi = max(r["qso_date"] for r in dated) + dt.timedelta(days=1)
+    existing: dict[str, list[tuple]] = {}
+    qs = LogEntry.objects.filter(dupe_key__in={r["dupe_key"] for r in dated}, qso_date__range=(lo, hi))
+    for key, qso_date, time_on, pk, *details in qs.values_list("dupe_key", "qso_date", "time_on", "pk", *COMPARE_FIELDS):
+        existing.setdefault(key, []).append((_when(qso_date, time_on), pk, details))
+    if not existing:
+        return
+    for row in dated:
+        candidates = existing.get(row["dupe_key"])
+        if not candidates:
+            continue
+        when = _when(row["qso_date"], row["time_on"])
+        best = min(candidates, key=lambda c: abs(c[0] - when))
+        if abs(best[0] - when) > window:
+            continue
+        row["duplicate_of_id"] = best[1]
+        row["dupe_status"] = STATUS_DUPLICATE
+        for name, theirs in zip(COMPARE_FIELDS, best[2]):
+            a, b = _norm(name, row.get(name)), _norm(name, theirs)
+            if a is not None and b is not None and a != b:
+                row["dupe_status"] = STATUS_CONFLICT
+                break
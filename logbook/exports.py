@@ -0,0 +1,124 @@
+"""
+Filtered and incremental ADIF exports.
+
+Exports are narrowed with `logbook.filters.filter_entries` (QSO date range,
+station callsign, band and modification time), each served by an index on
+LogEntry.
+
+Incremental exports are keyed by a checkpoint name. The export covers
+entries updated after the checkpoint's `exported_at`; once the whole
+response has been streamed, the checkpoint moves to the time the export
+started, so rows changed while it ran are picked up next time. An
+interrupted download leaves the checkpoint untouched.
+
+The unfiltered export is also cached on disk as a gzipped artifact named
+after the logbook version: a hash of the entry count, the latest
+`updated_at` and the LogbookRevision edit counter. Until the artifact for
+the current version exists, full exports are streamed, and one of those
+streams (the one holding the version's lock file) writes the artifact as it
+goes. Older artifacts are removed once it is complete.
+"""
+
+from __future__ import annotations
+
+import datetime as dt
+import gzip
+import hashlib
+import logging
+import os
+import tempfile
+import time
+from pathlib import Path
+from typing import BinaryIO, Iterator, Optional
+
+from django.conf import settings
+from django.db.models import Count, Max
+
+from .adif import iter_adif_values
+from .models import ExportCheckpoint, LogbookRevision, LogEntry
+
+logger = logging.getLogger(__name__)
+
+# A build lock older than this is left over from a crashed process
+STALE_LOCK_SECONDS = 3600
+
+
+def checkpoint_since(name: str) -> Optional[dt.datetime]:
+    """When the last complete export named `name` started, or None."""
+    return ExportCheckpoint.objects.filter(name=name).values_list("exported_at", flat=True).first()
+
+
+def iter_with_checkpoint(chunks: Iterator[str], name: str, started: dt.datetime) -> Iterator[str]:
+    """Pass ADIF `chunks` through; advance checkpoint `name` to `started` once they are exhausted."""
+    yield from chunks
+    ExportCheckpoint.objects.update_or_create(name=name, defaults={"exported_at": started})
+
+
+def logbook_version() -> str:
+    """Short hash that changes whenever any log entry is added, changed or deleted."""
+    agg = LogEntry.objects.aggregate(n=Count("pk"), last=Max("updated_at"))
+    last = agg["last"].isoformat() if agg["last"] else ""
+    raw = f"{agg['n']}|{last}|{LogbookRevision.current()}"
+    return hashlib.blake2b(raw.encode("utf-8"), digest_size=10).hexdigest()
+
+
+def _artifact_path(version: str) -> Path:
+    return Path(settings.LOGHUB_EXPORT_CACHE_DIR) / f"loghub-{version}.adi.gz"
+
+
+def open_artifact(version: str) -> Optional[BinaryIO]:
+    """Open the gzipped full export for `version`, or return None if it is not built."""
+    try:
+        # The open handle keeps reading even if a newer build unlinks the file
+        return open(_artifact_path(version), "rb")
+    except FileNotFoundError:
+        return None
+
+
+def _take_lock(lock: Path) -> bool:
+    for _ in range(2):
+        try:
+            os.close(os.open(lock, os.O_CREAT | os.O_EXCL | os.O_WRONLY))
+            return True
+        except FileExistsError:
+            try:
+                if time.time() - lock.stat().st_mtime < STALE_LOCK_SECONDS:
+                    return False
+            except FileNotFoundError:
+                continue
+            lock.unlink(missing_ok=True)
+    return False
+
+
+def iter_building_artifact(chunks: Iterator[str], version: str) -> Iterator[str]:
+    """Pass full-export ADIF `chunks` through, writing the artifact for `version` on the way.
+
+    Only the stream that takes the version's lock file writes; concurrent
+    ones just pass their chunks through. The artifact is published once the
+    chunks are exhausted; an interrupted download discards it.
+    """
+    path = _artifact_path(version)
+    path.parent.mkdir(parents=True, exist_ok=True)
+    lock = path.with_suffix(".lock")
+    if path.exists() or not _take_lock(lock):
+        yield from chunks
+        return
+    started = time.perf_counter()
+    try:
+        fd, tmp = tempfile.mkstemp(dir=path.parent, prefix=".loghub-", suffix=".tmp")
+        try:
+            with os.fdopen(fd, "wb") as raw, gzip.GzipFile(fileobj=raw, mode="wb", mtime=0) as gz:
+                for chunk in chunks:
+                    gz.write(chunk.encode("utf-8"))
+                    yield chunk
+            # Atomic: concurrent readers see either no artifact or a complete one
+            os.replace(tmp, path)
+        except BaseException:
+            Path(tmp).unlink(missing_ok=True)
+            raise
+    finally:
+        lock.unlink(missing_ok=True)
+    for old in path.parent.glob("loghub-*.adi.gz"):
+        if old != path:
+            old.unlink(missing_ok=True)
+    logger.info("Built export artifact %s in %.2fs", path.name, time.perf_counter() - started)
@@ -0,0 +1,62 @@
+"""
+Where log entry extras are stored.
+
+By default extras (non-core ADIF fields) live in the LogEntryExtras table,
+one row per entry that has any. With LOGHUB_INLINE_EXTRAS they live in the
+`extras_data` JSON column of LogEntry itself, so reading, editing and
+exporting a QSO never needs a second query or a join. `LogEntry.get_extras`
+and `set_extras` read and write whichever store is configured.
+
+`move_extras_inline` / `move_extras_to_table` move existing rows between the
+two stores in batches (`manage.py move_extras`); run one after changing the
+setting. Until then `get_extras` falls back to the other store, and the
+logbook.W001 system check (run by `migrate`) warns that exports and extras
+searches miss the extras still there.
+"""
+
+from __future__ import annotations
+
+from django.conf import settings
+from django.db import transaction
+from django.db.models import Model, OuterRef, Subquery
+
+from .models import LogEntry, LogEntryExtras
+
+DEFAULT_MOVE_BATCH_SIZE = 5000
+
+
+def extras_source() -> tuple[type[Model], str]:
+    """(model, JSON field) holding extras in the configured store."""
+    if settings.LOGHUB_INLINE_EXTRAS:
+        return LogEntry, "extras_data"
+    return LogEntryExtras, "data"
+
+
+def move_extras_inline(batch_size: int = DEFAULT_MOVE_BATCH_SIZE) -> int:
+    """Copy LogEntryExtras rows into LogEntry.extras_data and delete them. Return rows moved."""
+    moved = 0
+    while True:
+        with transaction.atomic():
+            ids = list(LogEntryExtras.objects.order_by("entry_id").values_list("entry_id", flat=True)[:batch_size])
+            if not ids:
+                return moved
+            # One UPDATE ... SET extras_data = (SELECT data ...) per batch
+            data = LogEntryExtras.objects.filter(entry_id=OuterRef("pk")).values("data")[:1]
+            LogEntry.objects.filter(pk__in=ids).update(extras_data=Subquery(data))
+            LogEntryExtras.objects.filter(entry_id__in=ids).delete()
+        moved += len(ids)
+
+
+def move_extras_to_table(batch_size: int = DEFAULT_MOVE_BATCH_SIZE) -> int:
+    """Move non-empty LogEntry.extras_data into LogEntryExtras rows. Return rows moved."""
+    moved = 0
+    while True:
+        with transaction.atomic():
+            rows = list(LogEntry.objects.exclude(extras_data={}).order_by("pk").values_list("pk", "extras_data")[:batch_size])
+            if not rows:
+                return moved
+            ids = [pk for pk, _ in rows]
+            LogEntryExtras.objects.filter(entry_id__in=ids).delete()
+            LogEntryExtras.objects.bulk_create([LogEntryExtras(entry_id=pk, data=data) for pk, data in rows])
+            LogEntry.objects.filter(pk__in=ids).update(extras_data={})
+        moved += len(rows)
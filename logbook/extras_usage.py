@@ -0,0 +1,149 @@
+"""
+Extras tag usage tracking and promotion to generated columns.
+
+Every finalized import adds its per-tag counts to ExtrasTagUsage, and every
+logbook search on an extras tag bumps that tag's filter count. Tags that are
+searched a lot can be promoted (`manage.py promote_extras_tags`): a
+generated column mirroring the tag's JSON value is added to the table that
+stores extras (LogEntryExtras, or LogEntry with LOGHUB_INLINE_EXTRAS) with a
+B-tree index on it. PostgreSQL stores the column, which rewrites the table
+once under an exclusive lock, and builds the index concurrently; SQLite,
+which cannot add stored columns to an existing table, adds a virtual one
+(indexes on it are still materialized).
+
+The JSON stays the source of truth: imports and exports keep reading and
+writing it, and the database keeps the column in sync. Only lookups
+change: `promoted_columns()` tells `logbook.filters` which tags to compare
+on their column instead of extracting them from JSON.
+"""
+
+from __future__ import annotations
+
+import logging
+from collections import Counter
+from typing import Iterable, Optional
+
+from django.db import connection
+from django.db.models import F
+
+from .extras_store import extras_source
+from .models import ExtrasTagUsage, LogEntry
+
+logger = logging.getLogger(__name__)
+
+COLUMN_PREFIX = "x_"
+
+# (promotions recorded in ExtrasTagUsage, the subset whose column exists)
+_promoted: Optional[tuple[dict[str, str], dict[str, str]]] = None
+
+
+def column_for(tag: str) -> str:
+    return f"{COLUMN_PREFIX}{tag.lower()}"
+
+
+def _bump(field: str, counts: Counter) -> None:
+    if not counts:
+        return
+    ExtrasTagUsage.objects.bulk_create([ExtrasTagUsage(tag=tag) for tag in counts], ignore_conflicts=True)
+    for tag, n in counts.items():
+        ExtrasTagUsage.objects.filter(tag=tag).update(**{field: F(field) + n})
+
+
+def record_occurrences(extras: Iterable[dict]) -> None:
+    """Count the tags of a batch of stored extras dicts."""
+    _bump("occurrences", Counter(str(tag).upper() for data in extras for tag in data))
+
+
+def record_filter(tag: str) -> None:
+    """Count a search on `tag`, if it is a tag the logbook actually holds.
+
+    Rows are never created from search input, so typos and half-typed tags
+    cannot enter the ranking `promote_extras_tags --top` uses.
+    """
+    ExtrasTagUsage.objects.filter(tag=tag.upper(), occurrences__gt=0).update(filter_count=F("filter_count") + 1)
+
+
+def recount_occurrences(chunk_size: int = 2000) -> int:
+    """Rebuild occurrence counts from the stored extras. Return the number of tags seen."""
+    model, field = extras_source()
+    counts: Counter = Counter()
+    for data in model.objects.values_list(field, flat=True).iterator(chunk_size=chunk_size):
+        counts.update(str(tag).upper() for tag in data or {})
+    ExtrasTagUsage.objects.exclude(tag__in=counts).update(occurrences=0)
+    ExtrasTagUsage.objects.bulk_create([ExtrasTagUsage(tag=tag) for tag in counts], ignore_conflicts=True)
+    for tag, n in counts.items():
+        ExtrasTagUsage.objects.filter(tag=tag).update(occurrences=n)
+    return len(counts)
+
+
+def _table_columns(table: str) -> set[str]:
+    with connection.cursor() as cursor:
+        return {c.name for c in connection.introspection.get_table_description(cursor, table)}
+
+
+def promoted_columns() -> dict[str, str]:
+    """Tag -> generated column for promoted tags whose column exists on the
+    current extras table.
+
+    The recorded promotions are read on every call (one query on a small
+    table), so a promotion run from another process is picked up at once;
+    only the table introspection is cached per process, until they change.
+    """
+    global _promoted
+    recorded = dict(ExtrasTagUsage.objects.exclude(promoted_column="").values_list("tag", "promoted_column"))
+    if _promoted is None or _promoted[0] != recorded:
+        # A table rebuild (e.g. an SQLite migration) may have dropped columns Django does not know about
+        existing = _table_columns(extras_source()[0]._meta.db_table) if recorded else set()
+        _promoted = (recorded, {tag: col for tag, col in recorded.items() if col in existing})
+    return _promoted[1]
+
+
+def clear_promoted_cache() -> None:
+    global _promoted
+    _promoted = None
+
+
+def promote(tag: str) -> str:
+    """Add an indexed generated column for `tag` on the extras table. Return its name.
+
+    On PostgreSQL adding a stored column rewrites the whole table under an
+    ACCESS EXCLUSIVE lock, so reads and writes wait for the rewrite. The
+    index is then built with CREATE INDEX CONCURRENTLY, which needs
+    autocommit; inside a transaction a plain CREATE INDEX is used.
+    """
+    from .filters import TAG_RE
+
+    tag = tag.strip().upper()
+    if not TAG_RE.match(tag):
+        raise ValueError(f"Invalid ADIF tag: {tag!r}")
+    model, field = extras_source()
+    table = model._meta.db_table
+    column = column_for(tag)
+    index = f"{'qso_' if model is LogEntry else ''}extras_{column}_idx"
+    qn = connection.ops.quote_name
+    vendor = connection.vendor
+    if vendor == "postgresql":
+        expr, kind = f"({qn(field)} ->> '{tag}')", "STORED"
+    elif vendor == "sqlite":
+        expr, kind = f"(json_extract({qn(field)}, '$.\"{tag}\"'))", "VIRTUAL"
+    else:
+        raise NotImplementedError(f"Promoting extras tags is not supported on {vendor}")
+    concurrently = vendor == "postgresql" and not connection.in_atomic_block
+    with connection.cursor() as cursor:
+        if column not in _table_columns(table):
+            cursor.execute(f"ALTER TABLE {qn(table)} ADD COLUMN {qn(column)} text GENERATED ALWAYS AS {expr} {kind}")
+        if concurrently:
+            # A failed concurrent build leaves an invalid index that IF NOT EXISTS would keep
+            cursor.execute(
+                "SELECT 1 FROM pg_index i JOIN pg_class c ON c.oid = i.indexrelid WHERE c.relname = %s AND NOT i.indisvalid",
+                [index],
+            )
+            if cursor.fetchone():
+                cursor.execute(f"DROP INDEX CONCURRENTLY {qn(index)}")
+        cursor.execute(
+            f"CREATE INDEX {'CONCURRENTLY ' if concurrently else ''}IF NOT EXISTS {qn(index)} ON {qn(table)} ({qn(column)})"
+        )
+    ExtrasTagUsage.objects.update_or_create(tag=tag, defaults={"promoted_column": column})
+    clear_promoted_cache()
+    logger.info("Promoted extras tag %s to %s.%s", tag, table, column)
+    return column
@@ -0,0 +1,170 @@
+"""
+Logbook filters shared by the list view and ADIF exports.
+
+Each filter is written so PostgreSQL can answer it from an index:
+- callsign prefix: `startswith` on the upper-cased value uses the
+  varchar_pattern_ops index Django adds for `callsign` (db_index=True)
+- callsign substring: `contains` uses the pg_trgm GIN index qso_call_trgm_idx
+- grid prefix: `istartswith` matches the UPPER(gridsquare) pattern index
+  qso_grid_upper_idx
+- band/mode/DXCC/station, alone or with a date range, use the composite
+  (…, qso_date) indexes on LogEntry
+Callsigns are stored upper-cased, so callsign lookups are case-sensitive on
+purpose: case-insensitive lookups would wrap the column in UPPER() and miss
+the indexes.
+
+Extras (non-core ADIF tags kept as JSON) are searched with `filter_extras`,
+"TAG = value" or "TAG exists". On PostgreSQL these are `@>` containment and
+`@?` JSON path tests, both served by the jsonb_path_ops GIN indexes on
+LogEntryExtras.data, LogEntry.extras_data and StagedEntry.extras. Elsewhere
+(SQLite JSON1) they compare json_extract() of the tag, which hits the
+per-tag expression indexes for INDEXED_EXTRA_TAGS; other tags scan. Tags
+promoted to a generated column (see logbook.extras_usage) are compared on
+that column and its B-tree index instead, on either backend.
+"""
+
+from __future__ import annotations
+
+import datetime as dt
+import re
+from typing import Optional
+
+from django.db import connections
+from django.db.models import CharField, Func, JSONField, Lookup, QuerySet
+from django.db.models.lookups import Exact, IsNull
+
+from .adif_catalog import normalize_extra_value
+from .extras_store import extras_source
+from .extras_usage import promoted_columns
+
+# Extras tags with a JSON1 expression index on non-PostgreSQL databases (migration 0012)
+INDEXED_EXTRA_TAGS = ("POTA_REF", "MY_POTA_REF", "WWFF_REF", "MY_WWFF_REF", "STATE", "CNTY", "CONT", "PFX")
+
+TAG_RE = re.compile(r"^[A-Z0-9_]+$")
+
+
+@JSONField.register_lookup
+class HasPath(Lookup):
+    """`field__has_path="$.TAG"`: PostgreSQL jsonb `@?`, which jsonb_path_ops GIN indexes serve."""
+
+    lookup_name = "has_path"
+    prepare_rhs = False
+
+    def as_sql(self, compiler, connection):
+        lhs, lhs_params = self.process_lhs(compiler, connection)
+        rhs, rhs_params = self.process_rhs(compiler, connection)
+        return f"{lhs} @? {rhs}::jsonpath", [*lhs_params, *rhs_params]
+
+
+class ExtraText(Func):
+    """Text value of one tag in an extras JSON column.
+
+    The JSON path is written into the SQL rather than bound as a parameter,
+    so SQLite can match it against the expression indexes.
+    """
+
+    output_field = CharField()
+
+    def __init__(self, expression, tag: str):
+        if not TAG_RE.match(tag):
+            raise ValueError(f"Invalid ADIF tag: {tag!r}")
+        self.tag = tag
+        super().__init__(expression)
+
+    def as_sql(self, compiler, connection, **extra_context):
+        template = f"json_extract(%(expressions)s, '$.\"{self.tag}\"')"
+        return super().as_sql(compiler, connection, template=template, **extra_context)
+
+    def as_postgresql(self, compiler, connection, **extra_context):
+        return super().as_sql(compiler, connection, template=f"(%(expressions)s ->> '{self.tag}')", **extra_context)
+
+
+class PromotedColumn(Func):
+    """A tag's generated column (logbook.extras_usage), qualified like the JSON column it mirrors.
+
+    The generated column is not a model field, so the table alias (which
+    differs inside subqueries) is taken from the compiled JSON column.
+    """
+
+    output_field = CharField()
+
+    def __init__(self, expression, column: str):
+        self.column = column
+        super().__init__(expression)
+
+    def as_sql(self, compiler, connection, **extra_context):
+        sql, params = compiler.compile(self.source_expressions[0])
+        alias = sql.rpartition(".")[0]
+        column = connection.ops.quote_name(self.column)
+        return (f"{alias}.{column}" if alias else column), params
+
+
+def filter_extras(qs: QuerySet, tag: str, value: str = "", field: str = "data") -> QuerySet:
+    """Rows whose JSON column `field` has `tag` (equal to `value`, if given).
+
+    `qs` must hold the JSON column itself (LogEntryExtras "data", LogEntry
+    "extras_data", StagedEntry "extras"); `filter_entries` picks the
+    configured store. `value` is normalized like imported values.
+    """
+    tag = tag.strip().upper()
+    if not TAG_RE.match(tag):
+        raise ValueError(f"Invalid ADIF tag: {tag!r}")
+    value = normalize_extra_value(tag, value) if value else ""
+    conn = connections[qs.db]
+    column = promoted_columns().get(tag) if (qs.model, field) == extras_source() else None
+    if column:
+        lhs = PromotedColumn(field, column)
+        return qs.filter(Exact(lhs, value) if value else IsNull(lhs, False))
+    if conn.vendor == "postgresql":
+        if value:
+            return qs.filter(**{f"{field}__contains": {tag: value}})
+        return qs.filter(**{f"{field}__has_path": f'$."{tag}"'})
+    if value:
+        return qs.filter(Exact(ExtraText(field, tag), value))
+    return qs.filter(IsNull(ExtraText(field, tag), False))
+
+
+def filter_entries(
+    qs: QuerySet,
+    *,
+    call: str = "",
+    call_contains: bool = False,
+    band: str = "",
+    mode: str = "",
+    date_from: Optional[dt.date] = None,
+    date_to: Optional[dt.date] = None,
+    station: str = "",
+    dxcc: Optional[int] = None,
+    grid: str = "",
+    since: Optional[dt.datetime] = None,
+    extra_tag: str = "",
+    extra_value: str = "",
+) -> QuerySet:
+    if call:
+        call = call.strip().upper()
+        qs = qs.filter(callsign__contains=call) if call_contains else qs.filter(callsign__startswith=call)
+    if band:
+        qs = qs.filter(band=band.strip().lower())
+    if mode:
+        qs = qs.filter(mode=mode.strip().upper())
+    if date_from:
+        qs = qs.filter(qso_date__gte=date_from)
+    if date_to:
+        qs = qs.filter(qso_date__lte=date_to)
+    if station:
+        qs = qs.filter(station_callsign=station.strip().upper())
+    if dxcc is not None:
+        qs = qs.filter(dxcc=dxcc)
+    if grid:
+        qs = qs.filter(gridsquare__istartswith=grid.strip())
+    if since:
+        qs = qs.filter(updated_at__gt=since)
+    if extra_tag:
+        model, field = extras_source()
+        if model is qs.model:
+            qs = filter_extras(qs, extra_tag, extra_value, field=field)
+        else:
+            # Semi-join so the extras table is searched through its own index
+            matches = filter_extras(model.objects.using(qs.db), extra_tag, extra_value, field=field)
+            qs = qs.filter(pk__in=matches.values("entry_id"))
+    return qs
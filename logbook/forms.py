@@ -1,5 +1,7 @@
 from django import forms
 
+from .bands import ADIF_BANDS
+from .filters import TAG_RE
 from .models import LogEntry
 
 
@@ -65,3 +67,49 @@ class LogEntryForm(forms.ModelForm):
             "lotw_qsl_sent_date": forms.DateInput(attrs={"type": "date"}),
             "notes": forms.Textarea(attrs={"rows": 3}),
         }
+
+
+class LogEntryFilterForm(forms.Form):
+    """Logbook list filters (GET parameters); all optional."""
+
+    MATCH_PREFIX = "prefix"
+    MATCH_CONTAINS = "contains"
+
+    call = forms.CharField(max_length=20, required=False, label="Callsign")
+    match = forms.ChoiceField(
+        choices=((MATCH_PREFIX, "starts with"), (MATCH_CONTAINS, "contains")),
+        required=False,
+        initial=MATCH_PREFIX,
+    )
+    band = forms.ChoiceField(choices=[("", "Any band")] + [(b, b) for b, _, _ in ADIF_BANDS], required=False)
+    mode = forms.CharField(max_length=20, required=False)
+    date_from = forms.DateField(required=False, widget=forms.DateInput(attrs={"type": "date"}))
+    date_to = forms.DateField(required=False, widget=forms.DateInput(attrs={"type": "date"}))
+    station = forms.CharField(max_length=20, required=False, label="Station callsign")
+    dxcc = forms.IntegerField(min_value=0, required=False, label="DXCC")
+    grid = forms.CharField(max_length=8, required=False)
+    extra_tag = forms.CharField(max_length=64, required=False, label="Extra tag", help_text="e.g. POTA_REF")
+    extra_value = forms.CharField(max_length=255, required=False, label="equals", help_text="Leave empty for \"tag exists\"")
+
+    def clean_extra_tag(self):
+        tag = self.cleaned_data["extra_tag"].strip().upper()
+        if tag and not TAG_RE.match(tag):
+            raise forms.ValidationError("ADIF tags contain only letters, digits and '_'")
+        return tag
+
+    def filters(self) -> dict:
+        """Keyword arguments for `filter_entries` from the valid fields."""
+        data = getattr(self, "cleaned_data", {})
+        return {
+            "call": data.get("call") or "",
+            "call_contains": data.get("match") == self.MATCH_CONTAINS,
+            "band": data.get("band") or "",
+            "mode": data.get("mode") or "",
+            "date_from": data.get("date_from"),
+            "date_to": data.get("date_to"),
+            "station": data.get("station") or "",
+            "dxcc": data.get("dxcc"),
+            "grid": data.get("grid") or "",
+            "extra_tag": data.get("extra_tag") or "",
+            "extra_value": data.get("extra_value") or "",
+        }
@@ -0,0 +1,35 @@
+from django import forms
+
+from .bands import BAND_NAMES
+
+_DATE_FORMATS = ["%Y-%m-%d", "%Y%m%d"]
+
+
+class ADIFExportForm(forms.Form):
+    """Query parameters of the ADIF export; all optional."""
+
+    date_from = forms.DateField(required=False, input_formats=_DATE_FORMATS)
+    date_to = forms.DateField(required=False, input_formats=_DATE_FORMATS)
+    station = forms.CharField(max_length=20, required=False, help_text="STATION_CALLSIGN to export")
+    band = forms.CharField(max_length=10, required=False)
+    since = forms.DateTimeField(required=False, help_text="Only entries added or changed after this time")
+    checkpoint = forms.SlugField(
+        max_length=64,
+        required=False,
+        help_text="Export only entries changed since the last complete export with this name",
+    )
+
+    def clean_band(self):
+        band = self.cleaned_data["band"].strip().lower()
+        if band and band not in BAND_NAMES:
+            raise forms.ValidationError("Unknown ADIF band")
+        return band
+
+    def clean(self):
+        cleaned = super().clean()
+        lo, hi = cleaned.get("date_from"), cleaned.get("date_to")
+        if lo and hi and lo > hi:
+            raise forms.ValidationError("date_from must not be after date_to")
+        if cleaned.get("station"):
+            cleaned["station"] = cleaned["station"].strip().upper()
+        return cleaned
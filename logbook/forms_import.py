@@ -5,4 +5,10 @@ class ADIFUploadForm(forms.Form):
     file = forms.FileField(allow_empty_file=False)
     station_callsign = forms.CharField(max_length=20, required=False, help_text="Optional station callsign context for this import")
     notes = forms.CharField(required=False, widget=forms.Textarea(attrs={"rows": 2}))
+    parse_workers = forms.IntegerField(
+        min_value=1,
+        max_value=32,
+        required=False,
+        help_text="Parse very large files with this many processes (handled by the import worker)",
+    )
 
@@ -0,0 +1,118 @@
+"""
+Import summary statistics, accumulated while staging.
+
+Staging folds each batch of rows into a small aggregate kept in
+`LogImport.meta["stats"]`, so the review header can describe a large import
+without querying its staged rows:
+
+    {
+        "bands": {"20m": n, ...}, "modes": {...}, "stations": {...},
+        "first_date": "YYYY-MM-DD", "last_date": "YYYY-MM-DD",
+        "errors": {"callsign:slash": n, ...},
+        "dxcc": [entity, ...], "new_dxcc": [entity, ...],
+    }
+
+Counts cover every staged row; "errors" also counts records rejected before
+staging (no usable CALL/QSO_DATE/TIME_ON) under REJECTED_CODE, so the
+reasons add up to the import's error total. "dxcc" lists the entities of
+valid rows and "new_dxcc" those not yet in the logbook, settled with one
+indexed query when staging ends.
+
+Editing a staged row clears the stats (see logbook.review_columns), as do
+imports staged before they existed; `import_stats()` then rebuilds them
+from the staged rows.
+"""
+
+from __future__ import annotations
+
+from collections import Counter
+from typing import Iterable, Optional
+
+from .models import LogEntry, LogImport
+from .validation import message_for
+
+META_KEY = "stats"
+
+# Error code for records `cast_record` rejected, which are never staged
+REJECTED_CODE = "record:missing_required"
+
+# Staged columns the stats read
+FIELDS = ("band", "mode", "station_callsign", "qso_date", "dxcc", "errors")
+
+
+def new_stats() -> dict:
+    return {
+        "bands": {}, "modes": {}, "stations": {},
+        "first_date": None, "last_date": None,
+        "errors": {}, "dxcc": [], "new_dxcc": [],
+    }
+
+
+def _count(totals: dict, values: Iterable[str]) -> None:
+    counts = Counter(totals)
+    counts.update(values)
+    totals.clear()
+    totals.update(counts)
+
+
+def add_rows(stats: dict, rows: Iterable[tuple[dict, Optional[dict]]]) -> None:
+    """Fold (data, extras) rows into `stats` in place."""
+    data_rows = [data for data, _ in rows]
+    _count(stats["bands"], ((d.get("band") or "").lower() for d in data_rows))
+    _count(stats["modes"], ((d.get("mode") or "").upper() for d in data_rows))
+    _count(stats["stations"], ((d.get("station_callsign") or "").upper() for d in data_rows))
+    _count(stats["errors"], (code for d in data_rows for code in d.get("errors") or ()))
+    dates = [d["qso_date"].isoformat() for d in data_rows if d.get("qso_date")]
+    if dates:
+        first, last = min(dates), max(dates)
+        stats["first_date"] = min(filter(None, (stats["first_date"], first)))
+        stats["last_date"] = max(filter(None, (stats["last_date"], last)))
+    entities = {d["dxcc"] for d in data_rows if d.get("dxcc") is not None and not d.get("errors")}
+    if not entities <= set(stats["dxcc"]):
+        stats["dxcc"] = sorted(entities.union(stats["dxcc"]))
+
+
+def set_rejected(stats: dict, count: int) -> None:
+    """Record how many records were rejected before staging."""
+    if count:
+        stats["errors"][REJECTED_CODE] = count
+    else:
+        stats["errors"].pop(REJECTED_CODE, None)
+
+
+def finish_stats(stats: dict) -> None:
+    """Settle which of the import's DXCC entities the logbook has not worked yet."""
+    known = set(LogEntry.objects.filter(dxcc__in=stats["dxcc"]).values_list("dxcc", flat=True).distinct())
+    stats["new_dxcc"] = [entity for entity in stats["dxcc"] if entity not in known]
+
+
+def import_stats(imp: LogImport) -> dict:
+    """The import's stats, rebuilt from its staged rows and saved first if missing."""
+    stats = (imp.meta or {}).get(META_KEY)
+    if stats is None:
+        stats = new_stats()
+        add_rows(stats, ((row, None) for row in imp.staged_entries.values(*FIELDS).iterator()))
+        set_rejected(stats, imp.error_count or 0)
+        finish_stats(stats)
+        imp.save_meta(**{META_KEY: stats})
+    return stats
+
+
+def _ranked(counts: dict, limit: Optional[int] = None) -> list[tuple[str, int]]:
+    ranked = sorted(counts.items(), key=lambda kv: (-kv[1], kv[0]))
+    return ranked[:limit] if limit else ranked
+
+
+def stats_display(stats: dict, limit: int = 10) -> dict:
+    """Template-ready stats: (label, count) pairs, largest first, at most `limit` each."""
+    return {
+        "bands": [(band or "(none)", n) for band, n in _ranked(stats["bands"], limit)],
+        "modes": [(mode or "(none)", n) for mode, n in _ranked(stats["modes"], limit)],
+        "stations": [(call or "(none)", n) for call, n in _ranked(stats["stations"], limit)],
+        "first_date": stats["first_date"],
+        "last_date": stats["last_date"],
+        "errors": [
+            (f"{code.partition(':')[0]}: {message_for(code)}", n) for code, n in _ranked(stats["errors"])
+        ],
+        "new_dxcc": stats["new_dxcc"],
+    }
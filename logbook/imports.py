@@ -1,18 +1,28 @@
-import datetime as dt
 import gzip
 import hashlib
 import io
-import re
-from typing import Iterable
+import itertools
+import json
+import logging
+import shutil
+import tempfile
+import time
+from typing import BinaryIO, Callable, Iterable, Iterator, Optional
 
-from django.db import transaction
+from django.conf import settings
+from django.db import connection, transaction
+from django.utils import timezone
 
 from .models import LogEntry, LogEntryExtras, LogImport, StagedEntry
-from .adif_fields import CORE_MAP
-from .adif_catalog import normalize_extra_value
+from .adif_fields import FIELD_TAGS, cast_record
+from .adif_parallel import iter_parallel_ranges, row_to_data
+from .extras_usage import record_occurrences
+from . import import_stats, review_columns
+from .dedup import STATUS_DUPLICATE, classify_rows, dupe_key, known_fingerprints, record_fingerprint
+from .validation import validate_rows
+from .adif_tokenizer import DEFAULT_CHUNK_SIZE, ADIFTokenizer, iter_adif_chunks, iter_file_chunks
 
-
-ADIF_TAG_RE = re.compile(r"<([A-Za-z0-9_]+):([0-9]+)(?::[A-Za-z])?>", re.IGNORECASE)
+logger = logging.getLogger(__name__)
 
 
 def gzip_bytes(data: bytes) -> bytes:
@@ -22,154 +32,416 @@ def gzip_bytes(data: bytes) -> bytes:
     return buf.getvalue()
 
 
-def parse_adif_records(data: str) -> Iterable[dict]:
-    # Split on <EOR> boundaries; ignore header prior to <EOH>
-    parts = data.split("<EOH>")
-    body = parts[1] if len(parts) > 1 else parts[0]
-    for rec in body.split("<EOR>"):
-        rec = rec.strip()
-        if not rec:
-            continue
-        pos = 0
-        fields: dict[str, str] = {}
-        while True:
-            m = ADIF_TAG_RE.search(rec, pos)
-            if not m:
-                break
-            tag = m.group(1).upper()
-            length = int(m.group(2))
-            val_start = m.end()
-            value = rec[val_start : val_start + length]
-            fields[tag] = value
-            pos = val_start + length
-        yield fields
-
-
-def _to_date(s: str | None) -> dt.date | None:
-    if not s:
-        return None
-    try:
-        return dt.datetime.strptime(s, "%Y%m%d").date()
-    except Exception:
-        return None
-
-
-def _to_time(s: str | None) -> dt.time | None:
-    if not s:
-        return None
-    try:
-        # Accept 4 or 6 digits
-        if len(s) == 4:
-            return dt.datetime.strptime(s, "%H%M").time()
-        return dt.datetime.strptime(s, "%H%M%S").time()
-    except Exception:
-        return None
+def parse_adif_records(data: str | bytes) -> Iterable[dict]:
+    """Yield ADIF records (TAG -> value) from a complete document.
+
+    Thin wrapper over the incremental tokenizer; use `iter_adif_file` or
+    `ADIFTokenizer` directly to stream large uploads.
+    """
+    if isinstance(data, str):
+        data = data.encode("utf-8")
+    return iter_adif_chunks([data])
 
 
 # CORE_MAP now provided by adif_fields
 
 
-def parse_adif_to_staged(imp: LogImport, text: str) -> tuple[int, int]:
+# LogEntry columns copied verbatim from StagedEntry on finalize (and validated on staging)
+FINALIZE_FIELDS: tuple[str, ...] = tuple(
+    f.name
+    for f in LogEntry._meta.concrete_fields
+    if f.name not in {"id", "upload", "dupe_key", "extras_data", "created_at", "updated_at"}
+)
+
+
+_VALIDATED_FIELDS = [LogEntry._meta.get_field(name) for name in FINALIZE_FIELDS]
+
+# Error reasons meaning the value does not fit its column (length, range, digits)
+_UNSTORABLE = ("too_long", "invalid")
+
+
+def _set_aside_unstorable(batch: list[tuple[dict, dict]]) -> None:
+    """Move values their staging column cannot hold into extras.
+
+    Flagged rows are never finalized, but a single over-long or out-of-range
+    value would still make PostgreSQL reject the whole staging INSERT/COPY.
+    As `cast_record` does for bad casts, the raw value is kept in extras
+    under its ADIF tag and the column is emptied.
+    """
+    for data, extras in batch:
+        for code in data.get("errors") or ():
+            name, _, reason = code.partition(":")
+            if reason not in _UNSTORABLE or data.get(name) in (None, ""):
+                continue
+            extras[FIELD_TAGS.get(name, name.upper())] = str(data[name])
+            data[name] = None if StagedEntry._meta.get_field(name).null else ""
+
+
+def parse_adif_to_staged(imp: LogImport, text: str | bytes) -> tuple[int, int]:
     """Parse ADIF text, create StagedEntry rows. Return (ok_count, error_count)."""
+    return stage_records(imp, parse_adif_records(text))
+
+
+def stage_records(
+    imp: LogImport,
+    records: Iterable[dict],
+    progress: Optional[Callable[[int], None]] = None,
+    batch_size: Optional[int] = None,
+    claim: Optional[Callable[[], None]] = None,
+) -> tuple[int, int]:
+    """Create StagedEntry rows from parsed ADIF records. Return (ok_count, error_count).
+
+    Records are consumed lazily and flushed every `batch_size` rows
+    (LOGHUB_STAGING_BATCH_SIZE by default), so memory does not grow with the
+    import beyond one fingerprint per staged record. On PostgreSQL with
+    psycopg 3 each batch is streamed with COPY; other backends use bulk_create. `progress`, if given, is called after
+    each batch with the number of records seen so far. `claim`, if given, is
+    called before each batch is written, in the same transaction; it raises
+    to stop staging when the caller no longer owns the import.
+    """
+    batch_size = batch_size or settings.LOGHUB_STAGING_BATCH_SIZE
+    counts = {"seen": 0, "err": 0, "skipped": 0}
+    staged: set[str] = set()
+
+    def rows() -> Iterator[tuple[dict, dict]]:
+        it = iter(records)
+        while True:
+            raw = list(itertools.islice(it, batch_size))
+            if not raw:
+                return
+            counts["seen"] += len(raw)
+            fps = [record_fingerprint(fields) for fields in raw]
+            for fields, fp in _drop_known(raw, fps, counts, staged):
+                row = cast_record(fields)
+                if row is None:
+                    counts["err"] += 1
+                    continue
+                row[0]["fingerprint"] = fp
+                yield row
+
+    ok = _write_staged_batches(
+        imp, rows(), lambda: counts["seen"], progress, batch_size, rejected=lambda: counts["err"], claim=claim
+    )
+    imp.skipped_count = counts["skipped"]
+    logger.info(
+        "Import %s: %d records seen, %d already imported, %d rejected",
+        imp.pk, counts["seen"], counts["skipped"], counts["err"],
+    )
+    return ok, counts["err"]
+
+
+def _drop_known(items: list, fps: list[str], counts: dict, staged: set[str]) -> Iterator[tuple]:
+    """Yield (item, fingerprint) for records not yet in the logbook.
+
+    One indexed lookup per batch. Repeats within the file are dropped too,
+    whichever batch they fall in: `staged` collects the fingerprints yielded
+    so far (32 bytes a record). Dropped records are counted in counts["skipped"].
+    """
+    known = known_fingerprints(fps)
+    for item, fp in zip(items, fps):
+        if fp in known or fp in staged:
+            counts["skipped"] += 1
+            continue
+        staged.add(fp)
+        yield item, fp
+
+
+def _write_staged_batches(
+    imp: LogImport,
+    rows: Iterator[tuple[dict, dict]],
+    seen: Callable[[], int],
+    progress: Optional[Callable[[int], None]] = None,
+    batch_size: Optional[int] = None,
+    rejected: Callable[[], int] = lambda: 0,
+    claim: Optional[Callable[[], None]] = None,
+) -> int:
+    """Write cast (data, extras) rows in fixed-size batches. Return rows written.
+
+    `seen` and `rejected` report how many records the source has read and
+    how many of those it could not cast.
+
+    The import's review column summary and statistics are rebuilt along the
+    way, one batch at a time (see logbook.review_columns and
+    logbook.import_stats).
+    """
+    batch_size = batch_size or settings.LOGHUB_STAGING_BATCH_SIZE
+    write = _copy_staged if _can_copy() else _bulk_create_staged
+    summary = review_columns.new_summary()
+    stats = import_stats.new_stats()
     ok = 0
-    err = 0
-    to_create: list[StagedEntry] = []
-    for fields in parse_adif_records(text):
-        data: dict = {}
-        extras: dict = {}
-        for tag, val in fields.items():
-            if tag in CORE_MAP:
-                mapping = CORE_MAP[tag]
-                if isinstance(mapping, tuple):
-                    key, caster = mapping
-                    try:
-                        data[key] = caster(val)
-                    except Exception:
-                        # Bad cast, keep as extra so user can inspect
-                        extras[tag] = val
-                else:
-                    data[mapping] = val
+    batches = 0
+    started = time.perf_counter()
+    while True:
+        batch = list(itertools.islice(rows, batch_size))
+        if not batch:
+            break
+        t = time.perf_counter()
+        codes = validate_rows([data for data, _ in batch], fields=_VALIDATED_FIELDS)
+        for (data, _), row_codes in zip(batch, codes):
+            data["errors"] = row_codes
+        _set_aside_unstorable(batch)
+        classify_rows([data for data, _ in batch])
+        review_columns.add_rows(summary, batch)
+        import_stats.add_rows(stats, batch)
+        import_stats.set_rejected(stats, rejected())
+        with transaction.atomic():
+            # Checked under the write's transaction so a takeover cannot slip in between
+            if claim:
+                claim()
+            write(imp, batch)
+            _save_staging_meta(imp, summary, stats)
+        ok += len(batch)
+        batches += 1
+        logger.debug("Import %s: staged batch %d (%d rows) in %.3fs", imp.pk, batches, len(batch), time.perf_counter() - t)
+        if progress:
+            progress(seen())
+    logger.info(
+        "Import %s: staged %d rows in %d batches of <=%d via %s in %.2fs",
+        imp.pk, ok, batches, batch_size, write.__name__, time.perf_counter() - started,
+    )
+    import_stats.set_rejected(stats, rejected())
+    import_stats.finish_stats(stats)
+    _save_staging_meta(imp, summary, stats)
+    if progress:
+        progress(seen())
+    return ok
+
+
+def _save_staging_meta(imp: LogImport, summary: dict, stats: dict) -> None:
+    imp.save_meta(**{review_columns.META_KEY: summary, import_stats.META_KEY: stats})
+
+
+def _bulk_create_staged(imp: LogImport, rows: Iterable[tuple[dict, dict]]) -> int:
+    to_create = [StagedEntry(imp=imp, extras=extras, **data) for data, extras in rows]
+    StagedEntry.objects.bulk_create(to_create)
+    return len(to_create)
+
+
+# StagedEntry columns written by COPY, in order (everything but the pk)
+_COPY_FIELDS = [f for f in StagedEntry._meta.concrete_fields if not f.primary_key]
+
+
+def _can_copy() -> bool:
+    if connection.vendor != "postgresql":
+        return False
+    from django.db.backends.postgresql.psycopg_any import is_psycopg3
+
+    return is_psycopg3
+
+
+def _copy_staged(imp: LogImport, rows: Iterable[tuple[dict, dict]]) -> int:
+    """Stream (data, extras) rows into the staging table with COPY FROM STDIN."""
+    qn = connection.ops.quote_name
+    sql = "COPY {} ({}) FROM STDIN".format(
+        qn(StagedEntry._meta.db_table),
+        ", ".join(qn(f.column) for f in _COPY_FIELDS),
+    )
+    now = timezone.now()
+    defaults = {f.attname: f.get_default() for f in _COPY_FIELDS}
+    defaults.update(imp_id=imp.pk, created_at=now)
+    names = [f.attname for f in _COPY_FIELDS]
+    n = 0
+    with connection.cursor() as cursor:
+        with cursor.cursor.copy(sql) as copy:
+            for data, extras in rows:
+                values = {**defaults, **data, "extras": json.dumps(extras), "errors": json.dumps(data.get("errors"))}
+                copy.write_row([values[name] for name in names])
+                n += 1
+    return n
+
+
+def stage_import_content(
+    imp: LogImport,
+    progress: Optional[Callable[[int, int], None]] = None,
+    chunk_size: int = DEFAULT_CHUNK_SIZE,
+    workers: int = 1,
+    claim: Optional[Callable[[], None]] = None,
+) -> tuple[int, int]:
+    """(Re)stage an import from its stored gzipped content.
+
+    Any rows left by an interrupted attempt are dropped first. `progress` is
+    called with (bytes_consumed, records_seen). With `workers` > 1 the content
+    is decompressed to a temporary file and parsed by a process pool.
+    `claim` is checked before each batch write (see stage_records).
+    """
+    imp.staged_entries.all().delete()
+    with gzip.GzipFile(fileobj=io.BytesIO(bytes(imp.content_gz or b"")), mode="rb") as gz:
+        if workers > 1:
+            return _stage_parallel(imp, gz, workers, progress, claim)
+        tok = ADIFTokenizer()
+        records = iter_adif_chunks(iter_file_chunks(gz, chunk_size), tok)
+        report = (lambda seen: progress(tok.bytes_consumed, seen)) if progress else None
+        return stage_records(imp, records, progress=report, claim=claim)
+
+
+def _stage_parallel(
+    imp: LogImport,
+    src: BinaryIO,
+    workers: int,
+    progress: Optional[Callable[[int, int], None]] = None,
+    claim: Optional[Callable[[], None]] = None,
+) -> tuple[int, int]:
+    state = {"seen": 0, "err": 0, "skipped": 0, "bytes": 0}
+    staged: set[str] = set()
+    with tempfile.NamedTemporaryFile(suffix=".adi") as tmp:
+        shutil.copyfileobj(src, tmp, DEFAULT_CHUNK_SIZE)
+        tmp.flush()
+
+        def rows() -> Iterator[tuple[dict, dict]]:
+            for range_rows, err, seen, end in iter_parallel_ranges(tmp.name, workers):
+                state["seen"] += seen
+                state["err"] += err
+                state["bytes"] = end
+                # Workers have no database access, so known records are dropped here
+                for (values, extras, _), fp in _drop_known(range_rows, [r[2] for r in range_rows], state, staged):
+                    data = row_to_data(values)
+                    data["fingerprint"] = fp
+                    yield data, extras
+
+        report = (lambda seen: progress(state["bytes"], seen)) if progress else None
+        ok = _write_staged_batches(imp, rows(), lambda: state["seen"], report, rejected=lambda: state["err"], claim=claim)
+    imp.skipped_count = state["skipped"]
+    logger.info(
+        "Import %s: parsed with %d workers, %d records seen, %d already imported",
+        imp.pk, workers, state["seen"], state["skipped"],
+    )
+    return ok, state["err"]
+
+
+def _entry_from_staged(se: StagedEntry, imp: LogImport) -> LogEntry:
+    entry = LogEntry(upload=imp, **{name: getattr(se, name) for name in FINALIZE_FIELDS})
+    entry.dupe_key = dupe_key(entry.callsign, entry.band, entry.mode)
+    return entry
+
+
+def finalize_import(
+    imp: LogImport,
+    batch_size: Optional[int] = None,
+    progress: Optional[Callable[[int], None]] = None,
+) -> int:
+    """Move staged entries to the main logbook, linking back to the import.
+
+    Rows flagged with validation errors or as duplicates at staging are
+    skipped (and counted); the rest are inserted with bulk_create, one
+    committed transaction per batch. The last finalized staged pk is
+    checkpointed in `imp.meta["finalize"]` inside each batch, so an
+    interrupted run resumes where it stopped. `progress` is called with the
+    number of staged rows handled so far.
+    Return the number of log entries created.
+    """
+    batch_size = batch_size or settings.LOGHUB_FINALIZE_BATCH_SIZE
+    state: dict = {}
+    while True:
+        with transaction.atomic():
+            # Row lock serializes concurrent runs and makes the checkpoint read fresh
+            locked = LogImport.objects.select_for_update().only("meta").get(pk=imp.pk)
+            meta = dict(locked.meta or {})
+            state = dict(meta.get("finalize") or {"cursor": 0, "created": 0, "skipped": 0})
+            batch = list(imp.staged_entries.filter(pk__gt=state["cursor"]).order_by("pk")[:batch_size])
+            if not batch:
+                break
+            # Rows were validated on staging; only rows staged before that need it now
+            unchecked = [se for se in batch if se.errors is None]
+            if unchecked:
+                rows = [{name: getattr(se, name) for name in FINALIZE_FIELDS} for se in unchecked]
+                for se, row, codes in zip(unchecked, rows, validate_rows(rows, fields=_VALIDATED_FIELDS)):
+                    for name, value in row.items():
+                        setattr(se, name, value)
+                    se.errors = codes
+            # Another import may have brought in the same records since staging
+            known = known_fingerprints(se.fingerprint for se in batch if se.fingerprint)
+            entries: list[LogEntry] = []
+            extras: list[dict] = []
+            for se in batch:
+                if se.errors or se.dupe_status == STATUS_DUPLICATE or se.fingerprint in known:
+                    state["skipped"] += 1
+                    continue
+                entries.append(_entry_from_staged(se, imp))
+                extras.append(se.extras)
+                # Later copies in this batch; earlier batches are committed and looked up above
+                if se.fingerprint:
+                    known.add(se.fingerprint)
+            if settings.LOGHUB_INLINE_EXTRAS:
+                for entry, x in zip(entries, extras):
+                    entry.extras_data = x or {}
+                LogEntry.objects.bulk_create(entries)
             else:
-                # Normalize per ADIF catalog when possible
-                extras[tag] = normalize_extra_value(tag, val)
-        # Required minimal fields
-        if not data.get("callsign") or not data.get("qso_date") or not data.get("time_on"):
-            err += 1
-            continue
-        se = StagedEntry(imp=imp, **data)
-        if extras:
-            se.extras = extras
-        to_create.append(se)
-    # Bulk create in batches
-    for i in range(0, len(to_create), 500):
-        StagedEntry.objects.bulk_create(to_create[i : i + 500])
-    ok += len(to_create)
-    return ok, err
-
-
-@transaction.atomic
-def finalize_import(imp: LogImport) -> int:
-    """Move staged entries to the main logbook, linking back to the import."""
-    count = 0
-    for se in imp.staged_entries.all().iterator():
-        entry = LogEntry(
-            callsign=se.callsign,
-            qso_date=se.qso_date,
-            time_on=se.time_on,
-            band=se.band,
-            freq=se.freq,
-            band_rx=se.band_rx,
-            freq_rx=se.freq_rx,
-            mode=se.mode,
-            submode=se.submode,
-            prop_mode=se.prop_mode,
-            sat_name=se.sat_name,
-            station_callsign=se.station_callsign,
-            operator=se.operator,
-            rst_sent=se.rst_sent,
-            rst_rcvd=se.rst_rcvd,
-            qso_date_off=se.qso_date_off,
-            time_off=se.time_off,
-            srx=se.srx,
-            srx_string=se.srx_string,
-            stx=se.stx,
-            stx_string=se.stx_string,
-            country=se.country,
-            gridsquare=se.gridsquare,
-            name=se.name,
-            tx_pwr=se.tx_pwr,
-            dxcc=se.dxcc,
-            cq_zone=se.cq_zone,
-            itu_zone=se.itu_zone,
-            iota=se.iota,
-            my_dxcc=se.my_dxcc,
-            my_state=se.my_state,
-            my_cnty=se.my_cnty,
-            my_gridsquare=se.my_gridsquare,
-            my_vucc_grids=se.my_vucc_grids,
-            my_cq_zone=se.my_cq_zone,
-            my_itu_zone=se.my_itu_zone,
-            my_name=se.my_name,
-            lotw_qsl_rcvd=se.lotw_qsl_rcvd,
-            lotw_qsl_rcvd_date=se.lotw_qsl_rcvd_date,
-            lotw_qsl_sent=se.lotw_qsl_sent,
-            lotw_qsl_sent_date=se.lotw_qsl_sent_date,
-            sig=se.sig,
-            sig_info=se.sig_info,
-            my_sig=se.my_sig,
-            my_sig_info=se.my_sig_info,
-            sota_ref=se.sota_ref,
-            my_sota_ref=se.my_sota_ref,
-            notes=se.notes,
-            upload=imp,
-        )
-        entry.save()
-        if se.extras:
-            LogEntryExtras.objects.create(entry=entry, data=se.extras)
-        count += 1
+                LogEntry.objects.bulk_create(entries)
+                LogEntryExtras.objects.bulk_create(
+                    [LogEntryExtras(entry_id=e.pk, data=x) for e, x in zip(entries, extras) if x]
+                )
+            record_occurrences(x for x in extras if x)
+            state["cursor"] = batch[-1].pk
+            state["created"] += len(entries)
+            meta["finalize"] = state
+            LogImport.objects.filter(pk=imp.pk).update(meta=meta)
+        imp.meta = meta
+        if progress:
+            progress(state["created"] + state["skipped"])
     # Keep staged entries for historical review; do not delete after finalization
-    return count
+    return state["created"]
 
 
 def compute_sha256(b: bytes) -> str:
     return hashlib.sha256(b).hexdigest()
+
+
+def sha256_chunks(chunks: Iterable[bytes]) -> str:
+    h = hashlib.sha256()
+    for chunk in chunks:
+        h.update(chunk)
+    return h.hexdigest()
+
+
+def find_same_file_import(sha256: str) -> Optional[LogImport]:
+    """Return an earlier live (not cancelled or failed) import of the same file, if any."""
+    return (
+        LogImport.objects.filter(sha256=sha256)
+        .exclude(status__in=(LogImport.STATUS_CANCELLED, LogImport.STATUS_FAILED))
+        .order_by("pk")
+        .first()
+    )
+
+
+class UploadStream:
+    """Single pass over an upload: hash, gzip and tokenize each chunk once.
+
+    Iterate `records()` (or call `consume()`) to drive the pass; afterwards
+    `size_bytes`, `sha256` and `gzipped()` describe the whole upload. The compressed copy is spooled
+    to a temporary file once it outgrows `spool_max_size`.
+    """
+
+    def __init__(self, chunks: Iterable[bytes], spool_max_size: int = 1024 * 1024):
+        self._chunks = chunks
+        self._hash = hashlib.sha256()
+        self._gz_file = tempfile.SpooledTemporaryFile(max_size=spool_max_size)
+        self._gz = gzip.GzipFile(fileobj=self._gz_file, mode="wb")
+        self.tokenizer = ADIFTokenizer()
+        self.size_bytes = 0
+
+    def _read(self) -> Iterator[bytes]:
+        for chunk in self._chunks:
+            self.size_bytes += len(chunk)
+            self._hash.update(chunk)
+            self._gz.write(chunk)
+            yield chunk
+        self._gz.close()
+
+    def records(self) -> Iterator[dict]:
+        return iter_adif_chunks(self._read(), self.tokenizer)
+
+    def consume(self) -> None:
+        """Hash and compress without parsing (parsing is left to a worker)."""
+        for _ in self._read():
+            pass
+
+    @property
+    def sha256(self) -> str:
+        return self._hash.hexdigest()
+
+    def gzipped(self) -> bytes:
+        """Return the compressed upload (call after `records()` is exhausted)."""
+        self._gz_file.seek(0)
+        data = self._gz_file.read()
+        self._gz_file.close()
+        return data
@@ -0,0 +1,141 @@
+"""
+DB-backed import job queue.
+
+Imports in a queued status (parsing/finalizing) are jobs. A worker claims one
+with SELECT ... FOR UPDATE SKIP LOCKED, stamps `claimed_by`/`claimed_at` and
+commits, so several workers can drain the queue in parallel. Progress updates
+double as a heartbeat; a claim whose heartbeat is older than the lease is
+considered abandoned and can be taken over by another worker.
+"""
+
+from __future__ import annotations
+
+import datetime as dt
+import logging
+import os
+import socket
+
+from django.db import transaction
+from django.db.models import Q
+from django.utils import timezone
+
+from .imports import finalize_import, stage_import_content
+from .models import LogImport
+
+logger = logging.getLogger(__name__)
+
+DEFAULT_LEASE_SECONDS = 300
+
+
+class LeaseLost(Exception):
+    """Raised when another worker has taken over the import being processed."""
+
+
+def default_worker_id() -> str:
+    return f"{socket.gethostname()}:{os.getpid()}"
+
+
+def claim_next_import(worker_id: str, lease_seconds: int = DEFAULT_LEASE_SECONDS) -> LogImport | None:
+    """Claim the oldest queued import not held by a live worker."""
+    now = timezone.now()
+    stale = now - dt.timedelta(seconds=lease_seconds)
+    with transaction.atomic():
+        imp = (
+            LogImport.objects.select_for_update(skip_locked=True)
+            .filter(status__in=LogImport.QUEUED_STATUSES)
+            .filter(Q(claimed_at__isnull=True) | Q(claimed_at__lt=stale))
+            .order_by("created_at", "pk")
+            .first()
+        )
+        if imp is None:
+            return None
+        imp.claimed_by = worker_id
+        imp.claimed_at = now
+        imp.save(update_fields=["claimed_by", "claimed_at"])
+    return imp
+
+
+def _report(imp: LogImport, worker_id: str, **fields) -> None:
+    """Persist progress for `imp` and renew the claim."""
+    fields.setdefault("claimed_at", timezone.now())
+    updated = LogImport.objects.filter(pk=imp.pk, claimed_by=worker_id).update(**fields)
+    if not updated:
+        raise LeaseLost(f"Import {imp.pk} is no longer claimed by {worker_id}")
+    for k, v in fields.items():
+        setattr(imp, k, v)
+
+
+def _check_claim(imp: LogImport, worker_id: str) -> None:
+    """Lock `imp` for the current transaction; raise LeaseLost if another worker owns it."""
+    if not LogImport.objects.select_for_update().filter(pk=imp.pk, claimed_by=worker_id).exists():
+        raise LeaseLost(f"Import {imp.pk} is no longer claimed by {worker_id}")
+
+
+def _release(imp: LogImport, worker_id: str, **fields) -> None:
+    _report(imp, worker_id, claimed_by="", claimed_at=None, **fields)
+
+
+def run_import_job(imp: LogImport, worker_id: str, parse_workers: int = 1) -> None:
+    """Process a claimed import: stage it, or move staged rows to the logbook.
+
+    `parse_workers` is the default process count for parsing; an import may
+    override it with `meta["parse_workers"]`.
+    """
+    try:
+        if imp.status == LogImport.STATUS_PARSING:
+            _report(imp, worker_id, processed_bytes=0, processed_records=0, total_records=0)
+            ok, err = stage_import_content(
+                imp,
+                progress=lambda nbytes, seen: _report(imp, worker_id, processed_bytes=nbytes, processed_records=seen),
+                workers=int((imp.meta or {}).get("parse_workers") or parse_workers),
+                claim=lambda: _check_claim(imp, worker_id),
+            )
+            _release(
+                imp,
+                worker_id,
+                status=LogImport.STATUS_PENDING,
+                entry_count=ok,
+                error_count=err,
+                skipped_count=imp.skipped_count,
+                processed_bytes=imp.size_bytes or 0,
+                processed_records=ok + err,
+                total_records=ok + err,
+            )
+        elif imp.status == LogImport.STATUS_FINALIZING:
+            _report(imp, worker_id, processed_records=0, total_records=imp.entry_count)
+            created = finalize_import(
+                imp,
+                progress=lambda handled: _report(imp, worker_id, processed_records=handled),
+            )
+            _release(
+                imp,
+                worker_id,
+                status=LogImport.STATUS_DONE,
+                imported_at=timezone.now(),
+                entry_count=created,
+            )
+    except LeaseLost:
+        logger.warning("Lost claim on import %s; leaving it to the new owner", imp.pk)
+    except Exception as exc:
+        logger.exception("Import %s failed", imp.pk)
+        meta = dict(imp.meta or {})
+        meta["error"] = str(exc)
+        LogImport.objects.filter(pk=imp.pk, claimed_by=worker_id).update(
+            status=LogImport.STATUS_FAILED, meta=meta, claimed_by="", claimed_at=None
+        )
+
+
+def drain_queue(
+    worker_id: str | None = None,
+    lease_seconds: int = DEFAULT_LEASE_SECONDS,
+    parse_workers: int = 1,
+) -> int:
+    """Process queued imports until none are left. Return how many were run."""
+    worker_id = worker_id or default_worker_id()
+    done = 0
+    while True:
+        imp = claim_next_import(worker_id, lease_seconds)
+        if imp is None:
+            return done
+        run_import_job(imp, worker_id, parse_workers=parse_workers)
+        done += 1
@@ -0,0 +1,33 @@
+import time
+
+from django.conf import settings
+from django.core.management.base import BaseCommand
+
+from logbook.jobs import DEFAULT_LEASE_SECONDS, default_worker_id, drain_queue
+
+
+class Command(BaseCommand):
+    help = "Process queued ADIF imports (parsing and finalizing). Run several for parallelism."
+
+    def add_arguments(self, parser):
+        parser.add_argument("--once", action="store_true", help="Drain the queue once and exit")
+        parser.add_argument("--sleep", type=float, default=2.0, help="Seconds to wait when the queue is empty")
+        parser.add_argument("--lease", type=int, default=DEFAULT_LEASE_SECONDS, help="Seconds before a silent claim is retaken")
+        parser.add_argument("--worker-id", default="", help="Identifier recorded on claimed imports")
+        parser.add_argument(
+            "--parse-workers",
+            type=int,
+            default=settings.LOGHUB_IMPORT_PARSE_WORKERS,
+            help="Processes used to parse each import (an import's own setting wins)",
+        )
+
+    def handle(self, *args, **opts):
+        worker_id = opts["worker_id"] or default_worker_id()
+        self.stdout.write(f"Import worker {worker_id} started")
+        while True:
+            done = drain_queue(worker_id, lease_seconds=opts["lease"], parse_workers=opts["parse_workers"])
+            if done:
+                self.stdout.write(f"Processed {done} import job(s)")
+            if opts["once"]:
+                return
+            time.sleep(opts["sleep"])
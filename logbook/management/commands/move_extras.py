@@ -0,0 +1,22 @@
+from django.conf import settings
+from django.core.management.base import BaseCommand
+
+from logbook.extras_store import DEFAULT_MOVE_BATCH_SIZE, move_extras_inline, move_extras_to_table
+
+
+class Command(BaseCommand):
+    help = "Move log entry extras between the LogEntryExtras table and the inline LogEntry column."
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            "--to",
+            choices=["inline", "table"],
+            default="inline" if settings.LOGHUB_INLINE_EXTRAS else "table",
+            help="Target store (defaults to the one LOGHUB_INLINE_EXTRAS selects)",
+        )
+        parser.add_argument("--batch-size", type=int, default=DEFAULT_MOVE_BATCH_SIZE, help="Entries moved per transaction")
+
+    def handle(self, *args, **opts):
+        move = move_extras_inline if opts["to"] == "inline" else move_extras_to_table
+        moved = move(batch_size=opts["batch_size"])
+        self.stdout.write(f"Moved extras of {moved} log entr{'y' if moved == 1 else 'ies'} to the {opts['to']} store")
@@ -0,0 +1,41 @@
+from django.core.management.base import BaseCommand, CommandError
+
+from logbook.extras_usage import promote, recount_occurrences
+from logbook.models import ExtrasTagUsage
+
+
+class Command(BaseCommand):
+    help = (
+        "Promote extras tags to indexed generated columns on the extras table, by name or by usage. "
+        "On PostgreSQL each new column rewrites the whole extras table, blocking reads and writes "
+        "until it finishes (minutes on a large logbook); the index is then built concurrently. "
+        "Run it in a quiet period."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument("tags", nargs="*", help="ADIF tags to promote (e.g. POTA_REF)")
+        parser.add_argument("--top", type=int, default=0, help="Also promote the N most searched tags")
+        parser.add_argument("--list", action="store_true", help="Show tag usage and exit")
+        parser.add_argument("--recount", action="store_true", help="Rebuild occurrence counts from stored extras first")
+
+    def handle(self, *args, **opts):
+        if opts["recount"]:
+            n = recount_occurrences()
+            self.stdout.write(f"Counted {n} extras tag(s)")
+        if opts["list"]:
+            for usage in ExtrasTagUsage.objects.all():
+                promoted = f"  -> {usage.promoted_column}" if usage.promoted_column else ""
+                self.stdout.write(f"{usage.tag:24s} {usage.filter_count:8d} searches {usage.occurrences:10d} entries{promoted}")
+            return
+        tags = [t.upper() for t in opts["tags"]]
+        if opts["top"]:
+            top = ExtrasTagUsage.objects.filter(filter_count__gt=0).values_list("tag", flat=True)[: opts["top"]]
+            tags += [t for t in top if t not in tags]
+        if not tags and not opts["recount"]:
+            raise CommandError("Give tags to promote, --top N, --list or --recount")
+        for tag in tags:
+            try:
+                column = promote(tag)
+            except (ValueError, NotImplementedError) as exc:
+                raise CommandError(str(exc)) from exc
+            self.stdout.write(f"Promoted {tag} to {column}")
@@ -0,0 +1,41 @@
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("logbook", "0003_core_indexes"),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name="logimport",
+            name="claimed_at",
+            field=models.DateTimeField(blank=True, help_text="Claim heartbeat; stale claims are retaken", null=True),
+        ),
+        migrations.AddField(
+            model_name="logimport",
+            name="claimed_by",
+            field=models.CharField(blank=True, help_text="Worker currently processing this import", max_length=64),
+        ),
+        migrations.AddField(
+            model_name="logimport",
+            name="processed_bytes",
+            field=models.BigIntegerField(default=0),
+        ),
+        migrations.AddField(
+            model_name="logimport",
+            name="processed_records",
+            field=models.PositiveIntegerField(default=0),
+        ),
+        migrations.AddField(
+            model_name="logimport",
+            name="total_records",
+            field=models.PositiveIntegerField(default=0),
+        ),
+        migrations.AlterField(
+            model_name="logimport",
+            name="status",
+            field=models.CharField(choices=[("parsing", "Parsing"), ("pending", "Pending"), ("finalizing", "Finalizing"), ("done", "Done"), ("cancelled", "Cancelled"), ("failed", "Failed")], default="pending", max_length=16),
+        ),
+    ]
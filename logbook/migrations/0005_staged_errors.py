@@ -0,0 +1,16 @@
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("logbook", "0004_import_jobs"),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name="stagedentry",
+            name="errors",
+            field=models.JSONField(blank=True, null=True),
+        ),
+    ]
@@ -0,0 +1,56 @@
+import django.db.models.deletion
+from django.db import migrations, models
+
+from logbook.dedup import dupe_key
+
+
+def backfill_dupe_keys(apps, schema_editor):
+    LogEntry = apps.get_model("logbook", "LogEntry")
+    batch = []
+    for entry in LogEntry.objects.only("callsign", "band", "mode").iterator(chunk_size=2000):
+        entry.dupe_key = dupe_key(entry.callsign, entry.band, entry.mode)
+        batch.append(entry)
+        if len(batch) >= 2000:
+            LogEntry.objects.bulk_update(batch, ["dupe_key"])
+            batch = []
+    if batch:
+        LogEntry.objects.bulk_update(batch, ["dupe_key"])
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("logbook", "0005_staged_errors"),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name="logentry",
+            name="dupe_key",
+            field=models.CharField(blank=True, editable=False, max_length=16),
+        ),
+        migrations.AddField(
+            model_name="stagedentry",
+            name="dupe_key",
+            field=models.CharField(blank=True, max_length=16),
+        ),
+        migrations.AddField(
+            model_name="stagedentry",
+            name="dupe_status",
+            field=models.CharField(blank=True, choices=[("new", "New"), ("duplicate", "Duplicate"), ("conflict", "Conflict")], max_length=16),
+        ),
+        migrations.AddField(
+            model_name="stagedentry",
+            name="duplicate_of",
+            field=models.ForeignKey(blank=True, null=True, on_delete=django.db.models.deletion.SET_NULL, related_name="+", to="logbook.logentry"),
+        ),
+        migrations.RunPython(backfill_dupe_keys, migrations.RunPython.noop),
+        migrations.AddIndex(
+            model_name="logentry",
+            index=models.Index(fields=["dupe_key", "qso_date"], name="qso_dupe_key_idx"),
+        ),
+        migrations.AddIndex(
+            model_name="stagedentry",
+            index=models.Index(fields=["imp", "dupe_status"], name="staged_dupe_status_idx"),
+        ),
+    ]
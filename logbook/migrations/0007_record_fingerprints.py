@@ -0,0 +1,31 @@
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("logbook", "0006_dupe_keys"),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name="logentry",
+            name="fingerprint",
+            field=models.CharField(blank=True, db_index=True, editable=False, max_length=32),
+        ),
+        migrations.AddField(
+            model_name="logimport",
+            name="skipped_count",
+            field=models.PositiveIntegerField(default=0, help_text="Records already in the logbook, not staged"),
+        ),
+        migrations.AddField(
+            model_name="stagedentry",
+            name="fingerprint",
+            field=models.CharField(blank=True, db_index=True, max_length=32),
+        ),
+        migrations.AlterField(
+            model_name="logimport",
+            name="sha256",
+            field=models.CharField(blank=True, db_index=True, max_length=64),
+        ),
+    ]
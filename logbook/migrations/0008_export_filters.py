@@ -0,0 +1,28 @@
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("logbook", "0007_record_fingerprints"),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name="ExportCheckpoint",
+            fields=[
+                ("id", models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name="ID")),
+                ("name", models.SlugField(max_length=64, unique=True)),
+                ("exported_at", models.DateTimeField(help_text="Entries updated after this are exported next time")),
+                ("updated_at", models.DateTimeField(auto_now=True)),
+            ],
+        ),
+        migrations.AddIndex(
+            model_name="logentry",
+            index=models.Index(fields=["station_callsign", "qso_date"], name="qso_station_date_idx"),
+        ),
+        migrations.AddIndex(
+            model_name="logentry",
+            index=models.Index(fields=["updated_at"], name="qso_updated_idx"),
+        ),
+    ]
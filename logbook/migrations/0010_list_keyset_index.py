@@ -0,0 +1,15 @@
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("logbook", "0009_logbook_revision"),
+    ]
+
+    operations = [
+        migrations.AddIndex(
+            model_name="logentry",
+            index=models.Index(fields=["-qso_date", "-time_on", "callsign", "id"], name="qso_list_order_idx"),
+        ),
+    ]
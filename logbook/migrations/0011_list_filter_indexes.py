@@ -0,0 +1,57 @@
+from django.db import migrations, models
+
+# Lookups these serve: callsign__contains and gridsquare__istartswith (see logbook.filters)
+POSTGRES_INDEXES = (
+    "CREATE INDEX IF NOT EXISTS qso_call_trgm_idx ON logbook_logentry USING gin (callsign gin_trgm_ops)",
+    "CREATE INDEX IF NOT EXISTS qso_grid_upper_idx ON logbook_logentry (UPPER(gridsquare::text) text_pattern_ops)",
+)
+
+
+def create_postgres_indexes(apps, schema_editor):
+    if schema_editor.connection.vendor != "postgresql":
+        return
+    schema_editor.execute("CREATE EXTENSION IF NOT EXISTS pg_trgm")
+    for sql in POSTGRES_INDEXES:
+        schema_editor.execute(sql)
+
+
+def drop_postgres_indexes(apps, schema_editor):
+    if schema_editor.connection.vendor != "postgresql":
+        return
+    schema_editor.execute("DROP INDEX IF EXISTS qso_call_trgm_idx")
+    schema_editor.execute("DROP INDEX IF EXISTS qso_grid_upper_idx")
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("logbook", "0010_list_keyset_index"),
+    ]
+
+    operations = [
+        migrations.RemoveIndex(
+            model_name="logentry",
+            name="qso_band_idx",
+        ),
+        migrations.RemoveIndex(
+            model_name="logentry",
+            name="qso_mode_idx",
+        ),
+        migrations.RemoveIndex(
+            model_name="logentry",
+            name="qso_dxcc_idx",
+        ),
+        migrations.AddIndex(
+            model_name="logentry",
+            index=models.Index(fields=["band", "mode", "qso_date"], name="qso_band_mode_date_idx"),
+        ),
+        migrations.AddIndex(
+            model_name="logentry",
+            index=models.Index(fields=["mode", "qso_date"], name="qso_mode_date_idx"),
+        ),
+        migrations.AddIndex(
+            model_name="logentry",
+            index=models.Index(fields=["dxcc", "qso_date"], name="qso_dxcc_date_idx"),
+        ),
+        migrations.RunPython(create_postgres_indexes, drop_postgres_indexes),
+    ]
@@ -0,0 +1,48 @@
+from django.db import migrations
+
+# Frozen copy of logbook.filters.INDEXED_EXTRA_TAGS at the time of this migration
+INDEXED_EXTRA_TAGS = ("POTA_REF", "MY_POTA_REF", "WWFF_REF", "MY_WWFF_REF", "STATE", "CNTY", "CONT", "PFX")
+
+# (table, JSON column, index name prefix)
+EXTRAS_COLUMNS = (
+    ("logbook_logentryextras", "data", "extras"),
+    ("logbook_stagedentry", "extras", "staged_extras"),
+)
+
+
+def create_extras_indexes(apps, schema_editor):
+    vendor = schema_editor.connection.vendor
+    for table, column, prefix in EXTRAS_COLUMNS:
+        if vendor == "postgresql":
+            # Serves @> (TAG = value) and @? (TAG exists) for every tag
+            schema_editor.execute(
+                f"CREATE INDEX IF NOT EXISTS {prefix}_gin_idx ON {table} USING gin ({column} jsonb_path_ops)"
+            )
+        elif vendor == "sqlite":
+            # JSON1 has no inverted index; index the most searched tags one by one
+            for tag in INDEXED_EXTRA_TAGS:
+                schema_editor.execute(
+                    f"CREATE INDEX IF NOT EXISTS {prefix}_{tag.lower()}_idx "
+                    f"ON {table} (json_extract({column}, '$.\"{tag}\"'))"
+                )
+
+
+def drop_extras_indexes(apps, schema_editor):
+    vendor = schema_editor.connection.vendor
+    for _, _, prefix in EXTRAS_COLUMNS:
+        if vendor == "postgresql":
+            schema_editor.execute(f"DROP INDEX IF EXISTS {prefix}_gin_idx")
+        elif vendor == "sqlite":
+            for tag in INDEXED_EXTRA_TAGS:
+                schema_editor.execute(f"DROP INDEX IF EXISTS {prefix}_{tag.lower()}_idx")
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("logbook", "0011_list_filter_indexes"),
+    ]
+
+    operations = [
+        migrations.RunPython(create_extras_indexes, drop_extras_indexes),
+    ]
@@ -0,0 +1,25 @@
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("logbook", "0012_extras_indexes"),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name="ExtrasTagUsage",
+            fields=[
+                ("id", models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name="ID")),
+                ("tag", models.CharField(max_length=64, unique=True)),
+                ("occurrences", models.PositiveBigIntegerField(default=0, help_text="Log entries imported with this tag")),
+                ("filter_count", models.PositiveBigIntegerField(default=0, help_text="Logbook list searches on this tag")),
+                ("promoted_column", models.CharField(blank=True, help_text="Indexed generated column on LogEntryExtras mirroring this tag", max_length=64)),
+                ("updated_at", models.DateTimeField(auto_now=True)),
+            ],
+            options={
+                "ordering": ["-filter_count", "-occurrences", "tag"],
+            },
+        ),
+    ]
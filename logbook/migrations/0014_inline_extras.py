@@ -0,0 +1,70 @@
+from django.conf import settings
+from django.db import migrations, models
+from django.db.models import OuterRef, Subquery
+
+# Frozen copy of logbook.filters.INDEXED_EXTRA_TAGS at the time of this migration
+INDEXED_EXTRA_TAGS = ("POTA_REF", "MY_POTA_REF", "WWFF_REF", "MY_WWFF_REF", "STATE", "CNTY", "CONT", "PFX")
+
+BATCH_SIZE = 5000
+
+
+def create_inline_extras_indexes(apps, schema_editor):
+    vendor = schema_editor.connection.vendor
+    if vendor == "postgresql":
+        schema_editor.execute(
+            "CREATE INDEX IF NOT EXISTS qso_extras_gin_idx ON logbook_logentry USING gin (extras_data jsonb_path_ops)"
+        )
+    elif vendor == "sqlite":
+        for tag in INDEXED_EXTRA_TAGS:
+            schema_editor.execute(
+                f"CREATE INDEX IF NOT EXISTS qso_extras_{tag.lower()}_idx "
+                f"ON logbook_logentry (json_extract(extras_data, '$.\"{tag}\"'))"
+            )
+
+
+def drop_inline_extras_indexes(apps, schema_editor):
+    vendor = schema_editor.connection.vendor
+    if vendor == "postgresql":
+        schema_editor.execute("DROP INDEX IF EXISTS qso_extras_gin_idx")
+    elif vendor == "sqlite":
+        for tag in INDEXED_EXTRA_TAGS:
+            schema_editor.execute(f"DROP INDEX IF EXISTS qso_extras_{tag.lower()}_idx")
+
+
+def move_extras_inline(apps, schema_editor):
+    # Only when the inline store is configured; `manage.py move_extras` switches later
+    if not settings.LOGHUB_INLINE_EXTRAS:
+        return
+    LogEntry = apps.get_model("logbook", "LogEntry")
+    LogEntryExtras = apps.get_model("logbook", "LogEntryExtras")
+    while ids := list(LogEntryExtras.objects.order_by("entry_id").values_list("entry_id", flat=True)[:BATCH_SIZE]):
+        data = LogEntryExtras.objects.filter(entry_id=OuterRef("pk")).values("data")[:1]
+        LogEntry.objects.filter(pk__in=ids).update(extras_data=Subquery(data))
+        LogEntryExtras.objects.filter(entry_id__in=ids).delete()
+
+
+def move_extras_to_table(apps, schema_editor):
+    LogEntry = apps.get_model("logbook", "LogEntry")
+    LogEntryExtras = apps.get_model("logbook", "LogEntryExtras")
+    while rows := list(LogEntry.objects.exclude(extras_data={}).order_by("pk").values_list("pk", "extras_data")[:BATCH_SIZE]):
+        ids = [pk for pk, _ in rows]
+        LogEntryExtras.objects.filter(entry_id__in=ids).delete()
+        LogEntryExtras.objects.bulk_create([LogEntryExtras(entry_id=pk, data=data) for pk, data in rows])
+        LogEntry.objects.filter(pk__in=ids).update(extras_data={})
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("logbook", "0013_extras_tag_usage"),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name="logentry",
+            name="extras_data",
+            field=models.JSONField(blank=True, default=dict, editable=False),
+        ),
+        migrations.RunPython(create_inline_extras_indexes, drop_inline_extras_indexes),
+        migrations.RunPython(move_extras_inline, move_extras_to_table),
+    ]
@@ -0,0 +1,28 @@
+from django.db import migrations
+from django.db.models import F, Q
+from django.db.models.functions import Lower, Upper
+
+
+def normalize_case(apps, schema_editor):
+    # Bands lower-case, modes upper-case, as logbook.validation now stores them
+    changed = 0
+    for name in ("LogEntry", "StagedEntry"):
+        model = apps.get_model("logbook", name)
+        stale = ~Q(band=Lower("band")) | ~Q(band_rx=Lower("band_rx")) | ~Q(mode=Upper("mode"))
+        changed += model.objects.filter(stale).update(band=Lower("band"), band_rx=Lower("band_rx"), mode=Upper("mode"))
+    if changed:
+        # Cached exports hold the old spelling (see logbook.exports.logbook_version)
+        LogbookRevision = apps.get_model("logbook", "LogbookRevision")
+        if not LogbookRevision.objects.filter(pk=1).update(revision=F("revision") + 1):
+            LogbookRevision.objects.create(pk=1, revision=1)
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("logbook", "0014_inline_extras"),
+    ]
+
+    operations = [
+        migrations.RunPython(normalize_case, migrations.RunPython.noop),
+    ]
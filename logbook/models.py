@@ -1,10 +1,14 @@
-import re
 from decimal import Decimal
 from typing import Optional
 
-from django.core.exceptions import ValidationError
+from django.conf import settings
+from django.core.exceptions import ObjectDoesNotExist, ValidationError
 from django.db import models
 
+from .bands import band_for_freq
+from .dedup import STATUS_CHOICES as DUPE_STATUS_CHOICES, dupe_key
+from .validation import ERROR_MESSAGES, RULE_FIELDS, check_callsign, errors_to_validation_error, validate_rows
+
 
 class LogEntry(models.Model):
     """Single log entry (a QSO) with ADIF-aligned fields and constraints."""
@@ -89,6 +93,14 @@ class LogEntry(models.Model):
     # Link to upload/import batch this entry came from
     upload = models.ForeignKey('LogImport', related_name='entries', null=True, blank=True, on_delete=models.PROTECT)
 
+    # Hash of (callsign, band, mode group) used to find duplicates on import
+    dupe_key = models.CharField(max_length=16, blank=True, editable=False)
+    # Hash of the raw ADIF record this entry was imported from; re-imports skip it
+    fingerprint = models.CharField(max_length=32, blank=True, editable=False, db_index=True)
+    # Sparse ADIF fields not in core schema, when LOGHUB_INLINE_EXTRAS is on;
+    # otherwise they live in LogEntryExtras. Use get_extras()/set_extras().
+    extras_data = models.JSONField(default=dict, blank=True, editable=False)
+
     created_at = models.DateTimeField(auto_now_add=True)
     updated_at = models.DateTimeField(auto_now=True)
 
@@ -96,106 +108,85 @@ class LogEntry(models.Model):
         ordering = ["-qso_date", "-time_on", "callsign"]
         indexes = [
             models.Index(fields=["qso_date", "time_on"], name="qso_datetime_idx"),
-            models.Index(fields=["band"], name="qso_band_idx"),
-            models.Index(fields=["mode"], name="qso_mode_idx"),
+            # List filters (logbook.filters); each also serves its column alone.
+            # Callsign substring and grid prefix indexes are PostgreSQL-only, see 0011.
+            models.Index(fields=["band", "mode", "qso_date"], name="qso_band_mode_date_idx"),
+            models.Index(fields=["mode", "qso_date"], name="qso_mode_date_idx"),
             models.Index(fields=["gridsquare"], name="qso_grid_idx"),
-            models.Index(fields=["dxcc"], name="qso_dxcc_idx"),
+            models.Index(fields=["dxcc", "qso_date"], name="qso_dxcc_date_idx"),
+            models.Index(fields=["dupe_key", "qso_date"], name="qso_dupe_key_idx"),
+            # Export filters: station slices and changed-since
+            models.Index(fields=["station_callsign", "qso_date"], name="qso_station_date_idx"),
+            models.Index(fields=["updated_at"], name="qso_updated_idx"),
+            # Logbook list keyset pagination (LogEntryListView.ordering)
+            models.Index(fields=["-qso_date", "-time_on", "callsign", "id"], name="qso_list_order_idx"),
         ]
 
     def __str__(self) -> str:  # pragma: no cover - trivial
         return f"{self.callsign} @ {self.qso_date} {self.time_on} ({self.band} {self.mode})"
 
     # ---- Validation helpers ----
-    _CALLSIGN_RE = re.compile(r"^[A-Z0-9/]+$")
-
     @staticmethod
     def _validate_callsign(value: str, field_name: str) -> str:
         if not value:
             return value
-        v = value.strip().upper()
-        if len(v) < 3 or len(v) > 20:
-            raise ValidationError({field_name: "Callsign length must be 3..20"})
-        if not LogEntry._CALLSIGN_RE.match(v):
-            raise ValidationError({field_name: "Callsign must contain A-Z, 0-9 or '/' only"})
-        if v.startswith("/") or v.endswith("/"):
-            raise ValidationError({field_name: "Callsign must not begin or end with '/'"})
-        if not any(c.isalpha() for c in v) or not any(c.isdigit() for c in v):
-            raise ValidationError({field_name: "Callsign must contain at least one letter and one digit"})
-        if v.startswith("0"):
-            raise ValidationError({field_name: "Callsign must not begin with 0"})
-        if v.startswith("1") and not (v.startswith("1A") or v.startswith("1M") or v.startswith("1S")):
-            raise ValidationError({field_name: "Callsign starting with 1 must begin with 1A/1M/1S"})
+        v, code = check_callsign(value)
+        if code:
+            raise ValidationError({field_name: ERROR_MESSAGES[code]})
         return v
 
     @staticmethod
     def _derive_band_from_freq(freq_mhz: Optional[Decimal]) -> Optional[str]:
-        if not freq_mhz:
-            return None
-        f = float(freq_mhz)
-        ranges = [
-            ((1.8, 2.0), "160m"),
-            ((3.5, 4.0), "80m"),
-            ((5.2, 5.5), "60m"),
-            ((7.0, 7.3), "40m"),
-            ((10.1, 10.15), "30m"),
-            ((14.0, 14.35), "20m"),
-            ((18.068, 18.168), "17m"),
-            ((21.0, 21.45), "15m"),
-            ((24.89, 24.99), "12m"),
-            ((28.0, 29.7), "10m"),
-            ((50.0, 54.0), "6m"),
-            ((70.0, 71.0), "4m"),
-            ((144.0, 148.0), "2m"),
-            ((222.0, 225.0), "1.25m"),
-            ((420.0, 450.0), "70cm"),
-            ((902.0, 928.0), "33cm"),
-            ((1240.0, 1300.0), "23cm"),
-        ]
-        for (lo, hi), band in ranges:
-            if lo <= f <= hi:
-                return band
-        return None
+        return band_for_freq(freq_mhz)
 
     def clean(self):
-        # Normalize and validate callsigns
-        self.callsign = self._validate_callsign(self.callsign, "callsign")
-        if self.station_callsign:
-            self.station_callsign = self._validate_callsign(self.station_callsign, "station_callsign")
-        if self.operator:
-            self.operator = self._validate_callsign(self.operator, "operator")
-
-        # BAND/FREQ presence and derivation
-        if not self.band and not self.freq:
-            raise ValidationError({"band": "One of BAND or FREQ must be present", "freq": "One of BAND or FREQ must be present"})
-        if not self.band and self.freq:
-            derived = self._derive_band_from_freq(self.freq)
-            if derived:
-                self.band = derived
-            else:
-                raise ValidationError({"freq": "Unable to derive BAND from FREQ"})
-
-        # RX fields: derive band_rx if only freq_rx provided
-        if not self.band_rx and self.freq_rx:
-            drx = self._derive_band_from_freq(self.freq_rx)
-            if drx:
-                self.band_rx = drx
-
-        # Propagation/Satellite constraints
-        if self.prop_mode.upper() == "SAT":
-            if not self.sat_name:
-                raise ValidationError({"sat_name": "SAT_NAME required when PROP_MODE is SAT"})
-        else:
-            if self.sat_name:
-                raise ValidationError({"sat_name": "SAT_NAME must be omitted unless PROP_MODE is SAT"})
-
-        # If STATION_CALLSIGN absent but OPERATOR present
-        if not self.station_callsign and self.operator:
-            self.station_callsign = self.operator
+        # Same rules as the import batch validator, applied to this one row
+        row = {name: getattr(self, name) for name in RULE_FIELDS}
+        codes = validate_rows([row])[0]
+        for name in RULE_FIELDS:
+            setattr(self, name, row[name])
+        if codes:
+            raise errors_to_validation_error(codes)
 
     def save(self, *args, **kwargs):
         self.full_clean()
+        self.dupe_key = dupe_key(self.callsign, self.band, self.mode)
         return super().save(*args, **kwargs)
 
+    # ---- Extras (inline column or LogEntryExtras row) ----
+    def get_extras(self) -> dict:
+        """Non-core ADIF fields (TAG -> value) from the configured store.
+
+        Until `manage.py move_extras` has run after LOGHUB_INLINE_EXTRAS was
+        changed, an entry's extras may still be in the other store; they are
+        read from there when the configured one has none.
+        """
+        if settings.LOGHUB_INLINE_EXTRAS and self.extras_data:
+            return self.extras_data
+        try:
+            return self.extras.data
+        except ObjectDoesNotExist:
+            return self.extras_data
+
+    def set_extras(self, data: dict) -> None:
+        """Replace the extras of this (saved) entry in the configured store.
+
+        Any copy left in the other store is removed, so a later move_extras
+        cannot overwrite the new values with it.
+        """
+        if settings.LOGHUB_INLINE_EXTRAS:
+            LogEntryExtras.objects.filter(entry=self).delete()
+            self.extras_data = data
+            self.save(update_fields=["extras_data", "updated_at"])
+            return
+        if self.extras_data:
+            self.extras_data = {}
+            self.save(update_fields=["extras_data", "updated_at"])
+        if data:
+            LogEntryExtras.objects.update_or_create(entry=self, defaults={"data": data})
+        else:
+            LogEntryExtras.objects.filter(entry=self).delete()
+
 
 class LogEntryExtras(models.Model):
     entry = models.OneToOneField(LogEntry, related_name="extras", on_delete=models.CASCADE)
@@ -205,6 +196,50 @@ class LogEntryExtras(models.Model):
         return f"Extras for entry {self.entry_id}"
 
 
+class LogbookRevision(models.Model):
+    """Single-row edit counter, bumped whenever a log entry or its extras change."""
+
+    revision = models.PositiveBigIntegerField(default=0)
+
+    @classmethod
+    def bump(cls) -> None:
+        if not cls.objects.filter(pk=1).update(revision=models.F("revision") + 1):
+            cls.objects.get_or_create(pk=1, defaults={"revision": 1})
+
+    @classmethod
+    def current(cls) -> int:
+        return cls.objects.filter(pk=1).values_list("revision", flat=True).first() or 0
+
+
+class ExportCheckpoint(models.Model):
+    """Named high-water mark for incremental ADIF exports (see logbook.exports)."""
+
+    name = models.SlugField(max_length=64, unique=True)
+    exported_at = models.DateTimeField(help_text="Entries updated after this are exported next time")
+    updated_at = models.DateTimeField(auto_now=True)
+
+    def __str__(self) -> str:  # pragma: no cover - trivial
+        return f"Export checkpoint {self.name} @ {self.exported_at}"
+
+
+class ExtrasTagUsage(models.Model):
+    """How often an extras tag is stored and filtered on (see logbook.extras_usage)."""
+
+    tag = models.CharField(max_length=64, unique=True)
+    occurrences = models.PositiveBigIntegerField(default=0, help_text="Log entries imported with this tag")
+    filter_count = models.PositiveBigIntegerField(default=0, help_text="Logbook list searches on this tag")
+    promoted_column = models.CharField(
+        max_length=64, blank=True, help_text="Indexed generated column on LogEntryExtras mirroring this tag"
+    )
+    updated_at = models.DateTimeField(auto_now=True)
+
+    class Meta:
+        ordering = ["-filter_count", "-occurrences", "tag"]
+
+    def __str__(self) -> str:  # pragma: no cover - trivial
+        return self.tag
+
+
 class LogImport(models.Model):
     KIND_FILE = "file"
     KIND_SERVICE = "service"
@@ -228,25 +263,41 @@ class LogImport(models.Model):
     original_filename = models.CharField(max_length=255, blank=True)
     content_type = models.CharField(max_length=100, blank=True)
     size_bytes = models.BigIntegerField(null=True, blank=True)
-    sha256 = models.CharField(max_length=64, blank=True)
+    sha256 = models.CharField(max_length=64, blank=True, db_index=True)
     station_callsign = models.CharField(max_length=20, blank=True)
     notes = models.TextField(blank=True)
     meta = models.JSONField(default=dict, blank=True)
 
     # Import file storage and status
+    # parsing/finalizing imports are queued for (or claimed by) an import worker
+    STATUS_PARSING = "parsing"
     STATUS_PENDING = "pending"
+    STATUS_FINALIZING = "finalizing"
     STATUS_DONE = "done"
     STATUS_CANCELLED = "cancelled"
+    STATUS_FAILED = "failed"
     STATUS_CHOICES = (
+        (STATUS_PARSING, "Parsing"),
         (STATUS_PENDING, "Pending"),
+        (STATUS_FINALIZING, "Finalizing"),
         (STATUS_DONE, "Done"),
         (STATUS_CANCELLED, "Cancelled"),
+        (STATUS_FAILED, "Failed"),
     )
+    QUEUED_STATUSES = (STATUS_PARSING, STATUS_FINALIZING)
 
     status = models.CharField(max_length=16, choices=STATUS_CHOICES, default=STATUS_PENDING)
     content_gz = models.BinaryField(null=True, blank=True, help_text="Gzipped original ADIF content")
     entry_count = models.PositiveIntegerField(default=0)
     error_count = models.PositiveIntegerField(default=0)
+    skipped_count = models.PositiveIntegerField(default=0, help_text="Records already in the logbook, not staged")
+
+    # Background job claim and progress (total bytes is size_bytes)
+    claimed_by = models.CharField(max_length=64, blank=True, help_text="Worker currently processing this import")
+    claimed_at = models.DateTimeField(null=True, blank=True, help_text="Claim heartbeat; stale claims are retaken")
+    processed_bytes = models.BigIntegerField(default=0)
+    processed_records = models.PositiveIntegerField(default=0)
+    total_records = models.PositiveIntegerField(default=0)
 
     created_at = models.DateTimeField(auto_now_add=True)
     imported_at = models.DateTimeField(null=True, blank=True)
@@ -255,6 +306,24 @@ class LogImport(models.Model):
         label = self.original_filename or self.provider or self.get_format_display()
         return f"{self.get_kind_display()} - {label}"
 
+    @property
+    def is_queued(self) -> bool:
+        return self.status in self.QUEUED_STATUSES
+
+    def save_meta(self, **keys) -> None:
+        """Set `keys` in `meta` and write just that column, with one UPDATE."""
+        meta = {**(self.meta or {}), **keys}
+        LogImport.objects.filter(pk=self.pk).update(meta=meta)
+        self.meta = meta
+
+    @property
+    def progress_percent(self) -> int:
+        if self.status == self.STATUS_PARSING and self.size_bytes:
+            return min(100, int(self.processed_bytes * 100 / self.size_bytes))
+        if self.status == self.STATUS_FINALIZING and self.total_records:
+            return min(100, int(self.processed_records * 100 / self.total_records))
+        return 0
+
 
 class StagedEntry(models.Model):
     """Temporary, per-import holding pen for parsed entries before confirmation."""
@@ -332,8 +401,20 @@ class StagedEntry(models.Model):
 
     # Extras as JSON to capture any unmodeled ADIF fields
     extras = models.JSONField(default=dict, blank=True)
+    # Validation error codes ("field:code") set at staging; null = not yet validated
+    errors = models.JSONField(null=True, blank=True)
+
+    # Duplicate detection against the logbook (see logbook.dedup)
+    dupe_key = models.CharField(max_length=16, blank=True)
+    dupe_status = models.CharField(max_length=16, choices=DUPE_STATUS_CHOICES, blank=True)
+    duplicate_of = models.ForeignKey(LogEntry, related_name="+", null=True, blank=True, on_delete=models.SET_NULL)
+    # Hash of the raw ADIF record (see logbook.dedup.record_fingerprint)
+    fingerprint = models.CharField(max_length=32, blank=True, db_index=True)
 
     created_at = models.DateTimeField(auto_now_add=True)
 
     class Meta:
         ordering = ["-qso_date", "-time_on", "callsign"]
+        indexes = [
+            models.Index(fields=["imp", "dupe_status"], name="staged_dupe_status_idx"),
+        ]
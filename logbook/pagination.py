@@ -0,0 +1,131 @@
+"""
+Keyset (seek) pagination.
+
+Pages are addressed by an opaque cursor holding the ordering values of a
+boundary row instead of an OFFSET, and no COUNT(*) is run: each page is one
+index range scan of `per_page + 1` rows, however deep it is. The ordering
+must end in a unique column (the primary key) and its columns must be
+non-null; a composite index in the same column order and directions keeps
+the scan cheap.
+"""
+
+from __future__ import annotations
+
+import base64
+import datetime as dt
+import json
+from dataclasses import dataclass
+from decimal import Decimal
+from typing import Optional, Sequence
+
+from django.core.exceptions import ValidationError
+from django.db.models import Q, QuerySet
+
+
+@dataclass
+class KeysetPage:
+    object_list: list
+    next_cursor: Optional[str] = None
+    prev_cursor: Optional[str] = None
+
+    def has_next(self) -> bool:
+        return self.next_cursor is not None
+
+    def has_previous(self) -> bool:
+        return self.prev_cursor is not None
+
+    def has_other_pages(self) -> bool:
+        return self.has_next() or self.has_previous()
+
+    def __iter__(self):
+        return iter(self.object_list)
+
+    def __len__(self) -> int:
+        return len(self.object_list)
+
+
+def _to_json(value):
+    if isinstance(value, (dt.date, dt.time)):
+        return value.isoformat()
+    if isinstance(value, Decimal):
+        return str(value)
+    return value
+
+
+def encode_cursor(values: Sequence) -> str:
+    raw = json.dumps([_to_json(v) for v in values], separators=(",", ":"))
+    return base64.urlsafe_b64encode(raw.encode("utf-8")).decode("ascii").rstrip("=")
+
+
+def decode_cursor(cursor: str, qs: QuerySet, ordering: Sequence[str]) -> Optional[list]:
+    """Decode a cursor into python values for `ordering`; None if it is malformed."""
+    try:
+        raw = base64.urlsafe_b64decode(cursor + "=" * (-len(cursor) % 4))
+        values = json.loads(raw)
+        if not isinstance(values, list) or len(values) != len(ordering):
+            return None
+        opts = qs.model._meta
+        return [opts.get_field(name.lstrip("-")).to_python(v) for name, v in zip(ordering, values)]
+    except (ValueError, TypeError, ValidationError):
+        return None
+
+
+def _seek(ordering: Sequence[str], values: Sequence) -> Q:
+    """Rows strictly after `values` in `ordering`, as nested OR/AND lookups.
+
+    The OR chain alone is only a filter; the redundant bound on the leading
+    column is what lets the database start the index scan at the cursor.
+    """
+    q = None
+    for name, value in reversed(list(zip(ordering, values))):
+        col = name.lstrip("-")
+        past = Q(**{f"{col}__{'lt' if name.startswith('-') else 'gt'}": value})
+        q = past if q is None else past | (Q(**{col: value}) & q)
+    first, value = ordering[0], values[0]
+    return Q(**{f"{first.lstrip('-')}__{'lte' if first.startswith('-') else 'gte'}": value}) & q
+
+
+def _reverse(ordering: Sequence[str]) -> list[str]:
+    return [name[1:] if name.startswith("-") else f"-{name}" for name in ordering]
+
+
+def _key(obj, ordering: Sequence[str]) -> list:
+    return [getattr(obj, name.lstrip("-")) for name in ordering]
+
+
+def keyset_page(
+    qs: QuerySet,
+    ordering: Sequence[str],
+    per_page: int,
+    after: Optional[str] = None,
+    before: Optional[str] = None,
+) -> KeysetPage:
+    """Return the page after cursor `after`, before cursor `before`, or the first page.
+
+    Malformed cursors are ignored (the first page is returned). A page past
+    either end is empty and has no cursors.
+    """
+    if after and (values := decode_cursor(after, qs, ordering)) is not None:
+        rows = list(qs.filter(_seek(ordering, values)).order_by(*ordering)[: per_page + 1])
+        more, rows = len(rows) > per_page, rows[:per_page]
+        page = KeysetPage(rows)
+        if rows:
+            page.prev_cursor = encode_cursor(_key(rows[0], ordering))
+            if more:
+                page.next_cursor = encode_cursor(_key(rows[-1], ordering))
+        return page
+    if before and (values := decode_cursor(before, qs, ordering)) is not None:
+        backwards = _reverse(ordering)
+        rows = list(qs.filter(_seek(backwards, values)).order_by(*backwards)[: per_page + 1])
+        more, rows = len(rows) > per_page, rows[:per_page][::-1]
+        page = KeysetPage(rows)
+        if rows:
+            page.next_cursor = encode_cursor(_key(rows[-1], ordering))
+            if more:
+                page.prev_cursor = encode_cursor(_key(rows[0], ordering))
+        return page
+    rows = list(qs.order_by(*ordering)[: per_page + 1])
+    page = KeysetPage(rows[:per_page])
+    if len(rows) > per_page:
+        page.next_cursor = encode_cursor(_key(rows[per_page - 1], ordering))
+    return page
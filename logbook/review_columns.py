@@ -0,0 +1,119 @@
+"""
+Which columns an import review shows, worked out once at staging time.
+
+The review table only shows core columns that some staged row fills and the
+extras tags some row carries. Rather than scanning the whole import on every
+review page, staging folds each batch into a summary kept in
+`LogImport.meta["review"]`:
+
+    {"core": [field, ...], "extras": [TAG, ...], "invalid": n,
+     "dupes": {dupe_status: n, ...}, "rev": token}
+
+Single staged rows saved later add their columns (see logbook.signals) and
+drop the row counts ("invalid", "dupes"), which the next review page
+recounts once; they clear the import's stats as well, so its error
+breakdown is rebuilt to match. "rev" changes whenever the summary is
+rebuilt or a staged row is saved; cached review table fragments are keyed
+on it. Imports staged before the summary existed get one on first review.
+"""
+
+from __future__ import annotations
+
+import uuid
+from collections import Counter
+from typing import Iterable, Optional
+
+from django.db.models import Count
+
+from . import import_stats
+from .models import LogImport, StagedEntry
+
+META_KEY = "review"
+
+# Staged columns that are bookkeeping rather than ADIF data
+_NOT_SHOWN = {"id", "imp", "created_at", "extras", "errors", "dupe_key", "dupe_status", "fingerprint"}
+
+# StagedEntry data columns, in model declaration order
+CORE_FIELDS: tuple[str, ...] = tuple(
+    f.name
+    for f in StagedEntry._meta.get_fields()
+    if getattr(f, "concrete", False)
+    and not getattr(f, "many_to_many", False)
+    and not getattr(f, "is_relation", False)
+    and f.name not in _NOT_SHOWN
+)
+
+
+def _filled(value) -> bool:
+    if value is None:
+        return False
+    return not (isinstance(value, str) and value.strip() == "")
+
+
+def _rev() -> str:
+    return uuid.uuid4().hex[:12]
+
+
+def new_summary() -> dict:
+    return {"core": [], "extras": [], "invalid": 0, "dupes": {}, "rev": _rev()}
+
+
+def add_rows(summary: dict, rows: Iterable[tuple[dict, Optional[dict]]], count_rows: bool = True) -> None:
+    """Fold (data, extras) rows, as validated and classified, into `summary` in place."""
+    core = set(summary["core"])
+    extras = set(summary["extras"])
+    invalid = 0
+    dupes: Counter = Counter()
+    for data, row_extras in rows:
+        core.update(name for name in CORE_FIELDS if name not in core and _filled(data.get(name)))
+        if isinstance(row_extras, dict):
+            extras.update(str(k).upper() for k, v in row_extras.items() if v is not None and str(v).strip())
+        if data.get("errors"):
+            invalid += 1
+        dupes[data.get("dupe_status") or ""] += 1
+    summary["core"] = [name for name in CORE_FIELDS if name in core]
+    summary["extras"] = sorted(extras)
+    if count_rows and "invalid" in summary and "dupes" in summary:
+        summary["invalid"] += invalid
+        summary["dupes"] = dict(dupes + Counter(summary["dupes"]))
+
+
+def _count_rows(imp: LogImport) -> dict:
+    qs = imp.staged_entries.order_by()
+    return {
+        "invalid": qs.filter(errors__0__isnull=False).count(),
+        "dupes": dict(qs.values_list("dupe_status").annotate(n=Count("pk"))),
+    }
+
+
+def review_summary(imp: LogImport) -> dict:
+    """The import's column summary, computed and saved first if missing or stale."""
+    summary = (imp.meta or {}).get(META_KEY)
+    if summary is None:
+        summary = new_summary()
+        rows = imp.staged_entries.values(*CORE_FIELDS, "extras", "errors", "dupe_status").iterator()
+        add_rows(summary, ((row, row["extras"]) for row in rows))
+        imp.save_meta(**{META_KEY: summary})
+    elif "invalid" not in summary or "dupes" not in summary:
+        summary = {**summary, **_count_rows(imp)}
+        imp.save_meta(**{META_KEY: summary})
+    return summary
+
+
+def staged_row_changed(entry: StagedEntry) -> None:
+    """Add a saved staged row's columns to its import's summary.
+
+    Columns are only ever added: a row losing a value may leave a column that
+    is now empty everywhere, which the review tolerates. The row counts and
+    the import's stats are dropped so the next review page rebuilds them.
+    """
+    imp = LogImport.objects.filter(pk=entry.imp_id).only("meta").first()
+    summary = (imp.meta or {}).get(META_KEY) if imp else None
+    if summary is None:
+        return
+    summary.pop("invalid", None)
+    summary.pop("dupes", None)
+    summary["rev"] = _rev()
+    data = {name: getattr(entry, name) for name in CORE_FIELDS}
+    add_rows(summary, [(data, entry.extras)], count_rows=False)
+    imp.save_meta(**{META_KEY: summary, import_stats.META_KEY: None})
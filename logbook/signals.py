@@ -0,0 +1,21 @@
+from django.db.models.signals import post_delete, post_save
+from django.dispatch import receiver
+
+from .models import LogbookRevision, LogEntry, LogEntryExtras, StagedEntry
+from .review_columns import staged_row_changed
+
+
+@receiver(post_save, sender=LogEntry)
+@receiver(post_delete, sender=LogEntry)
+@receiver(post_save, sender=LogEntryExtras)
+@receiver(post_delete, sender=LogEntryExtras)
+def bump_logbook_revision(sender, **kwargs):
+    # Invalidates cached export artifacts (see logbook.exports.logbook_version)
+    LogbookRevision.bump()
+
+
+@receiver(post_save, sender=StagedEntry)
+def update_review_columns(sender, instance, raw=False, **kwargs):
+    # Staging itself uses bulk writes and keeps the summary up to date
+    if not raw:
+        staged_row_changed(instance)
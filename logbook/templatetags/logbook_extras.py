@@ -2,6 +2,8 @@ from django import template
 from datetime import date as _date, time as _time, datetime as _datetime, timezone as _dt_timezone
 from django.utils import timezone
 
+from ..validation import message_for
+
 register = template.Library()
 
 
@@ -30,6 +32,9 @@ def value_for(obj, field):
         # Prefer station_callsign; fall back to operator
         op = getattr(obj, "station_callsign", None) or getattr(obj, "operator", None)
         return op or ""
+    if field == "errors":
+        codes = getattr(obj, "errors", None) or []
+        return "; ".join(f"{code.partition(':')[0]}: {message_for(code)}" for code in codes)
     if hasattr(obj, field):
         return getattr(obj, field)
     extras = getattr(obj, "extras", None) or {}
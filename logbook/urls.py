@@ -16,6 +16,7 @@ urlpatterns = [
     path("imports/new/", views.ImportCreateView.as_view(), name="import_new"),
     path("imports/", views.ImportListView.as_view(), name="import_list"),
     path("imports/<int:pk>/review/", views.ImportReviewView.as_view(), name="import_review"),
+    path("imports/<int:pk>/progress/", views.import_progress, name="import_progress"),
     path("imports/<int:pk>/confirm/", views.import_confirm, name="import_confirm"),
     path("imports/<int:pk>/cancel/", views.import_cancel, name="import_cancel"),
 ]
@@ -0,0 +1,163 @@
+"""
+Column-oriented QSO validation shared by manual entry and imports.
+
+Rows are plain dicts of LogEntry field values. `validate_rows` normalizes
+them in place (upper-cased callsigns, derived BAND/BAND_RX, STATION_CALLSIGN
+from OPERATOR) and returns, per row, a list of error codes "<field>:<code>".
+Each rule runs over a whole column at a time, and callsign checks are memoized
+per distinct value since the same calls repeat throughout a log.
+
+`LogEntry.clean()` runs the same rules on a single row; imports run them per
+staging batch and store the codes on `StagedEntry.errors`.
+"""
+
+from __future__ import annotations
+
+import re
+from typing import Iterable, Optional
+
+from django.core.exceptions import ValidationError
+
+from .bands import bands_for_freqs
+
+CALLSIGN_FIELDS = ("callsign", "station_callsign", "operator")
+# Fields the rules read or normalize
+RULE_FIELDS = CALLSIGN_FIELDS + ("band", "freq", "band_rx", "freq_rx", "mode", "prop_mode", "sat_name")
+# Stored in one case so the indexed exact-match filters find them (ADIF is case-insensitive)
+LOWER_FIELDS = ("band", "band_rx")
+UPPER_FIELDS = ("mode",)
+
+ERROR_MESSAGES: dict[str, str] = {
+    "length": "Callsign length must be 3..20",
+    "chars": "Callsign must contain A-Z, 0-9 or '/' only",
+    "slash": "Callsign must not begin or end with '/'",
+    "letter_digit": "Callsign must contain at least one letter and one digit",
+    "leading_zero": "Callsign must not begin with 0",
+    "leading_one": "Callsign starting with 1 must begin with 1A/1M/1S",
+    "band_or_freq": "One of BAND or FREQ must be present",
+    "underivable": "Unable to derive BAND from FREQ",
+    "sat_required": "SAT_NAME required when PROP_MODE is SAT",
+    "sat_forbidden": "SAT_NAME must be omitted unless PROP_MODE is SAT",
+    "required": "This field is required",
+    "too_long": "Value is too long",
+    "invalid": "Invalid value",
+    "missing_required": "CALL, QSO_DATE or TIME_ON missing or unreadable; record not staged",
+}
+
+_CALLSIGN_RE = re.compile(r"^[A-Z0-9/]+$")
+
+
+def check_callsign(value: str) -> tuple[str, Optional[str]]:
+    """Return (normalized callsign, error code or None)."""
+    v = value.strip().upper()
+    if len(v) < 3 or len(v) > 20:
+        return v, "length"
+    if not _CALLSIGN_RE.match(v):
+        return v, "chars"
+    if v.startswith("/") or v.endswith("/"):
+        return v, "slash"
+    if not any(c.isalpha() for c in v) or not any(c.isdigit() for c in v):
+        return v, "letter_digit"
+    if v.startswith("0"):
+        return v, "leading_zero"
+    if v.startswith("1") and not (v.startswith("1A") or v.startswith("1M") or v.startswith("1S")):
+        return v, "leading_one"
+    return v, None
+
+
+def message_for(code: str) -> str:
+    return ERROR_MESSAGES.get(code.partition(":")[2], code)
+
+
+def errors_to_validation_error(codes: Iterable[str]) -> ValidationError:
+    by_field: dict[str, list[str]] = {}
+    for code in codes:
+        field = code.partition(":")[0]
+        by_field.setdefault(field, []).append(message_for(code))
+    return ValidationError(by_field)
+
+
+def _check_columns(rows: list[dict], errors: list[list[str]], fields) -> None:
+    """Model-level checks (blank, max_length, numeric validators) per column."""
+    for field in fields:
+        name = field.name
+        required = not field.blank
+        max_length = getattr(field, "max_length", None) if field.get_internal_type() in ("CharField", "TextField") else None
+        validators = field.validators if max_length is None else []
+        for i, row in enumerate(rows):
+            v = row.get(name)
+            if v is None or v == "":
+                if required:
+                    errors[i].append(f"{name}:required")
+                continue
+            if max_length is not None:
+                if len(v) > max_length:
+                    errors[i].append(f"{name}:too_long")
+                continue
+            for validator in validators:
+                try:
+                    validator(v)
+                except ValidationError:
+                    errors[i].append(f"{name}:invalid")
+                    break
+
+
+def validate_rows(rows: list[dict], fields=None) -> list[list[str]]:
+    """Normalize `rows` in place and return per-row lists of error codes.
+
+    `fields`, if given, are model fields whose blank/length/numeric
+    constraints are checked as well (imports pass LogEntry's fields; model
+    clean() leaves that to clean_fields()).
+    """
+    errors: list[list[str]] = [[] for _ in rows]
+
+    # Callsigns, memoized per distinct raw value
+    for name in CALLSIGN_FIELDS:
+        seen: dict[str, tuple[str, Optional[str]]] = {}
+        for i, row in enumerate(rows):
+            v = row.get(name)
+            if not v:
+                continue
+            res = seen.get(v)
+            if res is None:
+                res = seen[v] = check_callsign(v)
+            row[name] = res[0]
+            if res[1]:
+                errors[i].append(f"{name}:{res[1]}")
+
+    for row in rows:
+        for name in LOWER_FIELDS:
+            if row.get(name):
+                row[name] = row[name].strip().lower()
+        for name in UPPER_FIELDS:
+            if row.get(name):
+                row[name] = row[name].strip().upper()
+
+    # BAND/FREQ presence and derivation, one vectorized lookup per column
+    need = [i for i, row in enumerate(rows) if not row.get("band") and row.get("freq")]
+    for i, band in zip(need, bands_for_freqs(rows[i]["freq"] for i in need)):
+        if band:
+            rows[i]["band"] = band
+        else:
+            errors[i].append("freq:underivable")
+    need_rx = [i for i, row in enumerate(rows) if not row.get("band_rx") and row.get("freq_rx")]
+    for i, band in zip(need_rx, bands_for_freqs(rows[i]["freq_rx"] for i in need_rx)):
+        if band:
+            rows[i]["band_rx"] = band
+
+    for i, row in enumerate(rows):
+        if not row.get("band") and not row.get("freq"):
+            errors[i] += ["band:band_or_freq", "freq:band_or_freq"]
+        # Propagation/Satellite constraints
+        if (row.get("prop_mode") or "").upper() == "SAT":
+            if not row.get("sat_name"):
+                errors[i].append("sat_name:sat_required")
+        elif row.get("sat_name"):
+            errors[i].append("sat_name:sat_forbidden")
+        # If STATION_CALLSIGN absent but OPERATOR present
+        if not row.get("station_callsign") and row.get("operator"):
+            row["station_callsign"] = row["operator"]
+
+    if fields:
+        _check_columns(rows, errors, fields)
+    return errors
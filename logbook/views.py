@@ -1,23 +1,91 @@
+import functools
+import os
+from urllib.parse import urlsplit
+
+from django.conf import settings
 from django.db import transaction
-from django.http import HttpResponse, HttpResponseBadRequest, HttpResponseRedirect
+from django.core.paginator import InvalidPage
+from django.http import Http404, HttpResponse, HttpResponseBadRequest, HttpResponseRedirect, QueryDict, StreamingHttpResponse
+from django.shortcuts import render
 from django.urls import reverse, reverse_lazy
+from django.utils import timezone
+from django.utils.functional import SimpleLazyObject
 from django.views.generic import CreateView, DeleteView, DetailView, ListView, UpdateView
 from django.views.generic.edit import FormView
 
-from .forms import LogEntryForm
-from .models import LogEntry, LogEntryExtras
-from .adif import queryset_to_adif
+from .forms import LogEntryFilterForm, LogEntryForm
+from .models import LogEntry
+from .adif import iter_adif_values
 from .forms_import import ADIFUploadForm
-from .imports import gzip_bytes, parse_adif_to_staged, finalize_import, compute_sha256
+from .forms_export import ADIFExportForm
+from .pagination import keyset_page
+from .counts import EstimatedCountPaginator
+from .exports import checkpoint_since, iter_building_artifact, iter_with_checkpoint, logbook_version, open_artifact
+from .filters import filter_entries
+from .imports import UploadStream, finalize_import, find_same_file_import, sha256_chunks, stage_records
 from .adif_fields import CORE_TAGS
+from .extras_usage import record_filter
+from .dedup import STATUS_CHOICES as DUPE_STATUS_CHOICES, STATUS_CONFLICT as DUPE_CONFLICT, STATUS_DUPLICATE as DUPE_DUPLICATE
 from .adif_catalog import tag_suggestions, ADIF_CATALOG
 from .models import LogImport, StagedEntry
+from .import_stats import import_stats, stats_display
+from .review_columns import CORE_FIELDS, review_summary
+from .review_rows import display_rows
+
+
+def _shown_extra_tag(request) -> str:
+    """The extra_tag filter of the page an HTMX request was sent from, if any."""
+    url = request.headers.get("HX-Current-URL") if request.headers.get("HX-Request") else None
+    if not url:
+        return ""
+    return QueryDict(urlsplit(url).query).get("extra_tag", "").strip().upper()
 
 
 class LogEntryListView(ListView):
     model = LogEntry
     paginate_by = 25
-    ordering = ["-qso_date", "-time_on", "callsign"]
+    # Matches qso_list_order_idx; id makes every cursor position unique
+    ordering = ["-qso_date", "-time_on", "callsign", "id"]
+
+    def get_queryset(self):
+        qs = super().get_queryset()
+        self.filter_form = LogEntryFilterForm(self.request.GET)
+        # Invalid fields are reported and left out; the valid ones still apply
+        self.filter_form.is_valid()
+        filters = self.filter_form.filters()
+        # Count a tag once per search: the HTMX form refreshes on every pause
+        # while typing, so a request whose page already shows that tag (typing
+        # the value, paging) is not a new search. Half-typed tags the logbook
+        # lacks are ignored by record_filter.
+        tag = filters.get("extra_tag")
+        if tag and tag != _shown_extra_tag(self.request) and not ({"after", "before"} & self.request.GET.keys()):
+            record_filter(tag)
+        return filter_entries(qs, **filters)
+
+    def get_context_data(self, **kwargs):
+        ctx = super().get_context_data(**kwargs)
+        params = self.request.GET.copy()
+        for key in ("after", "before"):
+            params.pop(key, None)
+        ctx["filter_form"] = self.filter_form
+        ctx["filter_query"] = params.urlencode()
+        return ctx
+
+    def paginate_queryset(self, queryset, page_size):
+        # Keyset pages: constant cost at any depth, no COUNT(*)
+        page = keyset_page(
+            queryset,
+            self.ordering,
+            page_size,
+            after=self.request.GET.get("after"),
+            before=self.request.GET.get("before"),
+        )
+        return None, page, page.object_list, page.has_other_pages()
+
+    def get_template_names(self):
+        if self.request.headers.get("HX-Request"):
+            return ["logbook/logentry_page.html"]
+        return super().get_template_names()
 
 
 class LogEntryDetailView(DetailView):
@@ -46,7 +114,7 @@ class LogEntryCreateView(CreateView):
                 continue
             extras[tag] = str(v)
         if extras:
-            LogEntryExtras.objects.update_or_create(entry=self.object, defaults={"data": extras})
+            self.object.set_extras(extras)
         return response
 
     def get_context_data(self, **kwargs):
@@ -112,10 +180,7 @@ class LogEntryUpdateView(UpdateView):
             if tag in CORE_TAGS:
                 continue
             extras[tag] = str(v)
-        if extras:
-            LogEntryExtras.objects.update_or_create(entry=self.object, defaults={"data": extras})
-        else:
-            LogEntryExtras.objects.filter(entry=self.object).delete()
+        self.object.set_extras(extras)
         return response
 
     def get_context_data(self, **kwargs):
@@ -161,8 +226,8 @@ class LogEntryUpdateView(UpdateView):
         # Include any existing extras not in catalog for retro-compat
         extras_values: dict[str, str] = {}
         inst = self.object
-        if inst and getattr(inst, "extras", None) and inst.extras.data:
-            for k, v in inst.extras.data.items():
+        if inst:
+            for k, v in inst.get_extras().items():
                 tag = str(k).upper()
                 extras_values[tag] = str(v)
                 if tag not in seen:
@@ -184,27 +249,155 @@ class LogEntryDeleteView(DeleteView):
     success_url = reverse_lazy("logbook:list")
 
 
-def logbook_export_adif(_request):
-    data = queryset_to_adif(LogEntry.objects.all().order_by("qso_date", "time_on", "callsign"))
-    resp = HttpResponse(data, content_type="text/plain; charset=utf-8")
+def logbook_export_adif(request):
+    form = ADIFExportForm(request.GET)
+    if not form.is_valid():
+        return HttpResponseBadRequest(form.errors.as_text(), content_type="text/plain; charset=utf-8")
+    params = form.cleaned_data
+    version = None
+    if not any(params.values()) and "gzip" in request.headers.get("Accept-Encoding", ""):
+        version = logbook_version()
+        resp = _serve_export_artifact(request, version)
+        if resp is not None:
+            return resp
+    started = timezone.now()
+    since = params["since"]
+    if params["checkpoint"]:
+        last = checkpoint_since(params["checkpoint"])
+        if last and (since is None or last > since):
+            since = last
+    qs = filter_entries(
+        LogEntry.objects.all(),
+        date_from=params["date_from"],
+        date_to=params["date_to"],
+        station=params["station"],
+        band=params["band"],
+        since=since,
+    ).order_by("qso_date", "time_on", "callsign")
+    # Streamed chunk by chunk so memory stays flat however large the logbook is
+    chunks = iter_adif_values(qs, chunk_size=settings.LOGHUB_EXPORT_CHUNK_SIZE)
+    if params["checkpoint"]:
+        chunks = iter_with_checkpoint(chunks, params["checkpoint"], started)
+    if version:
+        # No artifact for this version yet: stream, and build it on the way
+        chunks = iter_building_artifact(chunks, version)
+    resp = StreamingHttpResponse(chunks, content_type="text/plain; charset=utf-8")
+    resp["Content-Disposition"] = "attachment; filename=loghub_export.adi"
+    return resp
+
+
+def _serve_export_artifact(request, version: str):
+    """Serve the cached gzipped full export with ETag and single-range support.
+
+    Return None if the artifact for `version` is not built yet.
+    """
+    etag = f'"{version}"'
+    if etag in [t.strip() for t in request.headers.get("If-None-Match", "").split(",")]:
+        resp = HttpResponse(status=304)
+        resp["ETag"] = etag
+        return resp
+    # Open before responding: a rebuild for a newer version unlinks this file
+    f = open_artifact(version)
+    if f is None:
+        return None
+    size = os.fstat(f.fileno()).st_size
+    start, end, status = 0, size - 1, 200
+    range_header = request.headers.get("Range", "")
+    if range_header and request.headers.get("If-Range", etag) == etag:
+        byte_range = _parse_byte_range(range_header, size)
+        if byte_range is False:
+            f.close()
+            resp = HttpResponse(status=416)
+            resp["Content-Range"] = f"bytes */{size}"
+            return resp
+        if byte_range:
+            (start, end), status = byte_range, 206
+    resp = StreamingHttpResponse(_FileRange(f, start, end + 1 - start), status=status, content_type="text/plain; charset=utf-8")
+    if status == 206:
+        resp["Content-Range"] = f"bytes {start}-{end}/{size}"
+    resp["Content-Length"] = str(end + 1 - start)
+    resp["Content-Encoding"] = "gzip"
+    resp["Accept-Ranges"] = "bytes"
+    resp["ETag"] = etag
+    resp["Vary"] = "Accept-Encoding"
     resp["Content-Disposition"] = "attachment; filename=loghub_export.adi"
     return resp
 
 
+def _parse_byte_range(header: str, size: int):
+    """Parse a single "bytes=a-b" range. Return (start, end), None to ignore it, or False if unsatisfiable."""
+    unit, _, spec = header.partition("=")
+    if unit.strip() != "bytes" or "," in spec:
+        return None
+    first, sep, last = spec.strip().partition("-")
+    if not sep:
+        return None
+    try:
+        if first:
+            start = int(first)
+            end = min(int(last), size - 1) if last else size - 1
+        else:
+            # Suffix range: the last N bytes
+            start, end = max(0, size - int(last)), size - 1
+    except ValueError:
+        return None
+    if start > end or start >= size:
+        return False
+    return start, end
+
+
+class _FileRange:
+    """Iterate `length` bytes of open file `f` from `start`; the response closes it."""
+
+    def __init__(self, f, start: int, length: int, block_size: int = 64 * 1024):
+        self.f = f
+        self.remaining = length
+        self.block_size = block_size
+        f.seek(start)
+
+    def __iter__(self):
+        return self
+
+    def __next__(self) -> bytes:
+        if self.remaining <= 0:
+            raise StopIteration
+        data = self.f.read(min(self.block_size, self.remaining))
+        if not data:
+            raise StopIteration
+        self.remaining -= len(data)
+        return data
+
+    def close(self) -> None:
+        self.f.close()
+
+
 class ImportCreateView(FormView):
     form_class = ADIFUploadForm
     template_name = "logbook/import_new.html"
 
     def form_valid(self, form):
         f = form.cleaned_data["file"]
-        data = f.read()
-        if not data:
+        if not f.size:
             return HttpResponseBadRequest("Empty file")
         content_type = getattr(f, "content_type", "application/octet-stream")
         original_filename = getattr(f, "name", "upload.adi")
-        size_bytes = len(data)
-        sha256 = compute_sha256(data)
-        gz = gzip_bytes(data)
+        # One pass over the spooled upload: hash, gzip and parse chunk by chunk.
+        # Large files are only hashed and compressed here; a worker parses them.
+        chunk_size = settings.LOGHUB_IMPORT_CHUNK_SIZE
+        stream = UploadStream(f.chunks(chunk_size=chunk_size))
+        parse_workers = form.cleaned_data.get("parse_workers") or 0
+        inline = f.size <= settings.LOGHUB_IMPORT_INLINE_MAX_BYTES and parse_workers <= 1
+
+        # The exact same file again: point at the earlier import instead of redoing it.
+        # Inline uploads are small, so hashing them ahead of the parse pass is cheap.
+        if inline:
+            sha256 = sha256_chunks(f.chunks(chunk_size=chunk_size))
+        else:
+            stream.consume()
+            sha256 = stream.sha256
+        same = find_same_file_import(sha256)
+        if same is not None:
+            return HttpResponseRedirect(reverse("logbook:import_review", args=[same.pk]) + "?reupload=1")
 
         with transaction.atomic():
             imp = LogImport.objects.create(
@@ -213,18 +406,22 @@ class ImportCreateView(FormView):
                 provider="",
                 original_filename=original_filename,
                 content_type=content_type,
-                size_bytes=size_bytes,
-                sha256=sha256,
+                size_bytes=f.size,
                 station_callsign=form.cleaned_data.get("station_callsign") or "",
                 notes=form.cleaned_data.get("notes") or "",
-                content_gz=gz,
-                status=LogImport.STATUS_PENDING,
+                status=LogImport.STATUS_PENDING if inline else LogImport.STATUS_PARSING,
+                meta={"parse_workers": parse_workers} if parse_workers else {},
             )
-            text = data.decode("utf-8", errors="replace")
-            ok, err = parse_adif_to_staged(imp, text)
-            imp.entry_count = ok
-            imp.error_count = err
-            imp.save(update_fields=["entry_count", "error_count"])
+            update_fields = ["size_bytes", "sha256", "content_gz"]
+            if inline:
+                ok, err = stage_records(imp, stream.records())
+                imp.entry_count = ok
+                imp.error_count = err
+                update_fields += ["entry_count", "error_count", "skipped_count"]
+            imp.size_bytes = stream.size_bytes
+            imp.sha256 = stream.sha256
+            imp.content_gz = stream.gzipped()
+            imp.save(update_fields=update_fields)
 
         return HttpResponseRedirect(reverse("logbook:import_review", args=[imp.pk]))
 
@@ -232,57 +429,48 @@ class ImportCreateView(FormView):
 class ImportReviewView(ListView):
     model = StagedEntry
     paginate_by = 50
+    paginator_class = EstimatedCountPaginator
     template_name = "logbook/import_review.html"
     context_object_name = "entries"
 
     def get_queryset(self):
         self.import_obj = LogImport.objects.get(pk=self.kwargs["pk"])  # type: ignore[attr-defined]
-        return self.import_obj.staged_entries.all()
+        qs = self.import_obj.staged_entries.all()
+        dupe = self.request.GET.get("dupe")
+        if dupe in dict(DUPE_STATUS_CHOICES):
+            qs = qs.filter(dupe_status=dupe)
+        return qs
+
+    def paginate_queryset(self, queryset, page_size):
+        # Unlike ListView's, leaves the page's rows and has_next() unevaluated:
+        # on a fragment-cache hit the template never needs them
+        paginator = self.get_paginator(
+            queryset, page_size, orphans=self.get_paginate_orphans(), allow_empty_first_page=self.get_allow_empty()
+        )
+        try:
+            page = paginator.page(self.request.GET.get(self.page_kwarg) or 1)
+        except InvalidPage as exc:
+            raise Http404(str(exc)) from exc
+        return paginator, page, page, SimpleLazyObject(page.has_other_pages)
 
     def get_context_data(self, **kwargs):
         ctx = super().get_context_data(**kwargs)
         imp = self.import_obj
 
-        # Scan the ENTIRE import to discover which fields are used
-        qs_all = imp.staged_entries.all()
-
-        # Determine which core fields (model fields) have any non-empty value
-        exclude_fields = {"id", "imp", "created_at", "extras"}
-        # Grab concrete non-relational fields from model
-        core_field_names = [
-            f.name
-            for f in StagedEntry._meta.get_fields()
-            if getattr(f, "concrete", False)
-            and not getattr(f, "many_to_many", False)
-            and not getattr(f, "is_relation", False)
-            and f.name not in exclude_fields
-        ]
-
-        present_core: set[str] = set()
-        # Stream through values to avoid loading full model instances
-        for row in qs_all.values(*core_field_names).iterator():
-            # operator_display is derived; mark if either source exists
-            if (row.get("operator") or row.get("station_callsign")):
-                present_core.add("operator_display")
-            for k, v in row.items():
-                if v is None:
-                    continue
-                if isinstance(v, str) and v.strip() == "":
-                    continue
-                present_core.add(k)
+        # Columns in use across the whole import, summarized at staging time
+        summary = review_summary(imp)
+        core_field_names = CORE_FIELDS
+        present_core: set[str] = set(summary["core"])
+        # operator_display is derived; mark if either source exists
+        if present_core & {"operator", "station_callsign"}:
+            present_core.add("operator_display")
 
         # Ensure these always show for usability
         present_core.update({"callsign", "qso_date", "time_on"})
 
-        # Collect all extras keys with any non-empty value across the import
-        extras_keys_set: set[str] = set()
-        for ex in qs_all.values_list("extras", flat=True).iterator():
-            if not isinstance(ex, dict):
-                continue
-            for k, v in ex.items():
-                if v is None or str(v).strip() == "":
-                    continue
-                extras_keys_set.add(str(k).upper())
+        invalid_count = summary["invalid"]
+        dupe_counts = summary["dupes"]
+        extras_keys_set: set[str] = set(summary["extras"])
 
         # Column ordering: start with a preferred order for common fields, then remaining core fields, then extras
         preferred_order = [
@@ -311,6 +499,10 @@ class ImportReviewView(ListView):
             return label_map.get(field, field.replace("_", " ").title())
 
         columns: list[tuple[str, str]] = []
+        if invalid_count:
+            columns.append(("errors", "Errors"))
+        if dupe_counts.get(DUPE_DUPLICATE) or dupe_counts.get(DUPE_CONFLICT):
+            columns.append(("dupe_status", "Dupe"))
         for f in preferred_order:
             if f in present_core:
                 columns.append((f, label_for(f)))
@@ -347,6 +539,15 @@ class ImportReviewView(ListView):
         ctx.update({
             "import": imp,
             "columns": columns,
+            "invalid_count": invalid_count,
+            "stats": stats_display(import_stats(imp)),
+            # Called by the template only when the cached table fragment is missing
+            "rows": functools.partial(display_rows, ctx["entries"], columns),
+            "rows_rev": summary.get("rev", ""),
+            "rows_cache_seconds": settings.LOGHUB_REVIEW_CACHE_SECONDS,
+            "dupe_filters": [(value, label, dupe_counts.get(value, 0)) for value, label in DUPE_STATUS_CHOICES],
+            "dupe_filter": self.request.GET.get("dupe", ""),
+            "reupload": bool(self.request.GET.get("reupload")),
         })
         return ctx
 
@@ -355,6 +556,13 @@ def import_confirm(request, pk: int):
     imp = LogImport.objects.get(pk=pk)
     if imp.status != LogImport.STATUS_PENDING:
         return HttpResponseBadRequest("Import not pending")
+    if (imp.size_bytes or 0) > settings.LOGHUB_IMPORT_INLINE_MAX_BYTES:
+        # Too large to move inside the request; queue it for a worker
+        imp.status = LogImport.STATUS_FINALIZING
+        imp.processed_records = 0
+        imp.total_records = imp.entry_count
+        imp.save(update_fields=["status", "processed_records", "total_records"])
+        return HttpResponseRedirect(reverse("logbook:import_review", args=[imp.pk]))
     created = finalize_import(imp)
     imp.status = LogImport.STATUS_DONE
     from django.utils import timezone
@@ -365,6 +573,16 @@ def import_confirm(request, pk: int):
     return HttpResponseRedirect(reverse("logbook:list"))
 
 
+def import_progress(request, pk: int):
+    """HTMX-polled progress fragment for queued imports."""
+    imp = LogImport.objects.get(pk=pk)
+    resp = render(request, "logbook/import_progress.html", {"import": imp})
+    if not imp.is_queued and request.headers.get("HX-Request"):
+        # Job finished: reload the review page to show the staged rows
+        resp["HX-Refresh"] = "true"
+    return resp
+
+
 def import_cancel(request, pk: int):
     imp = LogImport.objects.get(pk=pk)
     if imp.status != LogImport.STATUS_PENDING:
@@ -378,6 +596,7 @@ def import_cancel(request, pk: int):
 class ImportListView(ListView):
     model = LogImport
     paginate_by = 25
+    paginator_class = EstimatedCountPaginator
     template_name = "logbook/import_list.html"
     context_object_name = "imports"
 
@@ -385,7 +604,7 @@ class ImportListView(ListView):
         qs = LogImport.objects.all().order_by("-created_at")
         if self.request.GET.get("all"):
             return qs
-        return qs.filter(status=LogImport.STATUS_PENDING)
+        return qs.filter(status__in=(LogImport.STATUS_PENDING, *LogImport.QUEUED_STATUSES))
 
     def get_context_data(self, **kwargs):
         ctx = super().get_context_data(**kwargs)
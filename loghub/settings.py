@@ -80,3 +80,35 @@ STATIC_ROOT = BASE_DIR / "staticfiles"
 STATICFILES_DIRS = [BASE_DIR / "static"]
 
 DEFAULT_AUTO_FIELD = "django.db.models.BigAutoField"
+
+
+# LogHub imports
+# Uploads are read, hashed, compressed and tokenized in chunks of this size.
+LOGHUB_IMPORT_CHUNK_SIZE = int(os.getenv("LOGHUB_IMPORT_CHUNK_SIZE", str(64 * 1024)))
+# Uploads larger than this are parsed and finalized by `manage.py import_worker`
+LOGHUB_IMPORT_INLINE_MAX_BYTES = int(os.getenv("LOGHUB_IMPORT_INLINE_MAX_BYTES", str(2 * 1024 * 1024)))
+# Default process count the import worker uses to parse an upload
+LOGHUB_IMPORT_PARSE_WORKERS = int(os.getenv("LOGHUB_IMPORT_PARSE_WORKERS", "1"))
+# Parsed records buffered per staging INSERT/COPY batch
+LOGHUB_STAGING_BATCH_SIZE = int(os.getenv("LOGHUB_STAGING_BATCH_SIZE", "1000"))
+# Staged rows validated and inserted per committed transaction on finalize
+LOGHUB_FINALIZE_BATCH_SIZE = int(os.getenv("LOGHUB_FINALIZE_BATCH_SIZE", "1000"))
+# Staged QSOs within this many minutes of a logbook QSO with the same
+# callsign, band and mode group are flagged as duplicates
+LOGHUB_DEDUP_WINDOW_MINUTES = int(os.getenv("LOGHUB_DEDUP_WINDOW_MINUTES", "15"))
+# Rendered import review table pages are cached this long (seconds)
+LOGHUB_REVIEW_CACHE_SECONDS = int(os.getenv("LOGHUB_REVIEW_CACHE_SECONDS", "600"))
+
+# Keep each log entry's extras (non-core ADIF fields) in a JSON column on the
+# entry itself instead of the LogEntryExtras table; switch existing rows with
+# `manage.py move_extras`
+LOGHUB_INLINE_EXTRAS = os.getenv("LOGHUB_INLINE_EXTRAS", "0") == "1"
+
+# Paginated lists use planner row estimates (PostgreSQL) above this many rows
+LOGHUB_EXACT_COUNT_THRESHOLD = int(os.getenv("LOGHUB_EXACT_COUNT_THRESHOLD", "10000"))
+
+# LogHub exports
+# Log entries fetched per database round trip (and per streamed chunk) on export
+LOGHUB_EXPORT_CHUNK_SIZE = int(os.getenv("LOGHUB_EXPORT_CHUNK_SIZE", "2000"))
+# Gzipped full exports are cached here, one file per logbook version
+LOGHUB_EXPORT_CACHE_DIR = Path(os.getenv("LOGHUB_EXPORT_CACHE_DIR", str(BASE_DIR / "var" / "exports")))
@@ -0,0 +1,78 @@
+#!/usr/bin/env python3
+"""
+Benchmark ADIF date/time casting against the strptime baseline.
+
+Casts a synthetic column of QSO_DATE/TIME_ON values shaped like a real log
+(a few hundred distinct dates, mostly distinct times) with both approaches.
+
+Usage:
+  python scripts/bench_adif_datetime.py [records] [repeat]
+
+Defaults:
+  RECORDS: 200000
+  REPEAT:  5
+"""
+
+from __future__ import annotations
+
+import datetime as dt
+import random
+import sys
+import timeit
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+
+from logbook.adif_datetime import parse_date, to_date, to_time  # noqa: E402
+
+
+def strptime_date(s: str):
+    try:
+        return dt.datetime.strptime(s, "%Y%m%d").date()
+    except Exception:
+        return None
+
+
+def strptime_time(s: str):
+    try:
+        if len(s) == 4:
+            return dt.datetime.strptime(s, "%H%M").time()
+        return dt.datetime.strptime(s, "%H%M%S").time()
+    except Exception:
+        return None
+
+
+def sample(n: int) -> tuple[list[str], list[str]]:
+    rnd = random.Random(1)
+    start = dt.date(2020, 1, 1)
+    dates = [(start + dt.timedelta(days=rnd.randrange(365))).strftime("%Y%m%d") for _ in range(n)]
+    times = [f"{rnd.randrange(24):02d}{rnd.randrange(60):02d}{rnd.randrange(60):02d}"[: rnd.choice((4, 6))] for _ in range(n)]
+    return dates, times
+
+
+def main(argv: list[str]) -> int:
+    n = int(argv[1]) if len(argv) > 1 else 200_000
+    repeat = int(argv[2]) if len(argv) > 2 else 5
+    dates, times = sample(n)
+    assert [strptime_date(d) for d in dates] == [to_date(d) for d in dates]
+    assert [strptime_time(t) for t in times] == [to_time(t) for t in times]
+
+    def best(fn, values) -> float:
+        def run():
+            parse_date.cache_clear()
+            for v in values:
+                fn(v)
+        return min(timeit.repeat(run, number=1, repeat=repeat))
+
+    print(f"{n} values, best of {repeat}")
+    for label, old, new, values in (
+        ("date", strptime_date, to_date, dates),
+        ("time", strptime_time, to_time, times),
+    ):
+        t_old, t_new = best(old, values), best(new, values)
+        print(f"{label}: strptime {t_old:.3f}s  sliced {t_new:.3f}s  ({t_old / t_new:.1f}x)")
+    return 0
+
+
+if __name__ == "__main__":
+    raise SystemExit(main(sys.argv))
@@ -0,0 +1,90 @@
+#!/usr/bin/env python3
+"""
+Benchmark ADIF export: entry_to_adif (model instances) vs the values_list exporter.
+
+Creates a throwaway test database, fills it with synthetic QSOs (a share of
+them with extras), checks both paths produce identical output and reports
+rows/sec for each.
+
+Usage:
+  python scripts/bench_adif_export.py [records] [repeat]
+
+Defaults:
+  RECORDS: 20000
+  REPEAT:  3
+"""
+
+from __future__ import annotations
+
+import datetime as dt
+import os
+import random
+import sys
+import timeit
+from decimal import Decimal
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+os.environ.setdefault("DJANGO_SETTINGS_MODULE", "loghub.settings")
+
+import django  # noqa: E402
+
+django.setup()
+
+from django.db import connection  # noqa: E402
+from django.test.utils import setup_test_environment  # noqa: E402
+
+from logbook.adif import iter_adif, iter_adif_values  # noqa: E402
+from logbook.models import LogEntry, LogEntryExtras  # noqa: E402
+
+
+def populate(n: int) -> None:
+    rnd = random.Random(1)
+    start = dt.date(2020, 1, 1)
+    entries = [
+        LogEntry(
+            callsign=f"K{rnd.randrange(10)}{chr(65 + rnd.randrange(26))}{chr(65 + rnd.randrange(26))}",
+            qso_date=start + dt.timedelta(days=rnd.randrange(1000)),
+            time_on=dt.time(rnd.randrange(24), rnd.randrange(60), rnd.randrange(60)),
+            band="20m",
+            freq=Decimal("14.074000"),
+            mode="FT8",
+            rst_sent="-10",
+            rst_rcvd="-12",
+            station_callsign="F4JAW",
+            gridsquare="JN18",
+            dxcc=291,
+        )
+        for _ in range(n)
+    ]
+    LogEntry.objects.bulk_create(entries, batch_size=1000)
+    LogEntryExtras.objects.bulk_create(
+        [LogEntryExtras(entry=e, data={"POTA_REF": "K-1234", "APP_LOGHUB_X": "1"}) for e in entries[::3]],
+        batch_size=1000,
+    )
+
+
+def main(argv: list[str]) -> int:
+    n = int(argv[1]) if len(argv) > 1 else 20_000
+    repeat = int(argv[2]) if len(argv) > 2 else 3
+    setup_test_environment()
+    old_name = connection.creation.create_test_db(verbosity=0)
+    try:
+        populate(n)
+        qs = LogEntry.objects.order_by("qso_date", "time_on", "callsign")
+        assert "".join(iter_adif(qs.select_related("extras"))) == "".join(iter_adif_values(qs))
+        print(f"{n} records, best of {repeat}")
+        for label, fn in (
+            ("entry_to_adif (select_related)", lambda: "".join(iter_adif(qs.select_related("extras")))),
+            ("entry_to_adif (N+1 extras)", lambda: "".join(iter_adif(qs))),
+            ("values_list exporter", lambda: "".join(iter_adif_values(qs))),
+        ):
+            t = min(timeit.repeat(fn, number=1, repeat=repeat))
+            print(f"{label:32s} {t:.3f}s  {n / t:,.0f} rows/s")
+    finally:
+        connection.creation.destroy_test_db(old_name, verbosity=0)
+    return 0
+
+
+if __name__ == "__main__":
+    raise SystemExit(main(sys.argv))
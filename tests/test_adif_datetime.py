@@ -0,0 +1,36 @@
+import datetime as dt
+
+import pytest
+
+from logbook.adif_catalog import normalize_extra_value
+from logbook.adif_datetime import parse_date, to_date, to_time
+
+
+@pytest.mark.parametrize("value", ["20240229", "19991231", "20230229", "20241301", "2024011", "2024-01-01", "2024O101", "", None])
+def test_to_date_matches_strptime(value):
+    try:
+        expected = dt.datetime.strptime(value, "%Y%m%d").date() if len(value) == 8 else None
+    except (TypeError, ValueError):
+        expected = None
+    assert to_date(value) == expected
+
+
+@pytest.mark.parametrize(
+    "value, expected",
+    [("1234", dt.time(12, 34)), ("235959", dt.time(23, 59, 59)), ("2400", None), ("1260", None), ("12345", None), ("12:34", None)],
+)
+def test_to_time(value, expected):
+    assert to_time(value) == expected
+
+
+def test_dates_are_memoized():
+    parse_date.cache_clear()
+    for _ in range(3):
+        to_date("20240101")
+    assert parse_date.cache_info().hits == 2
+
+
+def test_catalog_dates_and_times_normalize():
+    assert normalize_extra_value("QSLRDATE", "2024-01-02") == "20240102"
+    assert normalize_extra_value("QSLRDATE", "20241302") == "20241302"
+    assert normalize_extra_value("TIME_ON", "1234") == "123400"
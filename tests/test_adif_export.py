@@ -3,8 +3,8 @@ import datetime as dt
 import pytest
 
 from decimal import Decimal
-from logbook.adif import entry_to_adif as qso_to_adif, queryset_to_adif
-from logbook.models import LogEntry as QSO
+from logbook.adif import entry_to_adif as qso_to_adif, iter_adif_values, queryset_to_adif
+from logbook.models import LogEntry as QSO, LogEntryExtras
 
 
 @pytest.mark.django_db
@@ -34,5 +34,36 @@ def test_export_view(client):
     )
     resp = client.get("/logbook/export.adif")
     assert resp.status_code == 200
-    body = resp.content.decode()
+    body = b"".join(resp.streaming_content).decode()
     assert "<ADIF_VER:" in body and body.strip().endswith("<EOR>")
+
+
+@pytest.mark.django_db
+def test_export_is_streamed_in_chunks(client, settings, django_assert_max_num_queries):
+    settings.LOGHUB_EXPORT_CHUNK_SIZE = 2
+    for i in range(5):
+        q = QSO.objects.create(callsign=f"K{i}ABC", qso_date=dt.date(2024, 1, 1 + i), time_on=dt.time(12, 0), band="20m", mode="CW")
+    LogEntryExtras.objects.create(entry=q, data={"POTA_REF": "K-1"})
+    with django_assert_max_num_queries(2):
+        resp = client.get("/logbook/export.adif")
+        chunks = [c.decode() for c in resp.streaming_content]
+    assert resp.streaming
+    # header, then 2 + 2 + 1 records
+    assert [c.count("<EOR>") for c in chunks] == [0, 2, 2, 1]
+    body = "".join(chunks)
+    assert body == queryset_to_adif(QSO.objects.order_by("qso_date", "time_on", "callsign"))
+    assert "<POTA_REF:3>K-1" in body
+
+
+@pytest.mark.django_db
+def test_values_exporter_matches_entry_to_adif(django_assert_num_queries):
+    QSO.objects.create(callsign="K1ABC", qso_date=dt.date(2024, 1, 1), time_on=dt.time(0, 0), band="20m", mode="CW",
+                       freq=Decimal("14.030000"), srx=0, sota_ref="W7W/LC-001", notes="a\nb")
+    q = QSO.objects.create(callsign="F4JAW", qso_date=dt.date(2024, 1, 2), time_on=dt.time(6, 7, 8), band="40m", mode="SSB",
+                           sig="POTA", sig_info="K-1", my_sota_ref="F/AB-001", lotw_qsl_rcvd_date=dt.date(2024, 3, 1))
+    LogEntryExtras.objects.create(entry=q, data={"pota_ref": "K-1", "CALL": "X", "EMPTY": "", "NONE": None, "AGE": 42})
+    qs = QSO.objects.order_by("qso_date", "time_on", "callsign")
+    expected = queryset_to_adif(qs.select_related("extras"))
+    with django_assert_num_queries(1):
+        assert "".join(iter_adif_values(qs)) == expected
+    assert "<MY_SIG:4>SOTA<MY_SIG_INFO:8>F/AB-001" in expected
@@ -0,0 +1,39 @@
+import gzip
+
+import pytest
+
+from logbook import adif_parallel
+from logbook.adif_parallel import split_ranges
+from logbook.imports import stage_import_content
+from logbook.models import LogImport
+
+
+def _record(i: int) -> bytes:
+    call = f"K{i}ABC".encode()
+    return b"<CALL:%d>%s<QSO_DATE:8>20240101<TIME_ON:4>1234<BAND:3>20m<MODE:3>SSB<EOR>\n" % (len(call), call)
+
+
+def test_split_ranges_end_after_real_eor():
+    data = b"<ADIF_VER:5>3.1.5<EOH>\n" + _record(1) + b"<COMMENT:6>x<EOR>" + _record(2) + _record(3)
+    ranges = split_ranges(data, 10)
+    assert ranges[0][0] == 0 and ranges[-1][1] == len(data)
+    for _start, end in ranges[:-1]:
+        assert data[:end].upper().endswith(b"<EOR>\n") or data[:end].upper().endswith(b"<EOR>")
+        assert data[end - 6 : end] != b"x<EOR>"
+
+
+@pytest.mark.django_db
+def test_parallel_staging_matches_sequential(monkeypatch):
+    monkeypatch.setattr(adif_parallel, "MIN_RANGE_BYTES", 256)
+    data = b"<ADIF_VER:5>3.1.5<EOH>\n" + b"".join(_record(i) for i in range(60)) + b"<CALL:3>BAD<EOR>"
+    imp = LogImport.objects.create(kind=LogImport.KIND_FILE, format=LogImport.FORMAT_ADIF, content_gz=gzip.compress(data))
+    reports = []
+
+    assert stage_import_content(imp, progress=lambda b, seen: reports.append(b), workers=2) == (60, 1)
+    parallel = list(imp.staged_entries.order_by("pk").values_list("callsign", "time_on"))
+    assert reports[-1] == len(data)
+    assert imp.meta["stats"]["errors"] == {"record:missing_required": 1}
+
+    assert stage_import_content(imp) == (60, 1)
+    assert list(imp.staged_entries.order_by("pk").values_list("callsign", "time_on")) == parallel
+    assert [c for c, _ in parallel] == [f"K{i}ABC" for i in range(60)]
@@ -0,0 +1,40 @@
+import io
+
+from logbook.adif_tokenizer import ADIFTokenizer, iter_adif_chunks, iter_adif_file
+from logbook.imports import parse_adif_records
+
+
+SAMPLE = (
+    b"Generated by test <PROGRAMID:4>TEST<ADIF_VER:5>3.1.5\n<eoh>\n"
+    b"<CALL:5>K1ABC<QSO_DATE:8>20240101<TIME_ON:4>1234<MODE:3>SSB<eor>\n"
+    b"<call:5>F4JAW<QSO_DATE:8>20240102<TIME_ON:6>010203<COMMENT:9>a <EOR> b<EOR>\n"
+)
+
+
+def test_records_lowercase_markers_and_eor_inside_value():
+    recs = list(parse_adif_records(SAMPLE))
+    assert len(recs) == 2
+    assert recs[0]["CALL"] == "K1ABC"
+    assert "PROGRAMID" not in recs[0]
+    assert recs[1]["CALL"] == "F4JAW"
+    assert recs[1]["COMMENT"] == "a <EOR> b"
+
+
+def test_byte_at_a_time_matches_whole_document():
+    tok = ADIFTokenizer()
+    chunks = [SAMPLE[i : i + 1] for i in range(len(SAMPLE))]
+    recs = list(iter_adif_chunks(chunks, tok))
+    assert recs == list(parse_adif_records(SAMPLE))
+    assert tok.bytes_consumed == len(SAMPLE)
+    assert tok.record_count == 2
+
+
+def test_length_counts_characters_for_utf8_values():
+    data = "<NAME:4>José<CALL:5>K1ABC<EOR>".encode("utf-8")
+    recs = list(iter_adif_file(io.BytesIO(data), chunk_size=3))
+    assert recs == [{"NAME": "José", "CALL": "K1ABC"}]
+
+
+def test_trailing_record_without_eor_is_kept():
+    recs = list(parse_adif_records("<CALL:5>K1ABC<EOR><CALL:5>F4JAW"))
+    assert [r["CALL"] for r in recs] == ["K1ABC", "F4JAW"]
@@ -0,0 +1,29 @@
+from decimal import Decimal
+
+from logbook.bands import band_for_freq, bands_for_freqs
+from logbook.models import LogEntry
+
+
+def test_band_edges_are_inclusive_and_exact():
+    assert band_for_freq(Decimal("14.000000")) == "20m"
+    assert band_for_freq(Decimal("14.350000")) == "20m"
+    assert band_for_freq(Decimal("14.350001")) is None
+    assert band_for_freq(Decimal("54.000001")) == "5m"
+    assert band_for_freq(Decimal("54")) == "6m"
+
+
+def test_bands_beyond_the_old_table():
+    assert band_for_freq(Decimal("0.1365")) == "2190m"
+    assert band_for_freq(Decimal("0.475")) == "630m"
+    assert band_for_freq(Decimal("0.502")) == "560m"
+    assert band_for_freq(Decimal("40.68")) == "8m"
+    assert band_for_freq(Decimal("60.0")) == "5m"
+    assert band_for_freq(Decimal("2400.1")) == "13cm"
+    assert band_for_freq(Decimal("10368.2")) == "3cm"
+    assert LogEntry._derive_band_from_freq(Decimal("0")) is None
+
+
+def test_bulk_variant_matches_scalar():
+    freqs = [Decimal("14.074"), None, Decimal("7.074"), Decimal("14.074"), Decimal("99"), "144.174", 0]
+    assert bands_for_freqs(freqs) == [band_for_freq(f) for f in freqs]
+    assert bands_for_freqs(freqs)[:3] == ["20m", None, "40m"]
@@ -0,0 +1,76 @@
+import datetime as dt
+from decimal import Decimal
+
+import pytest
+from django.urls import reverse
+
+from logbook.imports import finalize_import, parse_adif_to_staged
+from logbook.models import LogEntry, LogImport, StagedEntry
+from logbook.validation import validate_rows
+
+
+def test_validate_rows_normalizes_and_flags_per_row():
+    rows = [
+        {"callsign": "k1abc", "freq": Decimal("14.074"), "operator": "f4jaw"},
+        {"callsign": "/BAD/", "band": "20m", "prop_mode": "SAT"},
+        {"callsign": "K1ABC", "freq": Decimal("99.0"), "sat_name": "AO-91"},
+    ]
+    errors = validate_rows(rows)
+    assert errors[0] == []
+    assert rows[0]["callsign"] == "K1ABC"
+    assert rows[0]["band"] == "20m"
+    assert rows[0]["station_callsign"] == "F4JAW"
+    assert errors[1] == ["callsign:slash", "sat_name:sat_required"]
+    assert errors[2] == ["freq:underivable", "sat_name:sat_forbidden"]
+
+
+@pytest.mark.django_db
+def test_errors_are_stored_at_staging_and_skipped_on_confirm(client):
+    imp = LogImport.objects.create(kind=LogImport.KIND_FILE, format=LogImport.FORMAT_ADIF)
+    adif = (
+        "<CALL:5>K1ABC<QSO_DATE:8>20240101<TIME_ON:4>1234<FREQ:6>14.074<MODE:3>FT8<EOR>"
+        "<CALL:5>/BAD/<QSO_DATE:8>20240101<TIME_ON:4>1235<BAND:3>20m<EOR>"
+    )
+    assert parse_adif_to_staged(imp, adif) == (2, 0)
+    bad = imp.staged_entries.get(time_on=dt.time(12, 35))
+    assert bad.errors == ["callsign:slash", "mode:required"]
+    assert imp.staged_entries.get(callsign="K1ABC").band == "20m"
+
+    resp = client.get(reverse("logbook:import_review", args=[imp.pk]))
+    assert b"Invalid: 1" in resp.content
+    assert b"must not begin or end with" in resp.content
+
+    assert finalize_import(imp) == 1
+    assert list(LogEntry.objects.values_list("callsign", flat=True)) == ["K1ABC"]
+
+
+@pytest.mark.django_db
+def test_unstorable_values_are_set_aside_before_staging():
+    imp = LogImport.objects.create(kind=LogImport.KIND_FILE, format=LogImport.FORMAT_ADIF)
+    sig_info = "K-1234,K-1235,K-1236,K-1237,K-1238"
+    name = "N" * 70
+    call = "K1ABCDEFGHIJKLMNOPQRS"
+    adif = (
+        f"<CALL:5>K1ABC<QSO_DATE:8>20240101<TIME_ON:4>1200<BAND:3>20m<MODE:2>CW<SIG_INFO:{len(sig_info)}>{sig_info}"
+        f"<NAME:{len(name)}>{name}<SRX:2>-5<TX_PWR:8>12345678<EOR>"
+        f"<CALL:{len(call)}>{call}<QSO_DATE:8>20240101<TIME_ON:4>1300<BAND:3>20m<MODE:2>CW<EOR>"
+    )
+    assert parse_adif_to_staged(imp, adif) == (2, 0)
+
+    first = imp.staged_entries.get(time_on=dt.time(12, 0))
+    assert sorted(first.errors) == ["name:too_long", "sig_info:too_long", "srx:invalid", "tx_pwr:invalid"]
+    assert (first.sig_info, first.name, first.srx, first.tx_pwr) == ("", "", None, None)
+    assert first.extras == {"SIG_INFO": sig_info, "NAME": name, "SRX": "-5", "TX_PWR": "12345678"}
+    second = imp.staged_entries.get(time_on=dt.time(13, 0))
+    assert second.callsign == "" and second.extras["CALL"] == call
+
+    # Whatever was written fits the column constraints PostgreSQL enforces
+    for entry in imp.staged_entries.all():
+        for field in StagedEntry._meta.concrete_fields:
+            value = getattr(entry, field.attname)
+            if value in (None, "") or field.is_relation or field.primary_key:
+                continue
+            if getattr(field, "max_length", None):
+                assert len(value) <= field.max_length, field.name
+            for validator in field.validators:
+                validator(value)
@@ -0,0 +1,79 @@
+import pytest
+from django.db import connection
+from django.test.utils import CaptureQueriesContext
+from django.urls import reverse
+
+from logbook import counts
+from logbook.counts import EstimatedCountPaginator, estimate_count
+from logbook.imports import parse_adif_to_staged
+from logbook.models import LogImport
+
+ADIF = "".join(f"<CALL:5>K{i % 10}ABC<QSO_DATE:8>20240101<TIME_ON:4>12{i % 60:02d}<BAND:3>20m<MODE:2>CW<EOR>" for i in range(12))
+
+
+def _imp():
+    return LogImport.objects.create(kind=LogImport.KIND_FILE, format=LogImport.FORMAT_ADIF)
+
+
+@pytest.mark.django_db
+def test_small_or_unsupported_counts_are_exact(monkeypatch):
+    imp = _imp()
+    parse_adif_to_staged(imp, ADIF)
+    assert estimate_count(imp.staged_entries.all()) == (12, False)
+    monkeypatch.setattr(counts, "_planner_estimate", lambda qs: 11)
+    assert estimate_count(imp.staged_entries.all(), threshold=100) == (12, False)
+
+
+@pytest.mark.django_db
+def test_large_counts_use_the_estimate_without_count_query(monkeypatch, settings):
+    settings.LOGHUB_EXACT_COUNT_THRESHOLD = 1
+    imp = _imp()
+    parse_adif_to_staged(imp, ADIF)
+    # Underestimate on purpose: pages past the estimate must still work
+    monkeypatch.setattr(counts, "_planner_estimate", lambda qs: 5)
+    paginator = EstimatedCountPaginator(imp.staged_entries.order_by("pk"), 5)
+    with CaptureQueriesContext(connection) as ctx:
+        pages = [paginator.page(1)]
+        while pages[-1].has_next():
+            pages.append(paginator.page(pages[-1].next_page_number()))
+    assert paginator.is_estimate and paginator.num_pages == 1
+    assert [len(p) for p in pages] == [5, 5, 2]
+    assert not [q for q in ctx.captured_queries if "COUNT(" in q["sql"].upper()]
+
+
+@pytest.mark.django_db
+def test_review_page_uses_estimated_paginator(client, monkeypatch, settings):
+    settings.LOGHUB_EXACT_COUNT_THRESHOLD = 100
+    imp = _imp()
+    parse_adif_to_staged(imp, ADIF)
+    monkeypatch.setattr(counts, "_planner_estimate", lambda qs: 500)
+    resp = client.get(reverse("logbook:import_review", args=[imp.pk]))
+    paginator = resp.context["paginator"]
+    assert paginator.is_estimate and paginator.num_pages == 10
+    # Only one real page, so no pagination links despite the estimate
+    assert not resp.context["is_paginated"]
+
+
+@pytest.mark.django_db
+def test_cached_review_page_runs_no_row_query_with_an_estimate(client, monkeypatch, settings):
+    settings.LOGHUB_EXACT_COUNT_THRESHOLD = 1
+    imp = _imp()
+    parse_adif_to_staged(imp, ADIF)
+    monkeypatch.setattr(counts, "_planner_estimate", lambda qs: 500)
+    url = reverse("logbook:import_review", args=[imp.pk])
+    first = client.get(url)
+    assert first.context["paginator"].is_estimate
+    with CaptureQueriesContext(connection) as warm:
+        second = client.get(url)
+    assert second.content.count(b"<tr>") == first.content.count(b"<tr>") == 13
+    assert not [q for q in warm.captured_queries if q["sql"].startswith("SELECT") and "logbook_stagedentry" in q["sql"]]
+
+
+@pytest.mark.django_db
+@pytest.mark.skipif(connection.vendor != "postgresql", reason="planner estimates are PostgreSQL only")
+def test_postgres_planner_estimate():
+    imp = _imp()
+    parse_adif_to_staged(imp, ADIF)
+    with connection.cursor() as cursor:
+        cursor.execute("ANALYZE logbook_stagedentry")
+    assert counts._planner_estimate(imp.staged_entries.all()) is not None
@@ -0,0 +1,45 @@
+import datetime as dt
+
+import pytest
+from django.urls import reverse
+
+from logbook.dedup import dupe_key, mode_group
+from logbook.imports import finalize_import, parse_adif_to_staged
+from logbook.models import LogEntry, LogImport
+
+
+def test_dupe_key_uses_mode_group():
+    assert mode_group("usb") == "PHONE" and mode_group("FT8") == "DATA" and mode_group("CW") == "CW"
+    assert dupe_key("k1abc", "20M", "USB") == dupe_key("K1ABC", "20m", "SSB")
+    assert dupe_key("K1ABC", "20m", "SSB") != dupe_key("K1ABC", "20m", "FT8")
+
+
+@pytest.mark.django_db
+def test_reimport_flags_duplicates_and_conflicts(client):
+    LogEntry.objects.create(
+        callsign="K1ABC", qso_date=dt.date(2024, 1, 1), time_on=dt.time(12, 30), band="20m", mode="FT8", rst_sent="-10"
+    )
+    LogEntry.objects.create(
+        callsign="F4JAW", qso_date=dt.date(2024, 1, 1), time_on=dt.time(23, 58), band="40m", mode="SSB", rst_sent="59"
+    )
+    imp = LogImport.objects.create(kind=LogImport.KIND_FILE, format=LogImport.FORMAT_ADIF)
+    adif = (
+        # same QSO, 5 minutes later and a different digital mode
+        "<CALL:5>K1ABC<QSO_DATE:8>20240101<TIME_ON:4>1235<BAND:3>20m<MODE:4>FT4<RST_SENT:3>-10<EOR>"
+        # across midnight, but different RST
+        "<CALL:5>F4JAW<QSO_DATE:8>20240102<TIME_ON:4>0003<BAND:3>40m<MODE:3>USB<RST_SENT:2>57<EOR>"
+        # outside the window
+        "<CALL:5>K1ABC<QSO_DATE:8>20240101<TIME_ON:4>1400<BAND:3>20m<MODE:3>FT8<EOR>"
+    )
+    parse_adif_to_staged(imp, adif)
+    status = dict(imp.staged_entries.values_list("time_on", "dupe_status"))
+    assert status == {dt.time(12, 35): "duplicate", dt.time(0, 3): "conflict", dt.time(14, 0): "new"}
+    dup = imp.staged_entries.get(time_on=dt.time(12, 35))
+    assert dup.duplicate_of.callsign == "K1ABC"
+
+    resp = client.get(reverse("logbook:import_review", args=[imp.pk]), {"dupe": "conflict"})
+    assert [e.callsign for e in resp.context["entries"]] == ["F4JAW"]
+
+    assert finalize_import(imp) == 2
+    assert LogEntry.objects.filter(callsign="K1ABC").count() == 2
+    assert LogEntry.objects.get(time_on=dt.time(14, 0)).dupe_key == dupe_key("K1ABC", "20m", "FT8")
@@ -0,0 +1,121 @@
+import datetime as dt
+import gzip
+
+import pytest
+
+from logbook.adif import queryset_to_adif
+from logbook.exports import logbook_version
+from logbook.models import LogEntry, LogEntryExtras
+
+
+@pytest.fixture
+def cache_dir(settings, tmp_path):
+    settings.LOGHUB_EXPORT_CACHE_DIR = tmp_path
+    return tmp_path
+
+
+def _qso(call, day=1):
+    return LogEntry.objects.create(callsign=call, qso_date=dt.date(2024, 1, day), time_on=dt.time(12, 0), band="20m", mode="CW")
+
+
+def _get(client, **headers):
+    resp = client.get("/logbook/export.adif", HTTP_ACCEPT_ENCODING="gzip", **headers)
+    body = b"".join(resp.streaming_content) if resp.streaming else resp.content
+    return resp, body
+
+
+@pytest.mark.django_db
+def test_artifact_is_cached_until_the_logbook_changes(client, cache_dir):
+    q = _qso("K1AAA")
+    expected = queryset_to_adif(LogEntry.objects.order_by("qso_date", "time_on", "callsign"))
+    # The first request streams at once and builds the artifact on the way
+    resp, body = _get(client)
+    assert not resp.has_header("Content-Encoding") and body.decode() == expected
+    artifact = next(cache_dir.glob("*.adi.gz"))
+    resp, body = _get(client)
+    assert resp.status_code == 200 and resp["Content-Encoding"] == "gzip"
+    assert gzip.decompress(body).decode() == expected
+    etag = resp["ETag"]
+
+    assert _get(client, HTTP_IF_NONE_MATCH=etag)[0].status_code == 304
+    assert _get(client)[0]["ETag"] == etag
+    assert list(cache_dir.glob("*.adi.gz")) == [artifact]
+
+    # Extras-only edits change the version too
+    LogEntryExtras.objects.create(entry=q, data={"POTA_REF": "K-1"})
+    resp, body = _get(client, HTTP_IF_NONE_MATCH=etag)
+    assert resp.status_code == 200 and b"POTA_REF" in body
+    assert list(cache_dir.glob("*.adi.gz")) != [artifact]
+    resp, body = _get(client, HTTP_IF_NONE_MATCH=etag)
+    assert resp["ETag"] != etag and b"POTA_REF" in gzip.decompress(body)
+    assert len(list(cache_dir.glob("*.adi.gz"))) == 1
+
+    version = logbook_version()
+    q.delete()
+    assert logbook_version() != version
+
+
+@pytest.mark.django_db
+def test_artifact_range_requests(client, cache_dir):
+    for i in range(20):
+        _qso(f"K{i}AAA", day=1 + i)
+    _get(client)
+    full = _get(client)[1]
+    etag = _get(client)[0]["ETag"]
+
+    resp, body = _get(client, HTTP_RANGE="bytes=10-19")
+    assert resp.status_code == 206 and body == full[10:20]
+    assert resp["Content-Range"] == f"bytes 10-19/{len(full)}"
+    assert _get(client, HTTP_RANGE="bytes=-5")[1] == full[-5:]
+    assert _get(client, HTTP_RANGE="bytes=100-")[1] == full[100:]
+    assert _get(client, HTTP_RANGE=f"bytes={len(full)}-")[0].status_code == 416
+    # A stale If-Range gets the whole, current artifact
+    resp, body = _get(client, HTTP_RANGE="bytes=10-19", HTTP_IF_RANGE='"stale"')
+    assert resp.status_code == 200 and body == full
+    assert _get(client, HTTP_RANGE="bytes=10-19", HTTP_IF_RANGE=etag)[0].status_code == 206
+
+
+@pytest.mark.django_db
+def test_filtered_or_plain_requests_are_streamed(client, cache_dir):
+    _qso("K1AAA")
+    resp = client.get("/logbook/export.adif", {"band": "20m"}, HTTP_ACCEPT_ENCODING="gzip")
+    assert not resp.has_header("Content-Encoding")
+    assert not client.get("/logbook/export.adif").has_header("Content-Encoding")
+    assert not list(cache_dir.glob("*.adi.gz"))
+
+
+@pytest.mark.django_db
+def test_download_survives_a_concurrent_rebuild(client, cache_dir):
+    for i in range(20):
+        _qso(f"K{i}AAA", day=1 + i)
+    _get(client)
+    expected = _get(client)[1]
+    resp = client.get("/logbook/export.adif", HTTP_ACCEPT_ENCODING="gzip")
+    content = iter(resp.streaming_content)
+    # A newer version is built (and the old artifact unlinked) mid-download
+    _qso("K9ZZZ", day=25)
+    _get(client)
+    assert _get(client)[0]["ETag"] != resp["ETag"]
+    assert len(list(cache_dir.glob("*.adi.gz"))) == 1
+    assert b"".join(content) == expected
+    resp.close()
+
+
+@pytest.mark.django_db
+def test_artifact_is_built_by_one_stream_at_a_time(client, cache_dir):
+    _qso("K1AAA")
+    expected = b"".join(client.get("/logbook/export.adif").streaming_content)
+    first = client.get("/logbook/export.adif", HTTP_ACCEPT_ENCODING="gzip")
+    chunks = iter(first.streaming_content)
+    next(chunks)
+    assert list(cache_dir.glob("*.lock"))
+    # Another request meanwhile streams too, without building its own copy
+    resp, body = _get(client)
+    assert not resp.has_header("Content-Encoding") and body == expected
+    assert not list(cache_dir.glob("*.adi.gz"))
+
+    # An interrupted download publishes nothing and frees the lock
+    first.close()
+    assert not list(cache_dir.glob("*.lock")) and not list(cache_dir.iterdir())
+    _get(client)
+    assert _get(client)[0]["Content-Encoding"] == "gzip"
@@ -0,0 +1,65 @@
+import datetime as dt
+
+import pytest
+
+from logbook.imports import finalize_import, parse_adif_to_staged
+from logbook.models import ExportCheckpoint, LogEntry, LogImport
+
+
+def _export(client, **params):
+    resp = client.get("/logbook/export.adif", params)
+    assert resp.status_code == 200
+    body = b"".join(resp.streaming_content).decode()
+    return sorted(part.split("<CALL:")[1].split(">")[1][:5] for part in body.split("<EOR>")[:-1])
+
+
+def _qso(call, day, station="F4JAW", band="20m"):
+    return LogEntry.objects.create(
+        callsign=call, qso_date=dt.date(2024, 1, day), time_on=dt.time(12, 0), band=band, mode="CW", station_callsign=station
+    )
+
+
+@pytest.mark.django_db
+def test_export_filters(client):
+    _qso("K1AAA", 1)
+    _qso("K1BBB", 5, band="40m")
+    _qso("K1CCC", 9, station="F4XYZ")
+    assert _export(client, date_from="2024-01-02", date_to="20240109") == ["K1BBB", "K1CCC"]
+    assert _export(client, station="f4jaw") == ["K1AAA", "K1BBB"]
+    assert _export(client, band="40M") == ["K1BBB"]
+    assert client.get("/logbook/export.adif", {"band": "11m"}).status_code == 400
+    assert client.get("/logbook/export.adif", {"date_from": "2024-02-01", "date_to": "2024-01-01"}).status_code == 400
+
+
+@pytest.mark.django_db
+def test_incremental_export_with_checkpoint(client):
+    a = _qso("K1AAA", 1)
+    _qso("K1BBB", 2)
+    assert _export(client, checkpoint="qrz") == ["K1AAA", "K1BBB"]
+    assert ExportCheckpoint.objects.get(name="qrz").exported_at is not None
+    assert _export(client, checkpoint="qrz") == []
+
+    a.notes = "edited"
+    a.save()
+    _qso("K1CCC", 3)
+    assert _export(client, checkpoint="qrz") == ["K1AAA", "K1CCC"]
+    # Other checkpoints and plain exports are unaffected
+    assert _export(client, checkpoint="backup") == ["K1AAA", "K1BBB", "K1CCC"]
+
+
+@pytest.mark.django_db
+def test_interrupted_export_keeps_checkpoint(client):
+    _qso("K1AAA", 1)
+    resp = client.get("/logbook/export.adif", {"checkpoint": "qrz"})
+    next(iter(resp.streaming_content))
+    resp.close()
+    assert not ExportCheckpoint.objects.filter(name="qrz").exists()
+
+
+@pytest.mark.django_db
+def test_export_band_filter_finds_imported_uppercase_band(client):
+    imp = LogImport.objects.create(kind=LogImport.KIND_FILE, format=LogImport.FORMAT_ADIF)
+    parse_adif_to_staged(imp, "<CALL:5>K1DDD<QSO_DATE:8>20240101<TIME_ON:4>1200<BAND:3>20M<MODE:2>CW<EOR>")
+    finalize_import(imp)
+    assert _export(client, band="20m") == ["K1DDD"]
+    assert _export(client, band="20M") == ["K1DDD"]
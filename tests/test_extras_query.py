@@ -0,0 +1,66 @@
+import datetime as dt
+
+import pytest
+from django.db import connection
+from django.urls import reverse
+
+from logbook.filters import filter_entries, filter_extras
+from logbook.imports import parse_adif_to_staged
+from logbook.models import LogEntry, LogEntryExtras, LogImport
+
+
+@pytest.fixture
+def entries():
+    for call, data in (("F4JAW", {"POTA_REF": "K-1234", "STATE": "MA"}), ("K1ABC", {"POTA_REF": "K-9999"}), ("K2ABC", {})):
+        e = LogEntry.objects.create(callsign=call, qso_date=dt.date(2024, 1, 1), time_on=dt.time(12, 0), band="20m", mode="CW")
+        if data:
+            LogEntryExtras.objects.create(entry=e, data=data)
+
+
+def _calls(qs):
+    return sorted(qs.values_list("callsign", flat=True))
+
+
+@pytest.mark.django_db
+def test_filter_entries_by_extras(entries):
+    def calls(**kw):
+        return _calls(filter_entries(LogEntry.objects.all(), **kw))
+
+    assert calls(extra_tag="pota_ref", extra_value="K-1234") == ["F4JAW"]
+    assert calls(extra_tag="POTA_REF") == ["F4JAW", "K1ABC"]
+    assert calls(extra_tag="STATE", band="20m") == ["F4JAW"]
+    assert calls(extra_tag="WWFF_REF") == []
+    with pytest.raises(ValueError):
+        filter_extras(LogEntryExtras.objects.all(), "POTA_REF') OR 1=1 --")
+
+
+@pytest.mark.django_db
+def test_filter_extras_on_staged_entries():
+    imp = LogImport.objects.create(kind=LogImport.KIND_FILE, format=LogImport.FORMAT_ADIF)
+    parse_adif_to_staged(
+        imp,
+        "<CALL:5>F4JAW<QSO_DATE:8>20240101<TIME_ON:4>1200<BAND:3>20m<MODE:2>CW<POTA_REF:6>K-1234<EOR>"
+        "<CALL:5>K1ABC<QSO_DATE:8>20240101<TIME_ON:4>1200<BAND:3>20m<MODE:2>CW<EOR>",
+    )
+    assert _calls(filter_extras(imp.staged_entries.all(), "POTA_REF", field="extras")) == ["F4JAW"]
+
+
+@pytest.mark.django_db
+def test_list_filter_by_extra_tag(client, entries):
+    resp = client.get(reverse("logbook:list"), {"extra_tag": "pota_ref", "extra_value": "K-9999"})
+    assert [e.callsign for e in resp.context["object_list"]] == ["K1ABC"]
+    resp = client.get(reverse("logbook:list"), {"extra_tag": "STATE"})
+    assert [e.callsign for e in resp.context["object_list"]] == ["F4JAW"]
+    resp = client.get(reverse("logbook:list"), {"extra_tag": "BAD TAG"})
+    assert resp.context["filter_form"].errors.get("extra_tag")
+
+
+@pytest.mark.django_db
+@pytest.mark.skipif(connection.vendor != "sqlite", reason="JSON1 expression indexes are the SQLite fallback")
+def test_sqlite_uses_expression_index(entries):
+    qs = filter_extras(LogEntryExtras.objects.all(), "POTA_REF", "K-1234")
+    sql, params = qs.query.sql_with_params()
+    with connection.cursor() as cursor:
+        cursor.execute(f"EXPLAIN QUERY PLAN {sql}", params)
+        plan = " ".join(str(row) for row in cursor.fetchall())
+    assert "extras_pota_ref_idx" in plan
@@ -0,0 +1,112 @@
+import datetime as dt
+from urllib.parse import urlencode
+
+import pytest
+from django.core.management import call_command
+from django.db import connection
+from django.test.utils import CaptureQueriesContext
+from django.urls import reverse
+
+from logbook.extras_usage import clear_promoted_cache, promote, promoted_columns, recount_occurrences
+from logbook.filters import filter_entries, filter_extras
+from logbook.imports import finalize_import, parse_adif_to_staged
+from logbook.models import ExtrasTagUsage, LogEntry, LogEntryExtras, LogImport
+
+ADIF = (
+    "<CALL:5>F4JAW<QSO_DATE:8>20240101<TIME_ON:4>1200<BAND:3>20m<MODE:2>CW<POTA_REF:6>K-1234<WWFF_REF:8>KFF-1234<EOR>"
+    "<CALL:5>K1ABC<QSO_DATE:8>20240101<TIME_ON:4>1300<BAND:3>20m<MODE:2>CW<POTA_REF:6>K-9999<EOR>"
+    "<CALL:5>K2ABC<QSO_DATE:8>20240101<TIME_ON:4>1400<BAND:3>20m<MODE:2>CW<EOR>"
+)
+
+
+@pytest.fixture(autouse=True)
+def fresh_cache():
+    clear_promoted_cache()
+    yield
+    clear_promoted_cache()
+
+
+@pytest.fixture
+def imported():
+    imp = LogImport.objects.create(kind=LogImport.KIND_FILE, format=LogImport.FORMAT_ADIF)
+    parse_adif_to_staged(imp, ADIF)
+    finalize_import(imp)
+
+
+def _usage():
+    return {u.tag: (u.occurrences, u.filter_count) for u in ExtrasTagUsage.objects.all()}
+
+
+@pytest.mark.django_db
+def test_finalize_and_searches_count_usage(client, imported):
+    assert _usage() == {"POTA_REF": (2, 0), "WWFF_REF": (1, 0)}
+    url = reverse("logbook:list")
+    client.get(url, {"extra_tag": "pota_ref"})
+    client.get(url, {"extra_tag": "POTA_REF", "after": "x"})
+    assert _usage()["POTA_REF"] == (2, 1)
+
+    # Live filtering counts the finished tag once; prefixes the logbook lacks are ignored
+    shown = f"http://testserver{url}"
+    for query in ({"extra_tag": "P"}, {"extra_tag": "PO"}, {"extra_tag": "POTA_REF"}, {"extra_tag": "POTA_REF", "extra_value": "K"}):
+        client.get(url, query, HTTP_HX_REQUEST="true", HTTP_HX_CURRENT_URL=shown)
+        shown = f"http://testserver{url}?{urlencode(query)}"
+    client.get(url, {"extra_tag": "NOPE"})
+    assert _usage() == {"POTA_REF": (2, 2), "WWFF_REF": (1, 0)}
+
+    LogEntryExtras.objects.filter(data__WWFF_REF="KFF-1234").delete()
+    assert recount_occurrences() == 1
+    assert _usage() == {"POTA_REF": (1, 2), "WWFF_REF": (0, 0)}
+
+
+@pytest.mark.django_db
+@pytest.mark.skipif(connection.vendor not in ("sqlite", "postgresql"), reason="generated columns")
+def test_promoted_tag_is_filtered_on_its_column(imported):
+    assert promote("pota_ref") == "x_pota_ref"
+    assert promote("POTA_REF") == "x_pota_ref"  # idempotent
+    assert promoted_columns() == {"POTA_REF": "x_pota_ref"}
+    assert ExtrasTagUsage.objects.get(tag="POTA_REF").promoted_column == "x_pota_ref"
+
+    qs = filter_extras(LogEntryExtras.objects.all(), "POTA_REF", "K-1234")
+    assert "x_pota_ref" in str(qs.query)
+    assert [x.entry.callsign for x in qs] == ["F4JAW"]
+    calls = filter_entries(LogEntry.objects.all(), extra_tag="POTA_REF").values_list("callsign", flat=True)
+    assert sorted(calls) == ["F4JAW", "K1ABC"]
+
+    # New rows fill the column from the JSON
+    e = LogEntry.objects.create(callsign="K3ABC", qso_date=dt.date(2024, 1, 2), time_on=dt.time(9, 0), band="20m", mode="CW")
+    LogEntryExtras.objects.create(entry=e, data={"POTA_REF": "K-1234"})
+    assert filter_extras(LogEntryExtras.objects.all(), "POTA_REF", "K-1234").count() == 2
+
+
+@pytest.mark.django_db
+@pytest.mark.skipif(connection.vendor not in ("sqlite", "postgresql"), reason="generated columns")
+def test_promotion_from_another_process_is_picked_up(imported, monkeypatch):
+    assert promoted_columns() == {}
+    # The management command clears only its own process's cache
+    monkeypatch.setattr("logbook.extras_usage.clear_promoted_cache", lambda: None)
+    promote("POTA_REF")
+    assert promoted_columns() == {"POTA_REF": "x_pota_ref"}
+
+
+@pytest.mark.django_db(transaction=True)
+@pytest.mark.skipif(connection.vendor != "postgresql", reason="CREATE INDEX CONCURRENTLY is PostgreSQL only")
+def test_promote_builds_the_index_concurrently(imported):
+    with CaptureQueriesContext(connection) as ctx:
+        promote("POTA_REF")
+    assert any(q["sql"].startswith("CREATE INDEX CONCURRENTLY") for q in ctx.captured_queries)
+
+
+@pytest.mark.django_db
+def test_promote_rejects_bad_tags():
+    with pytest.raises(ValueError):
+        promote("POTA_REF') --")
+
+
+@pytest.mark.django_db
+@pytest.mark.skipif(connection.vendor not in ("sqlite", "postgresql"), reason="generated columns")
+def test_command_promotes_most_searched(capsys, imported):
+    ExtrasTagUsage.objects.filter(tag="WWFF_REF").update(filter_count=5)
+    call_command("promote_extras_tags", "--top", "1")
+    assert promoted_columns() == {"WWFF_REF": "x_wwff_ref"}
+    call_command("promote_extras_tags", "--list")
+    assert "-> x_wwff_ref" in capsys.readouterr().out
@@ -0,0 +1,42 @@
+import datetime as dt
+
+import pytest
+
+from logbook.imports import finalize_import
+from logbook.models import LogEntry, LogImport, StagedEntry
+
+
+def _staged(imp, callsign, **extra):
+    return StagedEntry.objects.create(
+        imp=imp, callsign=callsign, qso_date=dt.date(2024, 1, 1), time_on=dt.time(12, 0), band="20m", mode="SSB", **extra
+    )
+
+
+@pytest.mark.django_db
+def test_finalize_batches_validate_and_link_extras():
+    imp = LogImport.objects.create(kind=LogImport.KIND_FILE, format=LogImport.FORMAT_ADIF)
+    _staged(imp, "k1abc", extras={"POTA_REF": "K-1234"})
+    _staged(imp, "/BAD/")
+    _staged(imp, "F4JAW")
+    seen = []
+
+    created = finalize_import(imp, batch_size=2, progress=seen.append)
+
+    assert created == 2
+    assert seen == [2, 3]
+    assert imp.meta["finalize"]["skipped"] == 1
+    k1 = LogEntry.objects.get(callsign="K1ABC")
+    assert k1.upload_id == imp.pk
+    assert k1.extras.data == {"POTA_REF": "K-1234"}
+
+
+@pytest.mark.django_db
+def test_finalize_resumes_from_checkpoint():
+    imp = LogImport.objects.create(kind=LogImport.KIND_FILE, format=LogImport.FORMAT_ADIF)
+    first = _staged(imp, "K1ABC")
+    _staged(imp, "F4JAW")
+    imp.meta = {"finalize": {"cursor": first.pk, "created": 1, "skipped": 0}}
+    imp.save()
+
+    assert finalize_import(imp) == 2
+    assert list(LogEntry.objects.values_list("callsign", flat=True)) == ["F4JAW"]
@@ -0,0 +1,83 @@
+import datetime as dt
+
+import pytest
+from django.urls import reverse
+
+from logbook.import_stats import META_KEY, import_stats
+from logbook.imports import stage_records
+from logbook.models import LogEntry, LogImport
+
+RECORDS = [
+    {"CALL": "F4JAW", "QSO_DATE": "20240105", "TIME_ON": "1200", "BAND": "20m", "MODE": "CW", "STATION_CALLSIGN": "K1ABC", "DXCC": "227"},
+    {"CALL": "DL1ABC", "QSO_DATE": "20231231", "TIME_ON": "1300", "BAND": "40m", "MODE": "SSB", "STATION_CALLSIGN": "K1ABC", "DXCC": "230"},
+    {"CALL": "G4ABC", "QSO_DATE": "20240301", "TIME_ON": "1400", "BAND": "20m", "MODE": "CW", "DXCC": "223"},
+    {"CALL": "/BAD", "QSO_DATE": "20240302", "TIME_ON": "1500", "BAND": "20m", "MODE": "CW", "DXCC": "1"},
+]
+
+
+@pytest.fixture
+def imp():
+    LogEntry.objects.create(callsign="F5XYZ", qso_date=dt.date(2023, 1, 1), time_on=dt.time(9, 0), band="20m", mode="CW", dxcc=227)
+    imp = LogImport.objects.create(kind=LogImport.KIND_FILE, format=LogImport.FORMAT_ADIF)
+    stage_records(imp, iter(RECORDS), batch_size=2)
+    return LogImport.objects.get(pk=imp.pk)
+
+
+@pytest.mark.django_db
+def test_staging_accumulates_stats(imp):
+    stats = imp.meta[META_KEY]
+    assert stats["bands"] == {"20m": 3, "40m": 1}
+    assert stats["modes"] == {"CW": 3, "SSB": 1}
+    assert stats["stations"] == {"K1ABC": 2, "": 2}
+    assert (stats["first_date"], stats["last_date"]) == ("2023-12-31", "2024-03-02")
+    assert stats["errors"] == {"callsign:slash": 1}
+    # DXCC 1 only comes from the invalid row; 227 is already in the logbook
+    assert stats["dxcc"] == [223, 227, 230]
+    assert stats["new_dxcc"] == [223, 230]
+
+
+@pytest.mark.django_db
+def test_stats_backfilled_for_older_imports(imp):
+    expected = imp.meta.pop(META_KEY)
+    LogImport.objects.filter(pk=imp.pk).update(meta=imp.meta)
+    assert import_stats(imp) == expected
+    assert LogImport.objects.get(pk=imp.pk).meta[META_KEY] == expected
+
+
+@pytest.mark.django_db
+def test_review_header_shows_stats(client, imp, django_assert_max_num_queries):
+    with django_assert_max_num_queries(6):
+        resp = client.get(reverse("logbook:import_review", args=[imp.pk]))
+    stats = resp.context["stats"]
+    assert stats["bands"] == [("20m", 3), ("40m", 1)]
+    assert stats["stations"] == [("(none)", 2), ("K1ABC", 2)]
+    html = resp.content.decode()
+    assert "2023-12-31 – 2024-03-02" in html
+    assert "callsign: Callsign must not begin or end with &#x27;/&#x27; (1)" in html
+    assert "223, 230" in html
+
+
+@pytest.mark.django_db
+def test_rejected_records_count_as_an_error_reason(client):
+    imp = LogImport.objects.create(kind=LogImport.KIND_FILE, format=LogImport.FORMAT_ADIF)
+    records = RECORDS + [{"CALL": "K2ABC", "QSO_DATE": "20240101"}, {"CALL": "K3ABC", "QSO_DATE": "2024", "TIME_ON": "1200"}]
+    ok, err = stage_records(imp, iter(records), batch_size=2)
+    assert err == 2
+    assert imp.meta[META_KEY]["errors"] == {"callsign:slash": 1, "record:missing_required": 2}
+    LogImport.objects.filter(pk=imp.pk).update(error_count=err)
+
+    resp = client.get(reverse("logbook:import_review", args=[imp.pk]))
+    assert ("record: CALL, QSO_DATE or TIME_ON missing or unreadable; record not staged", 2) in resp.context["stats"]["errors"]
+    assert sum(n for _, n in resp.context["stats"]["errors"]) == err + resp.context["invalid_count"]
+
+
+@pytest.mark.django_db
+def test_editing_a_staged_row_rebuilds_the_error_breakdown(client, imp):
+    bad = imp.staged_entries.get(callsign="/BAD")
+    bad.callsign = "G5ABC"
+    bad.errors = []
+    bad.save()
+    resp = client.get(reverse("logbook:import_review", args=[imp.pk]))
+    assert resp.context["invalid_count"] == 0
+    assert resp.context["stats"]["errors"] == []
+    assert LogImport.objects.get(pk=imp.pk).meta[META_KEY]["errors"] == {}
@@ -0,0 +1,31 @@
+import gzip
+import hashlib
+
+import pytest
+from django.core.files.uploadedfile import SimpleUploadedFile
+from django.test import override_settings
+from django.urls import reverse
+
+from logbook.models import LogImport
+
+
+ADIF = (
+    b"<ADIF_VER:5>3.1.5<EOH>\n"
+    b"<CALL:5>K1ABC<QSO_DATE:8>20240101<TIME_ON:4>1234<BAND:3>20m<MODE:3>SSB<EOR>\n"
+    b"<CALL:5>F4JAW<QSO_DATE:8>20240102<TIME_ON:4>0102<BAND:3>40m<MODE:2>CW<POTA_REF:6>K-1234<EOR>\n"
+    b"<QSO_DATE:8>20240102<TIME_ON:4>0102<BAND:3>40m<MODE:2>CW<EOR>\n"
+)
+
+
+@pytest.mark.django_db
+@override_settings(LOGHUB_IMPORT_CHUNK_SIZE=16)
+def test_upload_is_hashed_compressed_and_staged_in_one_pass(client):
+    upload = SimpleUploadedFile("log.adi", ADIF, content_type="text/plain")
+    resp = client.post(reverse("logbook:import_new"), {"file": upload})
+    assert resp.status_code == 302
+    imp = LogImport.objects.get()
+    assert imp.size_bytes == len(ADIF)
+    assert imp.sha256 == hashlib.sha256(ADIF).hexdigest()
+    assert gzip.decompress(bytes(imp.content_gz)) == ADIF
+    assert (imp.entry_count, imp.error_count) == (2, 1)
+    assert imp.staged_entries.get(callsign="F4JAW").extras == {"POTA_REF": "K-1234"}
@@ -0,0 +1,79 @@
+import gzip
+
+import pytest
+from django.core.files.uploadedfile import SimpleUploadedFile
+from django.core.management import call_command
+from django.test import override_settings
+from django.urls import reverse
+
+from logbook import imports
+from logbook.imports import compute_sha256
+from logbook.jobs import claim_next_import, run_import_job
+from logbook.models import LogEntry, LogImport
+
+
+ADIF = (
+    b"<ADIF_VER:5>3.1.5<EOH>\n"
+    b"<CALL:5>K1ABC<QSO_DATE:8>20240101<TIME_ON:4>1234<BAND:3>20m<MODE:3>SSB<EOR>\n"
+    b"<CALL:5>F4JAW<QSO_DATE:8>20240102<TIME_ON:4>0102<BAND:3>40m<MODE:2>CW<EOR>\n"
+)
+
+
+@pytest.mark.django_db
+@override_settings(LOGHUB_IMPORT_INLINE_MAX_BYTES=0)
+def test_large_upload_is_parsed_and_finalized_by_worker(client):
+    client.post(reverse("logbook:import_new"), {"file": SimpleUploadedFile("big.adi", ADIF)})
+    imp = LogImport.objects.get()
+    assert imp.status == LogImport.STATUS_PARSING
+    assert imp.staged_entries.count() == 0
+
+    resp = client.get(reverse("logbook:import_progress", args=[imp.pk]))
+    assert b"Parsing" in resp.content and b"hx-get" in resp.content
+
+    call_command("import_worker", "--once")
+    imp.refresh_from_db()
+    assert imp.status == LogImport.STATUS_PENDING
+    assert (imp.entry_count, imp.processed_bytes, imp.total_records) == (2, len(ADIF), 2)
+    assert imp.claimed_by == ""
+
+    client.post(reverse("logbook:import_confirm", args=[imp.pk]))
+    imp.refresh_from_db()
+    assert imp.status == LogImport.STATUS_FINALIZING
+    call_command("import_worker", "--once")
+    imp.refresh_from_db()
+    assert imp.status == LogImport.STATUS_DONE
+    assert LogEntry.objects.filter(upload=imp).count() == 2
+
+
+@pytest.mark.django_db
+def test_claimed_import_is_not_claimed_twice():
+    LogImport.objects.create(kind=LogImport.KIND_FILE, format=LogImport.FORMAT_ADIF, status=LogImport.STATUS_PARSING)
+    assert claim_next_import("w1") is not None
+    assert claim_next_import("w2") is None
+    assert claim_next_import("w2", lease_seconds=-1).claimed_by == "w2"
+
+
+@pytest.mark.django_db
+@override_settings(LOGHUB_STAGING_BATCH_SIZE=1)
+def test_taken_over_import_is_not_written_to(monkeypatch):
+    LogImport.objects.create(
+        kind=LogImport.KIND_FILE, format=LogImport.FORMAT_ADIF, status=LogImport.STATUS_PARSING,
+        content_gz=gzip.compress(ADIF), sha256=compute_sha256(ADIF), size_bytes=len(ADIF),
+    )
+    imp = claim_next_import("w1")
+    classify_rows = imports.classify_rows
+    calls = []
+
+    def take_over(rows):
+        # Another worker claims the import and clears it while w1 parses batch 2
+        calls.append(1)
+        if len(calls) == 2:
+            LogImport.objects.filter(pk=imp.pk).update(claimed_by="w2")
+            imp.staged_entries.all().delete()
+        return classify_rows(rows)
+
+    monkeypatch.setattr(imports, "classify_rows", take_over)
+    run_import_job(imp, "w1")
+    imp.refresh_from_db()
+    assert (imp.status, imp.claimed_by) == (LogImport.STATUS_PARSING, "w2")
+    assert imp.staged_entries.count() == 0
@@ -0,0 +1,104 @@
+import pytest
+from django.core.management import call_command
+from django.db import connection
+from django.urls import reverse
+
+from logbook.adif import iter_adif_values, queryset_to_adif
+from logbook.checks import check_extras_store
+from logbook.extras_usage import clear_promoted_cache, promote
+from logbook.filters import filter_entries
+from logbook.imports import finalize_import, parse_adif_to_staged
+from logbook.models import LogEntry, LogEntryExtras, LogImport
+
+ADIF = (
+    "<CALL:5>F4JAW<QSO_DATE:8>20240101<TIME_ON:4>1200<BAND:3>20m<MODE:2>CW<POTA_REF:6>K-1234<STATE:2>MA<EOR>"
+    "<CALL:5>K1ABC<QSO_DATE:8>20240101<TIME_ON:4>1300<BAND:3>20m<MODE:2>CW<EOR>"
+)
+
+
+@pytest.fixture
+def inline(settings):
+    settings.LOGHUB_INLINE_EXTRAS = True
+    clear_promoted_cache()
+    yield
+    clear_promoted_cache()
+
+
+def _import():
+    imp = LogImport.objects.create(kind=LogImport.KIND_FILE, format=LogImport.FORMAT_ADIF)
+    parse_adif_to_staged(imp, ADIF)
+    finalize_import(imp)
+    return LogEntry.objects.get(callsign="F4JAW")
+
+
+@pytest.mark.django_db
+def test_finalize_stores_extras_inline(inline, client, django_assert_num_queries):
+    entry = _import()
+    assert not LogEntryExtras.objects.exists()
+    assert entry.extras_data == {"POTA_REF": "K-1234", "STATE": "MA"}
+    with django_assert_num_queries(1):
+        entry = LogEntry.objects.get(pk=entry.pk)
+        assert entry.get_extras()["POTA_REF"] == "K-1234"
+    assert b"K-1234" in client.get(reverse("logbook:detail", args=[entry.pk])).content
+
+
+@pytest.mark.django_db
+def test_export_and_filters_match_table_store(settings):
+    entry = _import()
+    qs = LogEntry.objects.order_by("callsign")
+    expected = queryset_to_adif(qs)
+    assert "".join(iter_adif_values(qs)) == expected
+    expected_calls = list(filter_entries(qs, extra_tag="STATE", extra_value="MA"))
+
+    call_command("move_extras", "--to", "inline")
+    settings.LOGHUB_INLINE_EXTRAS = True
+    assert LogEntry.objects.get(pk=entry.pk).extras_data == {"POTA_REF": "K-1234", "STATE": "MA"}
+    assert queryset_to_adif(qs) == expected
+    assert "".join(iter_adif_values(qs)) == expected
+    assert "logbook_logentryextras" not in str(qs.values_list("extras_data").query)
+    assert list(filter_entries(qs, extra_tag="STATE", extra_value="MA")) == expected_calls
+
+    call_command("move_extras", "--to", "table")
+    settings.LOGHUB_INLINE_EXTRAS = False
+    assert LogEntryExtras.objects.get(entry=entry).data == {"POTA_REF": "K-1234", "STATE": "MA"}
+    assert LogEntry.objects.get(pk=entry.pk).extras_data == {}
+
+
+@pytest.mark.django_db
+def test_update_view_writes_inline(inline, client):
+    entry = _import()
+    form = {
+        "callsign": "F4JAW", "qso_date": "2024-01-01", "time_on": "12:00", "band": "20m", "mode": "CW",
+        "extra_key": ["WWFF_REF"], "extra_val": ["KFF-1234"],
+    }
+    resp = client.post(reverse("logbook:update", args=[entry.pk]), form)
+    assert resp.status_code == 302
+    assert LogEntry.objects.get(pk=entry.pk).extras_data == {"WWFF_REF": "KFF-1234"}
+    assert not LogEntryExtras.objects.exists()
+
+
+@pytest.mark.django_db
+@pytest.mark.skipif(connection.vendor not in ("sqlite", "postgresql"), reason="generated columns")
+def test_promoted_tag_on_inline_column(inline):
+    _import()
+    assert promote("POTA_REF") == "x_pota_ref"
+    qs = filter_entries(LogEntry.objects.all(), extra_tag="POTA_REF", extra_value="K-1234")
+    assert '"logbook_logentry"."x_pota_ref"' in str(qs.query)
+    assert [e.callsign for e in qs] == ["F4JAW"]
+
+
+@pytest.mark.django_db
+def test_extras_in_the_other_store_are_read_and_flagged(settings):
+    entry = _import()
+    assert not check_extras_store(None, databases=["default"])
+    # Store switched to inline before `move_extras` ran
+    settings.LOGHUB_INLINE_EXTRAS = True
+    entry = LogEntry.objects.get(pk=entry.pk)
+    assert entry.get_extras() == {"POTA_REF": "K-1234", "STATE": "MA"}
+    assert [w.id for w in check_extras_store(None, databases=["default"])] == ["logbook.W001"]
+
+    # An edit in the meantime is not overwritten by the move
+    entry.set_extras({"POTA_REF": "K-5678"})
+    call_command("move_extras")
+    assert LogEntry.objects.get(pk=entry.pk).get_extras() == {"POTA_REF": "K-5678"}
+    assert not check_extras_store(None, databases=["default"])
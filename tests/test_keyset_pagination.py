@@ -0,0 +1,80 @@
+import datetime as dt
+import re
+
+import pytest
+from django.db import connection
+from django.urls import reverse
+
+from logbook.models import LogEntry
+from logbook.pagination import _key, _seek
+from logbook.views import LogEntryListView
+
+
+@pytest.fixture
+def entries():
+    # Ties on date, time and callsign so the id tiebreaker matters
+    for i in range(23):
+        LogEntry.objects.create(
+            callsign=f"K{i % 3}ABC", qso_date=dt.date(2024, 1, 1 + i % 4), time_on=dt.time(12, i % 2), band="20m", mode="CW"
+        )
+    return list(LogEntry.objects.order_by("-qso_date", "-time_on", "callsign", "id").values_list("pk", flat=True))
+
+
+def _page(client, **params):
+    resp = client.get(reverse("logbook:list"), params)
+    page = resp.context["page_obj"]
+    return [e.pk for e in resp.context["object_list"]], page
+
+
+@pytest.mark.django_db
+def test_walk_forward_and_back(client, entries, monkeypatch, django_assert_num_queries):
+    monkeypatch.setattr(LogEntryListView, "paginate_by", 5)
+    pages = []
+    pks, page = _page(client)
+    assert not page.has_previous()
+    pages.append(pks)
+    while page.has_next():
+        with django_assert_num_queries(1):
+            pks, page = _page(client, after=page.next_cursor)
+        pages.append(pks)
+    assert [pk for p in pages for pk in p] == entries
+    assert [len(p) for p in pages] == [5, 5, 5, 5, 3]
+
+    for expected in reversed(pages[:-1]):
+        pks, page = _page(client, before=page.prev_cursor)
+        assert pks == expected
+    assert not page.has_previous()
+
+
+@pytest.mark.django_db
+def test_bad_cursor_falls_back_to_first_page(client, entries):
+    pks, page = _page(client, after="not-a-cursor")
+    assert pks == entries[:25] and not page.has_previous()
+
+
+@pytest.mark.django_db
+def test_htmx_gets_page_fragment(client, entries, monkeypatch):
+    monkeypatch.setattr(LogEntryListView, "paginate_by", 5)
+    resp = client.get(reverse("logbook:list"), HTTP_HX_REQUEST="true")
+    html = resp.content.decode()
+    assert html.lstrip().startswith('<div id="logbook-page">')
+    assert re.search(r'hx-get="\?after=[\w-]+"', html)
+
+
+@pytest.mark.django_db
+@pytest.mark.skipif(connection.vendor not in ("sqlite", "postgresql"), reason="plan text is backend specific")
+def test_seek_starts_index_scan_at_cursor(entries):
+    ordering = LogEntryListView.ordering
+    cursor = LogEntry.objects.order_by(*ordering)[5]
+    qs = LogEntry.objects.filter(_seek(ordering, _key(cursor, ordering))).order_by(*ordering)[:6]
+    sql, params = qs.query.sql_with_params()
+    with connection.cursor() as c:
+        if connection.vendor == "postgresql":
+            c.execute("SET enable_seqscan = off")
+            c.execute(f"EXPLAIN {sql}", params)
+            plan = "\n".join(row[0] for row in c.fetchall())
+            assert "qso_list_order_idx" in plan and re.search(r"Index Cond: .*qso_date", plan)
+        else:
+            c.execute(f"EXPLAIN QUERY PLAN {sql}", params)
+            plan = "\n".join(row[-1] for row in c.fetchall())
+            assert "USING INDEX qso_list_order_idx (qso_date<?)" in plan
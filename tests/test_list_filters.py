@@ -0,0 +1,89 @@
+import datetime as dt
+import importlib
+
+import pytest
+from django.apps import apps as django_apps
+from django.urls import reverse
+
+from logbook.imports import finalize_import, parse_adif_to_staged
+from logbook.models import LogbookRevision, LogEntry, LogImport
+
+
+@pytest.fixture
+def entries():
+    rows = [
+        ("F4JAW", "20m", "CW", 1, "F4XYZ", 227, "JN18ab"),
+        ("F5ABC", "40m", "SSB", 2, "F4XYZ", 227, "JN19"),
+        ("K1JAW", "20m", "FT8", 3, "W1AW", 291, "FN31pr"),
+        ("EA4JAW", "20m", "CW", 4, "W1AW", 281, "IN80"),
+    ]
+    for call, band, mode, day, station, dxcc, grid in rows:
+        LogEntry.objects.create(
+            callsign=call, band=band, mode=mode, qso_date=dt.date(2024, 1, day), time_on=dt.time(12, 0),
+            station_callsign=station, dxcc=dxcc, gridsquare=grid,
+        )
+
+
+def _calls(client, **params):
+    resp = client.get(reverse("logbook:list"), params)
+    assert resp.status_code == 200
+    return sorted(e.callsign for e in resp.context["object_list"])
+
+
+@pytest.mark.django_db
+def test_list_filters(client, entries):
+    assert _calls(client, call="f4") == ["F4JAW"]
+    assert _calls(client, call="jaw", match="contains") == ["EA4JAW", "F4JAW", "K1JAW"]
+    assert _calls(client, band="20m", mode="cw") == ["EA4JAW", "F4JAW"]
+    assert _calls(client, date_from="2024-01-02", date_to="2024-01-03") == ["F5ABC", "K1JAW"]
+    assert _calls(client, station="w1aw") == ["EA4JAW", "K1JAW"]
+    assert _calls(client, dxcc=227) == ["F4JAW", "F5ABC"]
+    assert _calls(client, grid="jn18") == ["F4JAW"]
+
+
+@pytest.mark.django_db
+def test_invalid_filter_is_reported_and_ignored(client, entries):
+    resp = client.get(reverse("logbook:list"), {"band": "11m", "mode": "CW"})
+    assert resp.context["filter_form"].errors.get("band")
+    assert sorted(e.callsign for e in resp.context["object_list"]) == ["EA4JAW", "F4JAW"]
+
+
+@pytest.mark.django_db
+def test_invalid_filter_is_reported_to_live_filtering(client, entries):
+    resp = client.get(reverse("logbook:list"), {"extra_tag": "POTA-REF", "dxcc": "x"}, HTTP_HX_REQUEST="true")
+    assert [t.name for t in resp.templates][0] == "logbook/logentry_page.html"
+    html = resp.content.decode()
+    assert "ADIF tags contain only letters, digits and &#x27;_&#x27;" in html
+    assert "dxcc: Enter a whole number." in html
+
+
+@pytest.mark.django_db
+def test_page_links_keep_filters(client, entries, monkeypatch):
+    from logbook.views import LogEntryListView
+
+    monkeypatch.setattr(LogEntryListView, "paginate_by", 1)
+    resp = client.get(reverse("logbook:list"), {"band": "20m"}, HTTP_HX_REQUEST="true")
+    assert resp.context["filter_query"] == "band=20m"
+    assert 'hx-get="?band=20m&after=' in resp.content.decode()
+
+
+@pytest.mark.django_db
+def test_band_and_mode_case_is_normalized_on_write(client):
+    imp = LogImport.objects.create(kind=LogImport.KIND_FILE, format=LogImport.FORMAT_ADIF)
+    parse_adif_to_staged(imp, "<CALL:5>F4JAW<QSO_DATE:8>20240101<TIME_ON:4>1200<BAND:3>20M<BAND_RX:4>70CM<MODE:2>cw<EOR>")
+    finalize_import(imp)
+    LogEntry.objects.create(callsign="K1ABC", band="40M", mode="ssb", qso_date=dt.date(2024, 1, 2), time_on=dt.time(12, 0))
+    assert sorted(LogEntry.objects.values_list("band", "band_rx", "mode")) == [("20m", "70cm", "CW"), ("40m", "", "SSB")]
+    assert _calls(client, band="20m") == ["F4JAW"]
+    assert _calls(client, mode="ssb") == ["K1ABC"]
+
+
+@pytest.mark.django_db
+def test_migration_normalizes_existing_rows():
+    migration = importlib.import_module("logbook.migrations.0015_normalize_band_mode_case")
+    e = LogEntry.objects.create(callsign="K1ABC", band="20m", mode="CW", qso_date=dt.date(2024, 1, 2), time_on=dt.time(12, 0))
+    LogEntry.objects.filter(pk=e.pk).update(band="20M", mode="cw")
+    revision = LogbookRevision.current()
+    migration.normalize_case(django_apps, None)
+    assert LogEntry.objects.values_list("band", "mode").get(pk=e.pk) == ("20m", "CW")
+    assert LogbookRevision.current() == revision + 1
@@ -0,0 +1,84 @@
+import pytest
+from django.core.files.uploadedfile import SimpleUploadedFile
+from django.test import override_settings
+from django.urls import reverse
+
+from logbook.dedup import record_fingerprint
+from logbook.imports import finalize_import, parse_adif_to_staged
+from logbook.models import LogEntry, LogImport
+
+
+DAY1 = (
+    "<CALL:5>K1ABC<QSO_DATE:8>20240101<TIME_ON:4>1234<BAND:3>20m<MODE:3>SSB<EOR>"
+    "<CALL:5>F4JAW<QSO_DATE:8>20240102<TIME_ON:4>0102<BAND:3>40m<MODE:2>CW<EOR>"
+)
+DAY2 = DAY1 + "<CALL:5>G0XYZ<QSO_DATE:8>20240103<TIME_ON:4>0800<BAND:3>15m<MODE:3>FT8<EOR>"
+
+
+def test_fingerprint_ignores_tag_order_case_and_blanks():
+    a = record_fingerprint({"CALL": "K1ABC", "BAND": "20m", "NOTES": ""})
+    assert a == record_fingerprint({"band": "20m ", "call": "K1ABC"})
+    assert a != record_fingerprint({"CALL": "K1ABC", "BAND": "40m"})
+
+
+@pytest.mark.django_db
+def test_overlapping_import_stages_only_new_records():
+    first = LogImport.objects.create(kind=LogImport.KIND_FILE, format=LogImport.FORMAT_ADIF)
+    assert parse_adif_to_staged(first, DAY1) == (2, 0)
+    assert finalize_import(first) == 2
+    assert LogEntry.objects.exclude(fingerprint="").count() == 2
+
+    second = LogImport.objects.create(kind=LogImport.KIND_FILE, format=LogImport.FORMAT_ADIF)
+    assert parse_adif_to_staged(second, DAY2) == (1, 0)
+    assert second.skipped_count == 2
+    assert list(second.staged_entries.values_list("callsign", flat=True)) == ["G0XYZ"]
+
+
+@pytest.mark.django_db
+def test_finalize_skips_records_imported_meanwhile():
+    a = LogImport.objects.create(kind=LogImport.KIND_FILE, format=LogImport.FORMAT_ADIF)
+    b = LogImport.objects.create(kind=LogImport.KIND_FILE, format=LogImport.FORMAT_ADIF)
+    parse_adif_to_staged(a, DAY1)
+    parse_adif_to_staged(b, DAY2)
+    assert finalize_import(a) == 2
+    assert finalize_import(b) == 1
+    assert LogEntry.objects.count() == 3
+
+
+@pytest.mark.django_db
+def test_same_file_upload_redirects_to_earlier_import(client):
+    data = DAY1.encode()
+    client.post(reverse("logbook:import_new"), {"file": SimpleUploadedFile("a.adi", data)})
+    imp = LogImport.objects.get()
+    resp = client.post(reverse("logbook:import_new"), {"file": SimpleUploadedFile("b.adi", data)})
+    assert resp.status_code == 302
+    assert resp["Location"] == reverse("logbook:import_review", args=[imp.pk]) + "?reupload=1"
+    assert LogImport.objects.count() == 1
+
+    # A cancelled import does not block uploading the file again
+    LogImport.objects.filter(pk=imp.pk).update(status=LogImport.STATUS_CANCELLED)
+    client.post(reverse("logbook:import_new"), {"file": SimpleUploadedFile("b.adi", data)})
+    assert LogImport.objects.count() == 2
+
+
+@pytest.mark.django_db
+@override_settings(LOGHUB_STAGING_BATCH_SIZE=1)
+def test_record_repeated_in_one_file_is_imported_once():
+    record = DAY1[: DAY1.index("<EOR>") + 5]
+    imp = LogImport.objects.create(kind=LogImport.KIND_FILE, format=LogImport.FORMAT_ADIF)
+    assert parse_adif_to_staged(imp, record + record) == (1, 0)
+    assert imp.skipped_count == 1
+    assert finalize_import(imp) == 1
+
+
+@pytest.mark.django_db
+def test_finalize_skips_repeats_staged_in_the_same_batch():
+    record = DAY1[: DAY1.index("<EOR>") + 5]
+    imp = LogImport.objects.create(kind=LogImport.KIND_FILE, format=LogImport.FORMAT_ADIF)
+    parse_adif_to_staged(imp, record)
+    # Staged before in-file repeats were dropped at staging
+    se = imp.staged_entries.get()
+    se.pk = None
+    se.save()
+    assert finalize_import(imp) == 1
+    assert LogEntry.objects.count() == 1
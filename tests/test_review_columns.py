@@ -0,0 +1,70 @@
+import pytest
+from django.db import connection
+from django.test.utils import CaptureQueriesContext
+from django.urls import reverse
+
+from logbook.imports import parse_adif_to_staged
+from logbook.models import LogImport
+from logbook.review_columns import META_KEY, review_summary
+
+ADIF = (
+    "<CALL:5>F4JAW<QSO_DATE:8>20240101<TIME_ON:4>1200<BAND:3>20m<MODE:2>CW<GRIDSQUARE:4>JN18<POTA_REF:6>K-1234<EOR>"
+    "<CALL:6>/K1ABC<QSO_DATE:8>20240101<TIME_ON:4>1300<BAND:3>20m<MODE:2>CW<STATE:0><EOR>"
+)
+
+
+def _staged():
+    imp = LogImport.objects.create(kind=LogImport.KIND_FILE, format=LogImport.FORMAT_ADIF)
+    parse_adif_to_staged(imp, ADIF)
+    return LogImport.objects.get(pk=imp.pk)
+
+
+@pytest.mark.django_db
+def test_staging_saves_review_summary():
+    summary = _staged().meta[META_KEY]
+    assert summary["extras"] == ["POTA_REF"]
+    assert {"callsign", "band", "mode", "gridsquare"} <= set(summary["core"])
+    assert "rst_sent" not in summary["core"] and "fingerprint" not in summary["core"]
+    assert summary["invalid"] == 1
+    assert summary["dupes"] == {"new": 2}
+
+
+@pytest.mark.django_db
+def test_review_page_does_not_rescan_import(client):
+    imp = _staged()
+    with CaptureQueriesContext(connection) as ctx:
+        resp = client.get(reverse("logbook:import_review", args=[imp.pk]))
+    labels = [label for _, label in resp.context["columns"]]
+    assert {"Gridsquare", "POTA REF", "Errors"} <= set(labels)
+    assert resp.context["invalid_count"] == 1
+    assert resp.context["dupe_filters"][0] == ("new", "New", 2)
+    staged_reads = [q["sql"] for q in ctx.captured_queries if '"logbook_stagedentry"."extras"' in q["sql"]]
+    assert staged_reads and all("LIMIT" in sql for sql in staged_reads)
+    assert not any("GROUP BY" in q["sql"] for q in ctx.captured_queries)
+
+
+@pytest.mark.django_db
+def test_summary_backfilled_once_for_older_imports():
+    imp = _staged()
+    expected = imp.meta.pop(META_KEY)
+    LogImport.objects.filter(pk=imp.pk).update(meta=imp.meta)
+    summary = review_summary(imp)
+    assert summary.pop("rev") != expected.pop("rev")
+    assert summary == expected
+    assert LogImport.objects.get(pk=imp.pk).meta[META_KEY]["core"] == expected["core"]
+
+
+@pytest.mark.django_db
+def test_saved_staged_row_updates_summary():
+    imp = _staged()
+    entry = imp.staged_entries.get(callsign="F4JAW")
+    entry.rst_sent = "599"
+    entry.extras = {**entry.extras, "WWFF_REF": "KFF-1234"}
+    entry.save()
+    imp.refresh_from_db()
+    summary = imp.meta[META_KEY]
+    assert "rst_sent" in summary["core"]
+    assert summary["extras"] == ["POTA_REF", "WWFF_REF"]
+    assert "invalid" not in summary and "dupes" not in summary
+    recounted = review_summary(imp)
+    assert (recounted["invalid"], recounted["dupes"]) == (1, {"new": 2})
@@ -0,0 +1,59 @@
+import pytest
+from django.db import connection
+from django.template import Context, Template
+from django.test.utils import CaptureQueriesContext
+from django.urls import reverse
+from django.utils.html import escape
+
+from logbook.imports import parse_adif_to_staged
+from logbook.models import LogImport
+from logbook.review_rows import display_rows
+
+ADIF = (
+    "<CALL:5>F4JAW<QSO_DATE:8>20240101<TIME_ON:6>123456<BAND:3>20m<MODE:2>CW<FREQ:9>14.025000"
+    "<STATION_CALLSIGN:5>K1ABC<POTA_REF:6>K-1234<QSLRDATE:8>20240105<EOR>"
+    "<CALL:6>/K1ABC<QSO_DATE:8>20240101<TIME_ON:4>1300<BAND:3>20m<MODE:2>CW<RST_SENT:3>599<EOR>"
+)
+
+
+@pytest.fixture
+def imp():
+    imp = LogImport.objects.create(kind=LogImport.KIND_FILE, format=LogImport.FORMAT_ADIF)
+    parse_adif_to_staged(imp, ADIF)
+    return imp
+
+
+@pytest.mark.django_db
+def test_display_rows_match_template_filters(imp):
+    columns = [(name, name) for name in ("errors", "operator_display", "callsign", "qso_date", "time_on", "freq", "rst_sent", "POTA_REF", "QSLRDATE")]
+    entries = list(imp.staged_entries.order_by("pk"))
+    cell = Template("{% load logbook_extras %}{{ e|value_for:field|zulu }}")
+    for row, e in zip(display_rows(entries, columns), entries):
+        expected = [cell.render(Context({"e": e, "field": name})) for name, _ in columns]
+        # The filters rendered missing core values as "None"
+        assert [escape(v) for v in row] == [v if v != "None" else "" for v in expected]
+    assert display_rows(entries[:1], columns)[0][2:5] == ["F4JAW", "2024-01-01", "12:34:56Z"]
+
+
+def _table(resp):
+    html = resp.content.decode()
+    return html[html.index("<table>") : html.index("</table>")]
+
+
+@pytest.mark.django_db
+def test_review_table_is_cached_per_page(client, imp):
+    url = reverse("logbook:import_review", args=[imp.pk])
+    with CaptureQueriesContext(connection) as cold:
+        first = client.get(url)
+    assert "K-1234" in first.content.decode()
+    with CaptureQueriesContext(connection) as warm:
+        second = client.get(url)
+    assert _table(second) == _table(first)
+    # The cached fragment skips the page's row query
+    assert len(warm) == len(cold) - 1
+    assert not any('"logbook_stagedentry"."extras"' in q["sql"] for q in warm.captured_queries)
+
+    entry = imp.staged_entries.get(callsign="F4JAW")
+    entry.extras = {**entry.extras, "POTA_REF": "K-5678"}
+    entry.save()
+    assert "K-5678" in client.get(url).content.decode()
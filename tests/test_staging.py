@@ -0,0 +1,59 @@
+import datetime as dt
+from decimal import Decimal
+
+import pytest
+from django.db import connection
+from django.test.utils import CaptureQueriesContext
+
+from logbook.imports import parse_adif_records, parse_adif_to_staged, stage_records
+from logbook.models import LogImport
+
+
+ADIF = (
+    "<CALL:5>K1ABC<QSO_DATE:8>20240101<TIME_ON:4>1234<FREQ:6>14.074<MODE:3>FT8<POTA_REF:6>K-1234<EOR>\n"
+    "<CALL:5>F4JAW<QSO_DATE:8>20240102<TIME_ON:6>010203<BAND:3>40m<MODE:2>CW<EOR>\n"
+    "<QSO_DATE:8>20240102<TIME_ON:4>0102<BAND:3>40m<MODE:2>CW<EOR>\n"
+)
+
+
+@pytest.mark.django_db
+def test_parse_adif_to_staged_casts_core_fields_and_keeps_extras():
+    imp = LogImport.objects.create(kind=LogImport.KIND_FILE, format=LogImport.FORMAT_ADIF)
+    assert parse_adif_to_staged(imp, ADIF) == (2, 1)
+    k1 = imp.staged_entries.get(callsign="K1ABC")
+    assert k1.freq == Decimal("14.074")
+    assert k1.time_on == dt.time(12, 34)
+    assert k1.extras == {"POTA_REF": "K-1234"}
+    f4 = imp.staged_entries.get(callsign="F4JAW")
+    assert f4.extras == {}
+    assert f4.submode == ""
+
+
+@pytest.mark.django_db
+@pytest.mark.skipif(connection.vendor != "postgresql", reason="COPY fast path is PostgreSQL only")
+def test_copy_fast_path_is_used_on_postgres():
+    imp = LogImport.objects.create(kind=LogImport.KIND_FILE, format=LogImport.FORMAT_ADIF)
+    with CaptureQueriesContext(connection) as ctx:
+        parse_adif_to_staged(imp, ADIF)
+    # COPY bypasses the query logger; bulk_create would log INSERTs
+    assert not [q for q in ctx.captured_queries if q["sql"].startswith("INSERT")]
+    assert imp.staged_entries.count() == 2
+
+
+@pytest.mark.django_db
+def test_stage_records_flushes_fixed_size_batches():
+    imp = LogImport.objects.create(kind=LogImport.KIND_FILE, format=LogImport.FORMAT_ADIF)
+    written = []
+
+    def records():
+        # Three distinct copies (repeats of one record would be dropped)
+        for fields in parse_adif_records("".join(ADIF.replace("202401", f"20240{m}") for m in (1, 2, 3))):
+            # Earlier batches must already be in the DB while later records are parsed
+            written.append(imp.staged_entries.count())
+            yield fields
+
+    seen = []
+    assert stage_records(imp, records(), progress=seen.append, batch_size=2) == (6, 3)
+    assert written[:4] == [0, 0, 2, 2]
+    # Raw records are read a batch at a time to look up their fingerprints
+    assert seen == [2, 6, 8, 9]